@@ -0,0 +1,157 @@
+import os
+import sqlite3
+import threading
+
+import json_codec
+
+
+class BackupCatalog:
+    """备份目录（SQLite 索引）
+
+    取代每次列出备份时的 listdir + 文件名解析 + 逐个 stat + 读取 backup_metadata.json：
+    每个备份一行，记录时间、大小、描述、内容哈希和收藏夹摘要，列表按 (created_at, seq) 索引倒序读取。
+
+    表结构：
+        backups — 文件名 → 创建时间、同秒序号、描述、原文件大小、占用空间、SHA-256、收藏夹摘要
+        state   — 目录状态（如同步时备份目录的 mtime），用于发现目录外部的改动
+    """
+
+    DB_NAME = "backup_catalog.db"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS backups (
+            filename      TEXT PRIMARY KEY,
+            created_at    TEXT NOT NULL,
+            seq           INTEGER NOT NULL DEFAULT 1,
+            description   TEXT NOT NULL DEFAULT '',
+            original_file TEXT,
+            size          INTEGER,
+            stored_size   INTEGER,
+            sha256        TEXT,
+            collections   INTEGER,
+            games         INTEGER,
+            summary       TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_backups_created ON backups (created_at, seq);
+        CREATE TABLE IF NOT EXISTS state (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    COLUMNS = ("filename", "created_at", "seq", "description", "original_file", "size", "stored_size",
+               "sha256", "collections", "games")
+
+    def __init__(self, backup_dir):
+        """
+        Args:
+            backup_dir: 备份目录（数据库文件放在这里）
+        """
+        self.backup_dir = backup_dir
+        self.db_path = os.path.join(backup_dir, self.DB_NAME)
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _db(self):
+        # 备份目录可能在首次备份时才创建，连接延迟到第一次使用时打开
+        if self._conn is None:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # 注意：WAL 模式的 -wal/-shm 文件会在打开/关闭连接时创建、删除，改变备份目录的 mtime，
+            # mtime 变化不代表备份有变化，BackupManager._sync_catalog() 因此在 mtime 变化后只按文件名比对
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ==================== 读取 ====================
+
+    def list(self):
+        """全部备份（按时间倒序），每项为不含摘要详情的 dict（键见 COLUMNS）"""
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM backups ORDER BY created_at DESC, seq DESC").fetchall()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def get(self, filename):
+        with self._lock:
+            row = self._db().execute(f"SELECT {', '.join(self.COLUMNS)} FROM backups WHERE filename = ?",
+                                     (filename,)).fetchone()
+        return dict(zip(self.COLUMNS, row)) if row else None
+
+    def get_summary(self, filename):
+        """备份的收藏夹摘要（list），未记录时返回 None"""
+        with self._lock:
+            row = self._db().execute("SELECT summary FROM backups WHERE filename = ?", (filename,)).fetchone()
+        return json_codec.loads(row[0]) if row and row[0] else None
+
+    def max_seq(self, created_at):
+        """同一时间（秒）的备份中最大的序号，没有时返回 0"""
+        with self._lock:
+            row = self._db().execute("SELECT MAX(seq) FROM backups WHERE created_at = ?", (created_at,)).fetchone()
+        return row[0] or 0
+
+    def get_state(self, key):
+        with self._lock:
+            row = self._db().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # ==================== 写入 ====================
+
+    def _row(self, backup, summary):
+        values = [backup.get(column) for column in self.COLUMNS]
+        values.append(json_codec.dumps(summary) if summary is not None else None)
+        return values
+
+    def add(self, backup, summary=None):
+        """新增或覆盖一个备份
+
+        Args:
+            backup: dict，键见 COLUMNS（缺少的列记为 NULL）
+            summary: 收藏夹摘要（list），None 表示未记录
+        """
+        self.add_many([(backup, summary)])
+
+    def add_many(self, items):
+        """在一个事务中新增或覆盖多个备份，items 为 (backup, summary) 列表"""
+        columns = self.COLUMNS + ("summary",)
+        sql = (f"INSERT OR REPLACE INTO backups ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.executemany(sql, [self._row(backup, summary) for backup, summary in items])
+
+    def set_summary(self, filename, summary):
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute("UPDATE backups SET collections = ?, games = ?, summary = ? WHERE filename = ?",
+                             (len(summary), sum(item[2] for item in summary), json_codec.dumps(summary), filename))
+
+    def set_stored_sizes(self, sizes):
+        """批量更新占用空间，sizes 为 {文件名: 字节数}"""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.executemany("UPDATE backups SET stored_size = ? WHERE filename = ?",
+                                 [(size, name) for name, size in sizes.items()])
+
+    def remove(self, filenames):
+        """在一个事务中删除多个备份的记录"""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.executemany("DELETE FROM backups WHERE filename = ?", [(name,) for name in filenames])
+
+    def set_state(self, key, value):
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
@@ -0,0 +1,118 @@
+import gzip
+import lzma
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# 可选压缩格式按优先顺序排列；gzip、xz 为标准库，始终可用
+CODECS = ("zstd", "gzip", "xz")
+
+SUFFIXES = {"zstd": ".zst", "gzip": ".gz", "xz": ".xz"}
+
+# 文件头魔数，读取时据此识别格式（无匹配视为未压缩）
+MAGIC = {"zstd": b"\x28\xb5\x2f\xfd", "gzip": b"\x1f\x8b", "xz": b"\xfd7zXZ\x00"}
+
+# 各格式的压缩级别范围与默认级别
+LEVELS = {"zstd": (1, 22, 10), "gzip": (1, 9, 6), "xz": (0, 9, 6)}
+
+
+def available_codecs():
+    """当前环境中可用的压缩格式（按优先顺序）"""
+    return [name for name in CODECS if name != "zstd" or zstandard is not None]
+
+
+def resolve(name="auto"):
+    """确定实际使用的压缩格式
+
+    Args:
+        name: "auto"（优先 zstd，未安装 zstandard 时用 gzip）、"zstd"、"gzip"、"xz" 或 "none"；
+              指定的格式不可用时退回 "auto" 的选择
+
+    Returns:
+        压缩格式名称，"none" 返回 None（不压缩）
+    """
+    if name == "none":
+        return None
+    available = available_codecs()
+    return name if name in available else available[0]
+
+
+def clamp_level(name, level=None):
+    """把压缩级别限制在该格式的有效范围内，None 取默认级别"""
+    low, high, default = LEVELS[name]
+    if level is None:
+        return default
+    return max(low, min(high, int(level)))
+
+
+def open_writer(fileobj, name, level=None):
+    """包装一个以二进制写入模式打开的文件，返回压缩写入流（关闭时一并关闭 fileobj）"""
+    level = clamp_level(name, level)
+    if name == "zstd":
+        cctx = zstandard.ZstdCompressor(level=level, write_checksum=True)
+        return cctx.stream_writer(fileobj, closefd=True)
+    if name == "gzip":
+        return _Closing(gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=level, mtime=0), fileobj)
+    if name == "xz":
+        return _Closing(lzma.LZMAFile(fileobj, mode="wb", preset=level), fileobj)
+    raise ValueError(f"未知的压缩格式: {name}")
+
+
+def open_reader(fileobj, name):
+    """包装一个以二进制读取模式打开的文件，返回解压读取流（关闭时一并关闭 fileobj）"""
+    if name == "zstd":
+        if zstandard is None:
+            fileobj.close()
+            raise ValueError("读取 zstd 压缩的备份需要安装 zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=True)
+    if name == "gzip":
+        return _Closing(gzip.GzipFile(fileobj=fileobj, mode="rb"), fileobj)
+    if name == "xz":
+        return _Closing(lzma.LZMAFile(fileobj, mode="rb"), fileobj)
+    raise ValueError(f"未知的压缩格式: {name}")
+
+
+def detect(head):
+    """按文件头识别压缩格式，未压缩返回 None"""
+    for name, magic in MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_auto(path):
+    """以二进制读取模式打开文件：已压缩时返回解压流，否则返回文件本身"""
+    f = open(path, 'rb')
+    try:
+        name = detect(f.read(6))
+        f.seek(0)
+    except Exception:
+        f.close()
+        raise
+    return f if name is None else open_reader(f, name)
+
+
+class _Closing:
+    """关闭压缩流后再关闭底层文件（GzipFile/LZMAFile 不关闭传入的 fileobj）"""
+
+    def __init__(self, stream, fileobj):
+        self._stream = stream
+        self._fileobj = fileobj
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._fileobj.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,591 @@
+import difflib
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import threading
+import zlib
+
+import backup_codec
+import json_codec
+from cloud_storage import parse_top_level
+
+COPY_CHUNK = 1024 * 1024  # 流式复制的块大小
+
+
+def standard_gaps(count):
+    """紧凑格式（"[a,b,c]"）下条目之间的分隔符；与之相同时备份中不记录 gaps"""
+    if count == 0:
+        return ["[]"]
+    return ["["] + [","] * (count - 1) + ["]"]
+
+
+def split_entries(text):
+    """将文件原文拆成顶层条目原文和其间的分隔符
+
+    Returns:
+        (pieces, gaps)：text == gaps[0] + pieces[0] + gaps[1] + ... + pieces[-1] + gaps[-1]
+        顶层不是数组或无法解析时整个文件作为一个条目
+    """
+    try:
+        parsed = parse_top_level(text)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        return [text], ["", ""]
+
+    spans = parsed[1]
+    pieces = [text[start:end] for start, end in spans]
+    gaps = []
+    prev = 0
+    for start, end in spans:
+        gaps.append(text[prev:start])
+        prev = end
+    gaps.append(text[prev:])
+    return pieces, gaps
+
+
+def read_entries(path):
+    """读取文件并拆分条目，返回 (raw_bytes, pieces, gaps)（非 UTF-8 字节以 surrogateescape 保留）"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    pieces, gaps = split_entries(raw.decode("utf-8", "surrogateescape"))
+    return raw, pieces, gaps
+
+
+def join_entries(pieces, gaps, sha256=None):
+    """按分隔符拼接条目原文，还原文件内容（bytes）；给出 sha256 时校验，不一致抛出 ValueError"""
+    parts = [gaps[0]]
+    for piece, gap in zip(pieces, gaps[1:]):
+        parts.append(piece)
+        parts.append(gap)
+    raw = "".join(parts).encode("utf-8", "surrogateescape")
+    if sha256 is not None and hashlib.sha256(raw).hexdigest() != sha256:
+        raise ValueError("备份内容校验失败")
+    return raw
+
+
+def write_json_atomic(path, obj, codec=None, level=None):
+    """经临时文件原子写入 JSON，返回写入的字节数
+
+    Args:
+        codec: 压缩格式（见 backup_codec），None 为不压缩
+        level: 压缩级别，None 取该格式的默认级别
+    """
+    body = json_codec.dumps(obj).encode("utf-8")
+    tmp_path = path + ".tmp"
+    if codec is None:
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+    else:
+        with backup_codec.open_writer(open(tmp_path, 'wb'), codec, level) as f:
+            f.write(body)
+    size = os.path.getsize(tmp_path)
+    os.replace(tmp_path, path)
+    return size
+
+
+def read_json(path):
+    """读取 write_json_atomic() 写入的 JSON（按文件头自动识别是否压缩）"""
+    with backup_codec.open_auto(path) as f:
+        return json_codec.loads(f.read())
+
+
+class ContentAddressedStore:
+    """内容寻址的备份存储（去重）
+
+    每个快照是一份清单（manifest）：按顺序列出文件中各顶层条目的内容哈希；
+    条目原文按哈希存入对象库，相同内容（如未改动的收藏夹）在所有快照中只存一份，并经 zlib 压缩。
+
+    backup_dir 下的文件：
+        backup_objects.db — 对象库（SQLite）：哈希 → 压缩后的条目原文
+        <名称>.snap        — 快照清单（JSON）
+
+    还原时按清单拼接各条目原文及其间的分隔符，与备份时的文件逐字节一致（以整个文件的 SHA-256 校验）。
+    """
+
+    SUFFIX = ".snap"
+    OBJECTS_DB = "backup_objects.db"
+    FORMAT = "cas"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS objects (
+            hash TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL
+        );
+    """
+
+    QUERY_CHUNK = 500  # IN (...) 查询每批的哈希数（SQLite 变量数上限）
+
+    def __init__(self, backup_dir, compress_level=6):
+        """
+        Args:
+            backup_dir: 备份目录（对象库和清单都放在这里）
+            compress_level: zlib 压缩级别（1-9）
+        """
+        self.backup_dir = backup_dir
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        # 备份目录可能在首次备份时才创建，连接延迟到第一次使用时打开
+        if self._conn is None:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(self.backup_dir, self.OBJECTS_DB), check_same_thread=False)
+            # 新建数据库时启用增量回收，清理对象后可归还磁盘空间（须在建表前设置）
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def hash_piece(piece):
+        return hashlib.blake2b(piece.encode("utf-8", "surrogateescape"), digest_size=16).hexdigest()
+
+    def write(self, src_path, manifest_path):
+        """为 src_path 创建快照，清单写入 manifest_path
+
+        Returns:
+            dict：size（原文件字节数）、stored_size（本次新增对象的压缩后字节数 + 清单大小）、
+                  sha256、entries（条目数）、new_objects（新增对象数）
+        """
+        raw, pieces, gaps = read_entries(src_path)
+        hashes = [self.hash_piece(p) for p in pieces]
+
+        stored_size = 0
+        new_objects = 0
+        with self._lock:
+            conn = self._db()
+            existing = set()
+            unique = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique), self.QUERY_CHUNK):
+                chunk = unique[i:i + self.QUERY_CHUNK]
+                rows = conn.execute(f"SELECT hash FROM objects WHERE hash IN ({','.join('?' * len(chunk))})", chunk)
+                existing.update(row[0] for row in rows)
+
+            rows = []
+            for h, piece in zip(hashes, pieces):
+                if h in existing:
+                    continue
+                existing.add(h)
+                data = piece.encode("utf-8", "surrogateescape")
+                blob = zlib.compress(data, self.compress_level)
+                rows.append((h, len(data), blob))
+                stored_size += len(blob)
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO objects (hash, size, data) VALUES (?, ?, ?)", rows)
+            new_objects = len(rows)
+
+        manifest = {
+            "format": self.FORMAT,
+            "version": 1,
+            "size": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "entries": hashes,
+        }
+        if gaps != standard_gaps(len(pieces)):
+            manifest["gaps"] = gaps
+
+        stored_size += write_json_atomic(manifest_path, manifest)
+
+        return {"size": len(raw), "stored_size": stored_size, "sha256": manifest["sha256"],
+                "entries": len(hashes), "new_objects": new_objects}
+
+    @staticmethod
+    def read_manifest(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json_codec.load(f)
+
+    def read_bytes(self, manifest_path):
+        """按清单还原文件内容（bytes），校验失败（对象缺失或内容不一致）时抛出 ValueError"""
+        manifest = self.read_manifest(manifest_path)
+        hashes = manifest["entries"]
+        gaps = manifest.get("gaps") or standard_gaps(len(hashes))
+
+        objects = {}
+        with self._lock:
+            conn = self._db()
+            unique = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique), self.QUERY_CHUNK):
+                chunk = unique[i:i + self.QUERY_CHUNK]
+                rows = conn.execute(f"SELECT hash, data FROM objects WHERE hash IN ({','.join('?' * len(chunk))})",
+                                    chunk)
+                objects.update(rows)
+
+        pieces = []
+        for h in hashes:
+            blob = objects.get(h)
+            if blob is None:
+                raise ValueError(f"备份对象缺失: {h}")
+            pieces.append(zlib.decompress(blob).decode("utf-8", "surrogateescape"))
+        return join_entries(pieces, gaps, manifest.get("sha256"))
+
+    def open(self, manifest_path):
+        """以二进制读取流的形式返回还原后的文件内容"""
+        return io.BytesIO(self.read_bytes(manifest_path))
+
+    def manifest_paths(self):
+        """备份目录下的全部清单路径"""
+        if not os.path.exists(self.backup_dir):
+            return []
+        return [os.path.join(self.backup_dir, name) for name in os.listdir(self.backup_dir)
+                if name.endswith(self.SUFFIX)]
+
+    def retained_sizes(self, manifest_paths):
+        """依次保留这些快照时各自增加的占用空间
+
+        快照之间共享对象，单个快照的 stored_size（写入时新增的对象）不代表删除它能释放的空间。
+        这里按给定顺序累计：每个快照计入清单文件大小，以及之前的快照都未引用的对象（压缩后）大小，
+        合计即只保留这些快照、清理其余快照并回收对象后对象库和清单的实际大小（不含数据库页的额外开销）。
+
+        Args:
+            manifest_paths: 清单路径列表（通常按时间从新到旧）
+
+        Returns:
+            list of int，与 manifest_paths 一一对应；清单无法读取时只计其文件大小
+        """
+        seen = set()
+        new_hashes = []
+        sizes = []
+        for path in manifest_paths:
+            try:
+                sizes.append(os.path.getsize(path))
+            except OSError:
+                sizes.append(0)
+            try:
+                hashes = set(self.read_manifest(path)["entries"]) - seen
+            except Exception:
+                hashes = set()
+            seen |= hashes
+            new_hashes.append(hashes)
+
+        blob_sizes = {}
+        with self._lock:
+            conn = self._db()
+            unique = list(seen)
+            for i in range(0, len(unique), self.QUERY_CHUNK):
+                chunk = unique[i:i + self.QUERY_CHUNK]
+                blob_sizes.update(conn.execute(
+                    f"SELECT hash, length(data) FROM objects WHERE hash IN ({','.join('?' * len(chunk))})", chunk))
+        return [size + sum(blob_sizes.get(h, 0) for h in hashes) for size, hashes in zip(sizes, new_hashes)]
+
+    def delete(self, manifest_path, collect=True):
+        """删除快照清单，并清理不再被任何清单引用的对象
+
+        Args:
+            collect: 为 False 时只删除清单（批量删除后再统一调用 collect_garbage）
+        """
+        os.remove(manifest_path)
+        if collect:
+            self.collect_garbage(self.manifest_paths())
+
+    def collect_garbage(self, manifest_paths):
+        """删除不再被任何清单引用的对象
+
+        Args:
+            manifest_paths: 保留的全部清单路径
+
+        Returns:
+            删除的对象数
+        """
+        referenced = set()
+        for path in manifest_paths:
+            try:
+                referenced.update(self.read_manifest(path)["entries"])
+            except Exception:
+                # 清单无法读取时保守处理：不删除任何对象
+                return 0
+
+        with self._lock:
+            conn = self._db()
+            unreferenced = [(h,) for (h,) in conn.execute("SELECT hash FROM objects") if h not in referenced]
+            with conn:
+                conn.executemany("DELETE FROM objects WHERE hash = ?", unreferenced)
+            if unreferenced:
+                conn.execute("PRAGMA incremental_vacuum")
+        return len(unreferenced)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class DeltaChainStore:
+    """增量链备份存储
+
+    每个备份（<名称>.delta）记录相对上一个备份的条目级差异，操作格式参照 JSON Patch：
+        {"op": "add" | "replace", "path": "/<下标>", "value": "<条目原文>"}、{"op": "remove", "path": "/<下标>"}
+    按顺序作用于上一个备份的条目列表即得到本备份。每 keyframe_interval 个备份写一个完整关键帧，
+    还原任一备份最多读取 keyframe_interval 个文件。记录文件可经 backup_codec 压缩（读取时按文件头识别）。
+
+    备份顺序记录在 delta_chain.json 中。删除备份时改写其后继（改为相对被删备份的前驱的差异，
+    或在被删的是关键帧时改为关键帧）；compact() 按当前间隔重写整条链。
+    """
+
+    SUFFIX = ".delta"
+    CHAIN_NAME = "delta_chain.json"
+    FORMAT = "delta"
+
+    def __init__(self, backup_dir, keyframe_interval=10, codec=None, level=None):
+        """
+        Args:
+            backup_dir: 备份目录
+            keyframe_interval: 关键帧间隔（每隔多少个备份写一次完整内容）
+            codec: 记录文件的压缩格式（见 backup_codec），None 为不压缩
+            level: 压缩级别，None 取该格式的默认级别
+        """
+        self.backup_dir = backup_dir
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.codec = codec
+        self.level = level
+        self._lock = threading.RLock()
+
+    # --- 链索引与记录 ---
+
+    def _path(self, name):
+        return os.path.join(self.backup_dir, name)
+
+    def _load_chain(self):
+        try:
+            with open(self._path(self.CHAIN_NAME), 'r', encoding='utf-8') as f:
+                chain = json_codec.load(f)
+        except (OSError, ValueError):
+            return []
+        # 过滤掉已不存在的文件（如被手动删除）
+        return [name for name in chain if os.path.exists(self._path(name))]
+
+    def _save_chain(self, chain):
+        write_json_atomic(self._path(self.CHAIN_NAME), chain)
+
+    def _read_record(self, name):
+        return read_json(self._path(name))
+
+    def _state(self, name):
+        """还原某个备份的条目列表，返回 (pieces, gaps, record)"""
+        records = []
+        current = name
+        max_length = len(self._load_chain()) + 1
+        while True:
+            record = self._read_record(current)
+            records.append(record)
+            if record.get("base") is None:
+                break
+            current = record["base"]
+            if len(records) > max_length:
+                raise ValueError("增量链存在循环引用")
+
+        pieces = list(records[-1]["entries"])
+        for record in reversed(records[:-1]):
+            apply_patch(pieces, record["ops"])
+        record = records[0]
+        gaps = record.get("gaps") or standard_gaps(len(pieces))
+        return pieces, gaps, record
+
+    def _write_record(self, name, pieces, gaps, size, sha256, base=None, base_pieces=None, depth=0):
+        """写入一条记录：给出 base 时写差异，否则写关键帧；差异比关键帧还大时也改写关键帧
+
+        Returns:
+            写入的字节数
+        """
+        record = {"format": self.FORMAT, "version": 1, "size": size, "sha256": sha256}
+        ops = diff_entries(base_pieces, pieces) if base is not None else None
+        if ops is not None and len(ops) <= len(pieces) // 2:
+            record.update(base=base, depth=depth, ops=ops)
+        else:
+            record.update(base=None, depth=0, entries=pieces)
+        if gaps != standard_gaps(len(pieces)):
+            record["gaps"] = gaps
+        return write_json_atomic(self._path(name), record, self.codec, self.level)
+
+    # --- 存储接口 ---
+
+    def write(self, src_path, backup_path):
+        """为 src_path 创建备份（相对链尾的差异，或关键帧）
+
+        Returns:
+            dict：size、stored_size、sha256、entries、keyframe
+        """
+        raw, pieces, gaps = read_entries(src_path)
+        sha256 = hashlib.sha256(raw).hexdigest()
+        name = os.path.basename(backup_path)
+
+        with self._lock:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            chain = self._load_chain()
+            base = base_pieces = None
+            depth = 0
+            if chain:
+                try:
+                    base_pieces, _, base_record = self._state(chain[-1])
+                    depth = base_record.get("depth", 0) + 1
+                    if depth < self.keyframe_interval:
+                        base = chain[-1]
+                except (OSError, ValueError, KeyError):
+                    base = None
+            stored_size = self._write_record(name, pieces, gaps, len(raw), sha256, base, base_pieces, depth)
+            chain.append(name)
+            self._save_chain(chain)
+
+        return {"size": len(raw), "stored_size": stored_size, "sha256": sha256,
+                "entries": len(pieces), "keyframe": base is None}
+
+    def read_bytes(self, backup_path):
+        """还原备份内容（bytes），校验失败时抛出 ValueError"""
+        with self._lock:
+            pieces, gaps, record = self._state(os.path.basename(backup_path))
+        return join_entries(pieces, gaps, record.get("sha256"))
+
+    def open(self, backup_path):
+        """以二进制读取流的形式返回还原后的文件内容"""
+        return io.BytesIO(self.read_bytes(backup_path))
+
+    def delete(self, backup_path):
+        """删除备份；其后继改写为相对被删备份的前驱的差异（被删的是关键帧时改为关键帧）"""
+        name = os.path.basename(backup_path)
+        with self._lock:
+            chain = self._load_chain()
+            index = chain.index(name) if name in chain else -1
+            succ = chain[index + 1] if 0 <= index < len(chain) - 1 else None
+            if succ is not None and self._read_record(succ).get("base") == name:
+                record = self._read_record(name)
+                base = record.get("base")
+                base_pieces = self._state(base)[0] if base is not None else None
+                pieces, gaps, succ_record = self._state(succ)
+                self._write_record(succ, pieces, gaps, succ_record["size"], succ_record["sha256"],
+                                   base, base_pieces, record.get("depth", 0))
+
+            os.remove(backup_path)
+            if index >= 0:
+                del chain[index]
+                self._save_chain(chain)
+
+    def compact(self):
+        """按当前关键帧间隔重写整条链（统一关键帧位置，清理删除备份后变长的差异段）
+
+        每条记录的基准总是链中的前一个备份，因此顺序处理时只需保留前一个备份的条目列表。
+
+        Returns:
+            重写的备份数
+        """
+        with self._lock:
+            chain = self._load_chain()
+            prev_name = prev_pieces = None
+            for index, name in enumerate(chain):
+                record = self._read_record(name)
+                if record.get("base") is None:
+                    pieces = list(record["entries"])
+                elif record["base"] == prev_name:
+                    pieces = apply_patch(list(prev_pieces), record["ops"])
+                else:
+                    pieces = self._state(name)[0]
+                gaps = record.get("gaps") or standard_gaps(len(pieces))
+
+                depth = index % self.keyframe_interval
+                base = prev_name if depth else None
+                self._write_record(name, pieces, gaps, record["size"], record["sha256"], base, prev_pieces, depth)
+                prev_name, prev_pieces = name, pieces
+            return len(chain)
+
+
+class CompressedFileStore:
+    """压缩的完整副本备份：整个文件经 backup_codec 流式压缩为 <名称>.json.gz / .json.xz / .json.zst
+
+    创建和恢复都是边读边（解）压缩，不在内存中保留完整内容。
+    """
+
+    FORMAT = "full"
+
+    def __init__(self, backup_dir, codec="gzip", level=None):
+        """
+        Args:
+            backup_dir: 备份目录
+            codec: 压缩格式（"zstd"、"gzip" 或 "xz"）
+            level: 压缩级别，None 取该格式的默认级别
+        """
+        self.backup_dir = backup_dir
+        self.codec = codec
+        self.level = level
+        self.SUFFIX = ".json" + backup_codec.SUFFIXES[codec]
+
+    def write(self, src_path, backup_path):
+        """压缩复制 src_path
+
+        Returns:
+            dict：size、stored_size、sha256
+        """
+        sha = hashlib.sha256()
+        size = 0
+        tmp_path = backup_path + ".tmp"
+        with open(src_path, 'rb') as src, backup_codec.open_writer(open(tmp_path, 'wb'), self.codec,
+                                                                   self.level) as dst:
+            while True:
+                chunk = src.read(COPY_CHUNK)
+                if not chunk:
+                    break
+                sha.update(chunk)
+                size += len(chunk)
+                dst.write(chunk)
+        stored_size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, backup_path)
+        return {"size": size, "stored_size": stored_size, "sha256": sha.hexdigest()}
+
+    def open(self, backup_path):
+        """返回解压读取流"""
+        return backup_codec.open_reader(open(backup_path, 'rb'), self.codec)
+
+    def read_bytes(self, backup_path):
+        with self.open(backup_path) as f:
+            return f.read()
+
+    def delete(self, backup_path):
+        os.remove(backup_path)
+
+
+def copy_stream(src, dst_path):
+    """把读取流 src 的内容经临时文件原子写入 dst_path"""
+    tmp_path = dst_path + ".tmp"
+    with open(tmp_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
+    os.replace(tmp_path, dst_path)
+
+
+def diff_entries(old, new):
+    """计算把条目列表 old 变为 new 的 JSON Patch 风格操作
+
+    操作按下标从大到小排列，依次执行时各操作的下标都对应 old 中的位置，互不影响。
+    """
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        common = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        # 多出的旧条目先删除（从后往前），再原位替换，最后插入多出的新条目
+        for i in range(i2 - 1, i1 + common - 1, -1):
+            ops.append({"op": "remove", "path": f"/{i}"})
+        for k in range(common):
+            ops.append({"op": "replace", "path": f"/{i1 + k}", "value": new[j1 + k]})
+        for k in range(common, j2 - j1):
+            ops.append({"op": "add", "path": f"/{i1 + k}", "value": new[j1 + k]})
+    return ops
+
+
+def apply_patch(pieces, ops):
+    """就地执行 diff_entries() 生成的操作，返回 pieces"""
+    for op in ops:
+        index = int(op["path"][1:])
+        kind = op["op"]
+        if kind == "replace":
+            pieces[index] = op["value"]
+        elif kind == "add":
+            pieces.insert(index, op["value"])
+        elif kind == "remove":
+            del pieces[index]
+        else:
+            raise ValueError(f"未知的操作: {kind}")
+    return pieces
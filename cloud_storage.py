@@ -0,0 +1,514 @@
+import json
+import re
+from array import array
+from bisect import bisect_left
+
+import json_codec
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def parse_top_level(text):
+    """逐个解析顶层数组的条目，返回 (entries, spans)，spans[i] 为第 i 个条目在 text 中的 (start, end)
+
+    顶层不是数组时返回 None；格式错误时抛出 json.JSONDecodeError。
+    """
+    pos = _WHITESPACE.match(text, 0).end()
+    if not text.startswith("[", pos):
+        return None
+
+    decoder = json.JSONDecoder()
+    entries = []
+    spans = []
+    pos = _WHITESPACE.match(text, pos + 1).end()
+    if text.startswith("]", pos):
+        pos += 1
+    else:
+        while True:
+            entry, end = decoder.raw_decode(text, pos)
+            entries.append(entry)
+            spans.append((pos, end))
+            pos = _WHITESPACE.match(text, end).end()
+            if text.startswith(",", pos):
+                pos = _WHITESPACE.match(text, pos + 1).end()
+            elif text.startswith("]", pos):
+                pos += 1
+                break
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+    if _WHITESPACE.match(text, pos).end() != len(text):
+        raise json.JSONDecodeError("Extra data", text, pos)
+    return entries, spans
+
+
+class CloudStorageData(list):
+    """cloud-storage-namespace-1.json 的条目列表（[[key, meta], ...]）
+
+    行为与普通 list 完全一致（可直接 json.dump、遍历、append），额外维护：
+      - 全局最大版本号：allocate_version() 为 O(1)，无需每次扫描全部条目
+      - key → 条目索引：get_entry(key) 为 O(1)
+      - 收藏夹解码视图（CollectionStore），各处共享，value 只解码一次
+      - 由 from_text() 加载时记录每个条目在原文中的位置，dumps() 时未改动的条目直接复用原文
+
+    通过列表方法增删条目时索引自动更新；直接修改条目 meta 中的 version 后
+    应调用 note_version() 同步最大版本号（allocate_version() 分配出的版本号已计入）。
+    """
+
+    def __init__(self, entries=()):
+        super().__init__(entries)
+        self.collections = None  # 收藏夹解码视图，见 CollectionStore.of()
+        self._raw_text = None
+        self._head = self._tail = ""  # 原文中第一个条目之前、最后一个条目之后的部分（含方括号和空白）
+        self._spans = {}  # id(entry) → (entry, start, end, state)：加载/保存时条目的原文位置和内容快照
+        self._reindex()
+
+    # --- 加载与增量序列化 ---
+
+    @classmethod
+    def from_text(cls, text):
+        """解析 JSON 文本，同时记录每个顶层条目在原文中的位置
+
+        顶层不是数组时按普通 JSON 解析并原样返回。
+        顶层条目固定用标准库 raw_decode 逐个解析以取得位置：条目内容主要是收藏夹 value 长字符串，
+        标准库的字符串扫描本身就很快，换用 orjson 整体解析并不更快，反而无法复用原文；
+        value 的解码（CollectionRecord.value）则走 json_codec 选定的后端。
+        """
+        parsed = parse_top_level(text)
+        if parsed is None:
+            return json_codec.loads(text)
+        entries, spans = parsed
+
+        data = cls(entries)
+        data._raw_text = text
+        if spans:
+            data._head, data._tail = text[:spans[0][0]], text[spans[-1][1]:]
+        else:
+            bracket = text.index("[") + 1
+            data._head, data._tail = text[:bracket], text[bracket:]
+        data._spans = {id(entry): data._snapshot(entry, start, end) for entry, (start, end) in zip(entries, spans)}
+        return data
+
+    @staticmethod
+    def _entry_state(entry):
+        """条目内容的浅快照：顶层元素（key 等）和 meta 的浅拷贝"""
+        if not isinstance(entry, list):
+            return None
+        return [dict(item) if isinstance(item, dict) else item for item in entry]
+
+    @classmethod
+    def _snapshot(cls, entry, start, end):
+        return entry, start, end, cls._entry_state(entry)
+
+    def _clean_span(self, entry):
+        """条目自加载/上次保存以来未改动时返回其原文位置 (start, end)，否则返回 None
+
+        通过 mark_dirty() 标记过的条目，或 key、meta 中任一字段（version、value、is_deleted、timestamp 等）
+        与快照不同的条目视为已改动。比较的是浅快照：meta 中嵌套对象的原地修改需调用 mark_dirty()。
+        value 字符串通常仍是同一对象，比较时直接按身份判等，不逐字符比较。
+        """
+        span = self._spans.get(id(entry))
+        if span is None or span[0] is not entry:
+            return None
+        state = span[3]
+        if state is None or len(entry) != len(state) or any(a != b for a, b in zip(entry, state)):
+            return None
+        return span[1], span[2]
+
+    def mark_dirty(self, entry):
+        """标记条目已修改（下次 dumps() 时重新编码）；只修改 meta 的顶层字段时无需调用"""
+        self._spans.pop(id(entry), None)
+
+    def dumps(self):
+        """序列化为 JSON 文本：未改动的条目直接拼接原文，只重新编码新增和修改过的条目
+
+        序列化结果成为新的原文，之后再次调用 dumps() 同样只编码期间改动的条目。
+
+        Returns:
+            (text, encoded_count)
+        """
+        if self.collections is not None:
+            self.collections.flush()
+
+        raw = self._raw_text
+        if raw is None:
+            # 不是由 from_text() 加载的数据：整体编码
+            text = json_codec.dumps(self, default=_json_default)
+            return text, len(self)
+
+        pieces = []
+        spans = {}
+        encoded = 0
+        offset = len(self._head)  # 当前条目在新文本中的起始位置（开头为原文的 "[" 及其前后空白）
+        run = None     # 正在合并的连续未改动条目在原文中的 [起点, 终点)，最后整段一次切片
+        for i, entry in enumerate(self):
+            span = self._clean_span(entry)
+            if span and run is not None and raw[run[1]:span[0]].strip() == ",":
+                # 与上一个未改动条目在原文中相邻：延长当前切片（保留原文中的分隔符和空白）
+                offset += span[0] - run[1]
+                run[1] = span[1]
+                piece_len = span[1] - span[0]
+            else:
+                if run is not None:
+                    pieces.append(raw[run[0]:run[1]])
+                    run = None
+                if i:
+                    pieces.append(",")
+                    offset += 1
+                if span:
+                    run = [span[0], span[1]]
+                    piece_len = span[1] - span[0]
+                else:
+                    piece = json_codec.dumps(entry, default=_json_default)
+                    pieces.append(piece)
+                    piece_len = len(piece)
+                    encoded += 1
+            spans[id(entry)] = self._snapshot(entry, offset, offset + piece_len)
+            offset += piece_len
+        if run is not None:
+            pieces.append(raw[run[0]:run[1]])
+
+        text = self._head + "".join(pieces) + self._tail
+        self._raw_text = text
+        self._spans = spans
+        return text, encoded
+
+    @staticmethod
+    def _entry_version(entry):
+        try:
+            return int(entry[1].get("version", "0"))
+        except (ValueError, IndexError, TypeError, AttributeError):
+            return 0
+
+    @staticmethod
+    def _entry_key(entry):
+        try:
+            return entry[0]
+        except (IndexError, TypeError, KeyError):
+            return None
+
+    def _reindex(self):
+        self._max_version = 0
+        self._index = {}
+        for entry in self:
+            self._track(entry)
+
+    def _track(self, entry):
+        v = self._entry_version(entry)
+        if v > self._max_version:
+            self._max_version = v
+        key = self._entry_key(entry)
+        if key is not None:
+            self._index[key] = entry
+
+    def _untrack(self, entry):
+        # 最大版本号只增不减（与 Steam 的全局版本号语义一致），删除条目时无需回退
+        key = self._entry_key(entry)
+        if key is not None and self._index.get(key) is entry:
+            del self._index[key]
+            # 同一 key 存在多个条目时，让索引指向剩余的最后一个
+            for other in reversed(self):
+                if other is not entry and self._entry_key(other) == key:
+                    self._index[key] = other
+                    break
+
+    # --- 版本号与索引 ---
+
+    @property
+    def max_version(self):
+        return self._max_version
+
+    def allocate_version(self):
+        """分配下一个全局版本号（字符串）并计入最大版本号"""
+        self._max_version += 1
+        return str(self._max_version)
+
+    def note_version(self, version):
+        """直接写入某条目的 version 后调用，使最大版本号保持最新"""
+        try:
+            v = int(version)
+        except (ValueError, TypeError):
+            return
+        if v > self._max_version:
+            self._max_version = v
+
+    def get_entry(self, key):
+        """按 key 查找条目，不存在时返回 None"""
+        return self._index.get(key)
+
+    # --- 维护索引的列表方法 ---
+
+    def append(self, entry):
+        super().append(entry)
+        self._track(entry)
+
+    def extend(self, entries):
+        entries = list(entries)
+        super().extend(entries)
+        for entry in entries:
+            self._track(entry)
+
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
+
+    def insert(self, index, entry):
+        super().insert(index, entry)
+        self._track(entry)
+
+    def remove(self, entry):
+        super().remove(entry)
+        self._untrack(entry)
+
+    def pop(self, index=-1):
+        entry = super().pop(index)
+        self._untrack(entry)
+        return entry
+
+    def clear(self):
+        super().clear()
+        self._index = {}
+        self._spans = {}
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        # 切片赋值等少见操作直接重建索引
+        self._reindex_keep_max()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex_keep_max()
+
+    def _reindex_keep_max(self):
+        max_version = self._max_version
+        self._reindex()
+        self._max_version = max(self._max_version, max_version)
+
+
+COLLECTION_KEY_PREFIX = "user-collections."
+COLLECTION_ID_FIELDS = ("added", "removed")
+
+# AppID 均为非负 32 位整数：用无符号 32 位数组存放（'I' 在个别平台上只有 2 字节时改用 'L'）
+ID_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+
+def to_id_array(ids):
+    """将 AppID 序列转为紧凑的整数数组（保持顺序）；含非法值（负数、非整数等）时原样返回"""
+    if isinstance(ids, array):
+        return ids
+    try:
+        return array(ID_TYPECODE, ids)
+    except (TypeError, OverflowError):
+        return ids
+
+
+def sorted_id_array(ids):
+    """返回升序、去重后的 AppID 数组（供 contains_sorted / merge_difference 使用）"""
+    return array(ID_TYPECODE, sorted(set(ids)))
+
+
+def concat_ids(ids, more):
+    """拼接两个 AppID 序列：均可转为整数数组时返回数组，否则返回列表"""
+    more = to_id_array(more)
+    if isinstance(ids, array) and isinstance(more, array) and ids.typecode == more.typecode:
+        return ids + more
+    return list(ids) + list(more)
+
+
+def contains_sorted(sorted_ids, aid):
+    """在升序数组中二分查找 aid"""
+    i = bisect_left(sorted_ids, aid)
+    return i < len(sorted_ids) and sorted_ids[i] == aid
+
+
+def merge_difference(a_sorted, b_sorted):
+    """有序归并求差集 a - b（两者均为升序且无重复），返回升序数组"""
+    result = array(ID_TYPECODE)
+    i = j = 0
+    len_a, len_b = len(a_sorted), len(b_sorted)
+    while i < len_a:
+        if j >= len_b:
+            result.extend(a_sorted[i:])
+            break
+        a, b = a_sorted[i], b_sorted[j]
+        if a < b:
+            result.append(a)
+            i += 1
+        elif a > b:
+            j += 1
+        else:
+            i += 1
+            j += 1
+    return result
+
+
+def _json_default(obj):
+    if isinstance(obj, array):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def pack_collection_ids(val_obj):
+    """将收藏夹对象中的 added/removed 列表就地转为整数数组"""
+    for field in COLLECTION_ID_FIELDS:
+        ids = val_obj.get(field)
+        if isinstance(ids, list):
+            val_obj[field] = to_id_array(ids)
+    return val_obj
+
+
+def encode_collection_value(val_obj):
+    """将收藏夹对象编码为条目 meta['value'] 中的 JSON 字符串（与 Steam 客户端格式一致）
+
+    added/removed 为整数数组时按列表输出。
+    """
+    return json_codec.dumps(val_obj, default=_json_default)
+
+
+class CollectionRecord:
+    """单个收藏夹条目的视图：value 字符串最多解码一次，修改后标记 dirty，保存时再统一编码
+
+    解码后 added/removed 以整数数组（array）存放，只在编码时转回列表。
+    """
+
+    __slots__ = ("entry", "_raw", "_value", "_sorted_added", "dirty")
+
+    def __init__(self, entry):
+        self.entry = entry
+        self._raw = None
+        self._value = None
+        self._sorted_added = None
+        self.dirty = False
+
+    @property
+    def key(self):
+        return self.entry[0]
+
+    @property
+    def meta(self):
+        return self.entry[1]
+
+    @property
+    def value(self):
+        """解码后的收藏夹对象（dict），可直接修改，修改后需调用 mark_dirty()
+
+        meta['value'] 被外部直接替换时自动重新解码（未保存的修改会被丢弃）。
+        """
+        raw = self.entry[1].get("value")
+        if self._value is None or (not self.dirty and raw is not self._raw):
+            value = json_codec.loads(raw)
+            self._value = pack_collection_ids(value) if isinstance(value, dict) else value
+            self._raw = raw
+            self._sorted_added = None
+        return self._value
+
+    @property
+    def id(self):
+        return self.value.get("id")
+
+    @property
+    def name(self):
+        return self.value.get("name")
+
+    @property
+    def added(self):
+        return self.value.get("added", [])
+
+    @property
+    def removed(self):
+        return self.value.get("removed", [])
+
+    @property
+    def is_dynamic(self):
+        return "filterSpec" in self.value
+
+    def sorted_added(self):
+        """added 的升序数组（缓存，mark_dirty() 后重新计算）"""
+        if self._sorted_added is None:
+            self._sorted_added = sorted_id_array(self.added)
+        return self._sorted_added
+
+    def mark_dirty(self):
+        self.dirty = True
+        self._sorted_added = None
+
+    def encode(self):
+        """将修改写回 meta['value']"""
+        raw = encode_collection_value(self._value)
+        self.entry[1]["value"] = raw
+        self._raw = raw
+        self.dirty = False
+
+
+class CollectionStore:
+    """收藏夹条目的共享解码视图
+
+    同一份数据（CloudStorageData）只对应一个 CollectionStore（见 of()），
+    刷新列表、更新、对比都复用已解码的对象；flush() 只重新编码标记为 dirty 的收藏夹。
+    """
+
+    def __init__(self, data, shared=False):
+        self.data = data
+        self.shared = shared  # 是否挂在 CloudStorageData 上（由 save_json 统一 flush）
+        self._records = {}  # key → CollectionRecord
+
+    @classmethod
+    def of(cls, data):
+        """返回 data 对应的 CollectionStore：CloudStorageData 复用同一实例，普通列表新建临时实例"""
+        if isinstance(data, CloudStorageData):
+            if data.collections is None:
+                data.collections = cls(data, shared=True)
+            return data.collections
+        return cls(data)
+
+    def mark_dirty(self, rec):
+        """标记收藏夹已修改：共享视图延迟到 flush() 时编码，临时视图立即写回 meta['value']"""
+        rec.mark_dirty()
+        if not self.shared:
+            rec.encode()
+
+    @staticmethod
+    def is_live_collection(entry):
+        """是否为未删除且有内容的收藏夹条目"""
+        meta = entry[1]
+        return (entry[0].startswith(COLLECTION_KEY_PREFIX)
+                and meta.get("is_deleted") is not True and "value" in meta)
+
+    def record_for(self, entry):
+        """返回条目对应的 CollectionRecord（按 key 缓存，条目对象被替换时重建）"""
+        rec = self._records.get(entry[0])
+        if rec is None or rec.entry is not entry:
+            rec = CollectionRecord(entry)
+            self._records[entry[0]] = rec
+        return rec
+
+    def records(self):
+        """按文件顺序返回所有未删除的收藏夹记录，无法解析的条目跳过"""
+        result = []
+        for entry in self.data:
+            if not self.is_live_collection(entry):
+                continue
+            rec = self.record_for(entry)
+            try:
+                if not isinstance(rec.value, dict):
+                    continue
+            except Exception:
+                continue
+            result.append(rec)
+        return result
+
+    def add(self, entry, val_obj):
+        """登记新建的收藏夹条目（meta['value'] 已编码），缓存其解码对象"""
+        rec = self.record_for(entry)
+        rec._raw = entry[1].get("value")
+        rec._value = pack_collection_ids(val_obj)
+        rec._sorted_added = None
+        return rec
+
+    def flush(self):
+        """重新编码所有 dirty 的收藏夹，返回编码的数量"""
+        count = 0
+        for rec in self._records.values():
+            if rec.dirty:
+                rec.encode()
+                count += 1
+        return count
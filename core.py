@@ -1,19 +1,28 @@
 import base64
-import json
 import os
+import random
 import re
 import secrets
 import shutil
 import ssl
+import threading
 import time
 import urllib.error
 import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
-from json import JSONDecodeError
 from tkinter import messagebox
 
 from account_manager import SteamAccount
-from local_storage import BackupManager
+from cloud_storage import (CloudStorageData, CollectionStore, concat_ids, contains_sorted, encode_collection_value,
+                           sorted_id_array, to_id_array)
+import json_codec
+from html_scan import HtmlStreamScanner
+from http_client import HttpClient, HttpResponseCache
+from igdb_cache import IGDBCacheStore
+from local_storage import BackupManager, RetentionPolicy
+from source_cache import SourceResultCache
+from throttle import TokenBucket
 
 
 class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
@@ -28,9 +37,6 @@ class SteamToolboxCore:
     def __init__(self, account: SteamAccount):
         self.current_account: SteamAccount = account  # 当前选中的账号
 
-        # 这些属性会在选择账号后设置
-        self.backup_manager = BackupManager(self.current_account.storage_path)  # 备份管理器
-
         # 数据目录（统一存放配置和缓存）
         self.data_dir = os.path.join(os.path.expanduser("~"), ".steam_toolbox")
         os.makedirs(self.data_dir, exist_ok=True)
@@ -39,6 +45,22 @@ class SteamToolboxCore:
         # 迁移旧版文件（从主目录散落文件 → 统一目录）
         self.migrate_old_files()
 
+        config = self.load_config()
+
+        # JSON 编解码后端（config.json 的 json_backend：auto/orjson/ujson/json，默认 auto）
+        json_codec.set_backend(config.get("json_backend", "auto"))
+
+        # 备份管理器（config.json 的 backup_backend：cas/delta/full，默认 cas；
+        # backup_codec：auto/zstd/gzip/xz/none，backup_compress_level：压缩级别，不设置时取各格式默认值；
+        # backup_retention：保留策略，如 {"keep_last": 20, "daily": 7, "weekly": 4, "monthly": 12, "max_total_mb": 500}，
+        # 不设置时不自动清理）
+        self.backup_manager = BackupManager(self.current_account.storage_path,
+                                            backend=config.get("backup_backend", "cas"),
+                                            keyframe_interval=config.get("backup_keyframe_interval", 10),
+                                            codec=config.get("backup_codec", "auto"),
+                                            compress_level=config.get("backup_compress_level"),
+                                            retention=RetentionPolicy.from_config(config.get("backup_retention")))
+
         self.induce_suffix = "(删除这段字以触发云同步)"
         self.disclaimer = f"\n\n(若其中包含未拥有的游戏、重复条目或是 DLC，会导致 Steam 收藏夹内显示的数目偏少。)"
 
@@ -47,6 +69,23 @@ class SteamToolboxCore:
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
 
+        # 共享 HTTP 客户端（按主机复用长连接并限制并发数，自动 gzip/deflate 解压）
+        # Steam 商店/Steam250 页面另有磁盘响应缓存（ETag/Last-Modified 条件请求）
+        self.http_cache = HttpResponseCache(os.path.join(self.data_dir, "http_cache.db"))
+        self.http_cache.purge(self.HTTP_CACHE_MAX_AGE)
+        self.http = HttpClient(self.ssl_context, max_per_host=self.HTTP_MAX_CONCURRENCY_PER_HOST,
+                               host_limits={"api.igdb.com": self.IGDB_MAX_CONCURRENCY}, cache=self.http_cache)
+
+        # 来源结果缓存（鉴赏家/发行商/Steam250/IGDB 公司的最终 AppID 列表）
+        self.source_cache = SourceResultCache(os.path.join(self.data_dir, "source_cache.db"))
+
+        # IGDB 请求限速（所有线程共享同一个令牌桶）
+        self.igdb_rate_limiter = TokenBucket(self.IGDB_REQUESTS_PER_SECOND)
+        self._igdb_token_lock = threading.Lock()
+
+        # 鉴赏家多语言扫描历史的写入锁（多个鉴赏家可能并发扫描）
+        self._curator_history_lock = threading.Lock()
+
 
     def migrate_old_files(self):
         """将旧版散落在主目录的文件迁移到统一数据目录"""
@@ -66,7 +105,13 @@ class SteamToolboxCore:
 
     @staticmethod
     def next_version(data):
-        """扫描全部条目，返回下一个可用的全局版本号（字符串）"""
+        """返回下一个可用的全局版本号（字符串）
+
+        data 为 load_json() 返回的 CloudStorageData 时直接使用其维护的最大版本号（O(1)），
+        并将分配出的版本号计入，连续调用得到递增的版本号；普通列表则扫描全部条目。
+        """
+        if isinstance(data, CloudStorageData):
+            return data.allocate_version()
         max_ver = 0
         for entry in data:
             try:
@@ -78,20 +123,25 @@ class SteamToolboxCore:
 
     def add_static_collection(self, data, name, app_ids):
         col_id = f"uc-{secrets.token_hex(6)}"
-        storage_key = f"user-collections.{col_id}"
         val_obj = {"id": col_id, "name": name + self.induce_suffix, "added": app_ids, "removed": []}
+        self._append_collection(data, val_obj)
+
+    def _append_collection(self, data, val_obj):
+        """为收藏夹对象新建条目并追加到 data，同时登记到收藏夹视图（无需再次解码）"""
+        storage_key = f"user-collections.{val_obj['id']}"
         new_entry = [storage_key, {"key": storage_key, "timestamp": int(time.time()),
-                                   "value": json.dumps(val_obj, ensure_ascii=False, separators=(',', ':')),
+                                   "value": encode_collection_value(val_obj),
                                    "version": self.next_version(data),
                                    "conflictResolutionMethod": "custom", "strMethodId": "union-collections"}]
         data.append(new_entry)
+        CollectionStore.of(data).add(new_entry, val_obj)
 
     def load_config(self):
         """加载全局配置文件"""
         if os.path.exists(self.global_config_path):
             try:
                 with open(self.global_config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    return json_codec.load(f)
             except:
                 pass
         return {}
@@ -100,7 +150,7 @@ class SteamToolboxCore:
         """保存全局配置文件"""
         try:
             with open(self.global_config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+                json_codec.dump(config, f, indent=2)
         except:
             pass
 
@@ -188,46 +238,47 @@ class SteamToolboxCore:
 
     def get_igdb_access_token(self, force_refresh=False):
         """获取 IGDB API 的访问令牌（带缓存）"""
-        client_id, client_secret = self.get_igdb_credentials()
-        if not client_id or not client_secret:
-            return None, "未配置 IGDB API 凭证"
+        # 多个来源并发获取时只让一个线程去申请新令牌，其余线程等待后直接使用缓存的令牌
+        with self._igdb_token_lock:
+            client_id, client_secret = self.get_igdb_credentials()
+            if not client_id or not client_secret:
+                return None, "未配置 IGDB API 凭证"
 
-        config = self.load_config()
-        cached_token = config.get("igdb_access_token", "")
-        expires_at = config.get("igdb_token_expires_at", 0)
+            config = self.load_config()
+            cached_token = config.get("igdb_access_token", "")
+            expires_at = config.get("igdb_token_expires_at", 0)
 
-        # 检查缓存的令牌是否仍然有效（提前 300 秒过期）
-        current_time = int(time.time())
-        if not force_refresh and cached_token and expires_at > current_time + 300:
-            return cached_token, None
+            # 检查缓存的令牌是否仍然有效（提前 300 秒过期）
+            current_time = int(time.time())
+            if not force_refresh and cached_token and expires_at > current_time + 300:
+                return cached_token, None
 
-        # 请求新的访问令牌
-        token_url = f"https://id.twitch.tv/oauth2/token?client_id={client_id}&client_secret={client_secret}&grant_type=client_credentials"
+            # 请求新的访问令牌
+            token_url = f"https://id.twitch.tv/oauth2/token?client_id={client_id}&client_secret={client_secret}&grant_type=client_credentials"
 
-        try:
-            req = urllib.request.Request(token_url, method='POST')
-            with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as resp:
-                data = json.loads(resp.read().decode('utf-8'))
+            try:
+                resp = self.http.request(token_url, method='POST', timeout=15)
+                data = resp.json()
 
-            access_token = data.get("access_token", "")
-            expires_in = data.get("expires_in", 0)
+                access_token = data.get("access_token", "")
+                expires_in = data.get("expires_in", 0)
 
-            if not access_token:
-                return None, "获取访问令牌失败：响应中无 access_token"
+                if not access_token:
+                    return None, "获取访问令牌失败：响应中无 access_token"
 
-            # 缓存令牌
-            config["igdb_access_token"] = access_token
-            config["igdb_token_expires_at"] = current_time + expires_in
-            self.save_config(config)
+                # 缓存令牌
+                config["igdb_access_token"] = access_token
+                config["igdb_token_expires_at"] = current_time + expires_in
+                self.save_config(config)
 
-            return access_token, None
+                return access_token, None
 
-        except urllib.error.HTTPError as e:
-            return None, f"HTTP 错误 {e.code}：获取 IGDB 令牌失败"
-        except urllib.error.URLError as e:
-            return None, f"网络错误：{str(e.reason)}"
-        except Exception as e:
-            return None, f"获取令牌失败：{str(e)}"
+            except urllib.error.HTTPError as e:
+                return None, f"HTTP 错误 {e.code}：获取 IGDB 令牌失败"
+            except urllib.error.URLError as e:
+                return None, f"网络错误：{str(e.reason)}"
+            except Exception as e:
+                return None, f"获取令牌失败：{str(e)}"
 
     def fetch_igdb_dimension_list(self, dimension, progress_callback=None):
         """获取 IGDB 某个维度的条目列表（名称+ID）
@@ -266,9 +317,7 @@ class SteamToolboxCore:
         is_large = dimension in ("keywords", "franchises")
 
         if is_large:
-            cache = self.load_igdb_cache()
-            dim_cache = cache.get(dimension, {})
-            cached_ids = [k for k in dim_cache.keys() if isinstance(dim_cache.get(k), dict) and "steam_ids" in dim_cache[k]]
+            cached_ids = self.get_igdb_store().get_item_ids(dimension)
             if not cached_ids:
                 return [], None
 
@@ -280,10 +329,9 @@ class SteamToolboxCore:
                 ids_str = ",".join(batch)
                 body = f"fields id,name,slug; where id = ({ids_str}); limit {batch_size};"
                 try:
-                    req = urllib.request.Request(url, data=body.encode('utf-8'), headers=headers, method='POST')
-                    with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                        batch_items = json.loads(resp.read().decode('utf-8'))
-                        all_items.extend(batch_items)
+                    resp = self.http.request(url, data=body.encode('utf-8'), headers=headers, method='POST', timeout=30)
+                    batch_items = resp.json()
+                    all_items.extend(batch_items)
                 except urllib.error.HTTPError as e:
                     return [], f"HTTP 错误 {e.code}：获取{dim_info['name']}列表失败"
                 except urllib.error.URLError as e:
@@ -304,9 +352,8 @@ class SteamToolboxCore:
             while True:
                 body = f"fields id,name,slug; limit {limit}; offset {offset}; sort name asc;"
                 try:
-                    req = urllib.request.Request(url, data=body.encode('utf-8'), headers=headers, method='POST')
-                    with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                        batch = json.loads(resp.read().decode('utf-8'))
+                    resp = self.http.request(url, data=body.encode('utf-8'), headers=headers, method='POST', timeout=30)
+                    batch = resp.json()
                 except urllib.error.HTTPError as e:
                     return [], f"HTTP 错误 {e.code}：获取{dim_info['name']}列表失败"
                 except urllib.error.URLError as e:
@@ -332,29 +379,36 @@ class SteamToolboxCore:
     # ==================== IGDB 本地缓存 ====================
 
     IGDB_CACHE_EXPIRY_DAYS = 7  # 缓存有效期（天）
+    IGDB_FULL_REBUILD_DAYS = 30  # 距上次全量下载超过该天数时，过期后改为全量重建（清除增量刷新发现不了的已删除关联）
 
     def get_igdb_cache_path(self):
-        """获取 IGDB 缓存文件路径"""
+        """获取 IGDB 缓存数据库路径"""
+        return os.path.join(self.data_dir, "igdb_cache.db")
+
+    def get_igdb_legacy_cache_path(self):
+        """获取旧版 IGDB 缓存文件路径（单文件 JSON，首次打开数据库时自动迁移）"""
         return os.path.join(self.data_dir, "igdb_cache.json")
 
+    def get_igdb_store(self):
+        """获取 IGDB 缓存存储（进程内共享，首次调用时打开数据库并迁移旧版 JSON）
+
+        读取结果在内存中缓存，数据库文件变化后自动重新加载，可在工作线程中并发调用。
+        """
+        return IGDBCacheStore.shared(self.get_igdb_cache_path(),
+                                     legacy_json_path=self.get_igdb_legacy_cache_path())
+
     def load_igdb_cache(self):
-        """加载 IGDB 缓存"""
-        path = self.get_igdb_cache_path()
-        if os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {}
+        """加载完整的 IGDB 缓存（旧版 dict 格式，仅供兼容；查询请直接使用 get_igdb_store()）"""
+        try:
+            return self.get_igdb_store().export_dict()
+        except Exception:
+            return {}
 
     def save_igdb_cache(self, cache):
-        """保存 IGDB 缓存"""
-        path = self.get_igdb_cache_path()
+        """以旧版 dict 格式整体写入 IGDB 缓存（仅供兼容）"""
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, ensure_ascii=False)
-        except:
+            self.get_igdb_store().import_dict(cache)
+        except Exception:
             pass
 
     def get_igdb_dimension_cache(self, dimension, item_id):
@@ -367,13 +421,7 @@ class SteamToolboxCore:
         Returns:
             (steam_ids, cached_at_timestamp) 或 (None, None)
         """
-        cache = self.load_igdb_cache()
-        dim_data = cache.get(dimension, {})
-        item_key = str(item_id)
-        if item_key in dim_data:
-            entry = dim_data[item_key]
-            return entry.get("steam_ids", []), entry.get("cached_at", 0)
-        return None, None
+        return self.get_igdb_store().get_item(dimension, item_id)
 
     def get_igdb_genre_cache(self, genre_id):
         """获取某个类型的缓存数据（向后兼容）"""
@@ -381,14 +429,7 @@ class SteamToolboxCore:
 
     def set_igdb_dimension_cache(self, dimension, item_id, steam_ids):
         """写入某个维度下某个条目的缓存数据"""
-        cache = self.load_igdb_cache()
-        if dimension not in cache:
-            cache[dimension] = {}
-        cache[dimension][str(item_id)] = {
-            "steam_ids": steam_ids,
-            "cached_at": time.time(),
-        }
-        self.save_igdb_cache(cache)
+        self.get_igdb_store().set_item(dimension, item_id, steam_ids)
 
     def set_igdb_genre_cache(self, genre_id, steam_ids):
         """写入某个类型的缓存数据（向后兼容）"""
@@ -401,6 +442,14 @@ class SteamToolboxCore:
         age_seconds = time.time() - cached_at
         return age_seconds < self.IGDB_CACHE_EXPIRY_DAYS * 86400
 
+    def is_igdb_full_rebuild_due(self, meta):
+        """距上次全量下载是否已超过 IGDB_FULL_REBUILD_DAYS 天
+
+        旧版本的缓存没有记录全量下载时间（dumped_at）：从未增量刷新过时取 cached_at，否则视为已到期。
+        """
+        dumped_at = meta.get("dumped_at") or (0 if meta.get("refreshed_at") else meta.get("cached_at", 0))
+        return time.time() - dumped_at >= self.IGDB_FULL_REBUILD_DAYS * 86400
+
     def get_igdb_dimension_game_counts(self, dimension):
         """获取某维度下各条目的 Steam 游戏数量（从本地缓存读取）
 
@@ -410,70 +459,33 @@ class SteamToolboxCore:
         Returns:
             dict: {item_id(int): count(int)}，无缓存则返回空字典
         """
-        cache = self.load_igdb_cache()
-        dim_data = cache.get(dimension, {})
-        if not isinstance(dim_data, dict):
-            return {}
-        result = {}
-        for item_key, entry in dim_data.items():
-            if isinstance(entry, dict) and "steam_ids" in entry:
-                try:
-                    result[int(item_key)] = len(entry["steam_ids"])
-                except (ValueError, TypeError):
-                    pass
-        return result
+        return self.get_igdb_store().get_dimension_counts(dimension)
 
     def get_igdb_cache_summary(self):
         """获取缓存摘要信息，用于 UI 显示
 
         Returns:
             dict: {'dimensions': {dim: {'count': int, 'games': int}}, 'total_steam_games': int,
-                   'newest_at': float, 'is_full_dump': bool}
+                   'newest_at': float, 'is_full_dump': bool, 'failed_games': int}
                   如果无缓存则返回 None
         """
-        cache = self.load_igdb_cache()
-        if not cache:
-            return None
-
-        meta = cache.get("_meta", {})
+        store = self.get_igdb_store()
+        meta = store.get_meta()
         is_full_dump = meta.get("type") == "full_dump"
 
-        # 新格式：按维度分区
+        # 按维度分区（旧格式缓存在迁移时已归入 genres 维度）
         dim_stats = {}
         all_timestamps = []
         total_items = 0
 
+        stats = store.get_dimension_stats()
         for dim_name in self.IGDB_DIMENSIONS:
-            dim_data = cache.get(dim_name, {})
-            if not isinstance(dim_data, dict):
+            dim_stat = stats.get(dim_name)
+            if not dim_stat or dim_stat['count'] <= 0:
                 continue
-            count = len(dim_data)
-            games = sum(len(entry.get("steam_ids", [])) for entry in dim_data.values() if isinstance(entry, dict))
-            timestamps = [entry.get("cached_at", 0) for entry in dim_data.values()
-                          if isinstance(entry, dict) and entry.get("cached_at")]
-            if count > 0:
-                dim_stats[dim_name] = {'count': count, 'games': games}
-                total_items += count
-                all_timestamps.extend(timestamps)
-
-        # 兼容旧格式（无维度分区，genre_id 直接在顶层）
-        if not dim_stats:
-            old_entries = {k: v for k, v in cache.items() if k != "_meta" and isinstance(v, dict) and "steam_ids" in v}
-            if old_entries:
-                total_genres = len(old_entries)
-                total_games = sum(len(entry.get("steam_ids", [])) for entry in old_entries.values())
-                timestamps = [entry.get("cached_at", 0) for entry in old_entries.values() if entry.get("cached_at")]
-                if not timestamps:
-                    return None
-                return {
-                    'total_genres': total_genres,
-                    'total_games': total_games,
-                    'oldest_at': min(timestamps),
-                    'newest_at': max(timestamps),
-                    'is_full_dump': is_full_dump,
-                    'total_steam_games': meta.get("total_steam_games", 0),
-                    'dimensions': {'genres': {'count': total_genres, 'games': total_games}},
-                }
+            dim_stats[dim_name] = {'count': dim_stat['count'], 'games': dim_stat['games']}
+            total_items += dim_stat['count']
+            all_timestamps.extend(ts for ts in (dim_stat['oldest_at'], dim_stat['newest_at']) if ts)
 
         if not all_timestamps:
             return None
@@ -485,33 +497,66 @@ class SteamToolboxCore:
             'newest_at': max(all_timestamps) if all_timestamps else 0,
             'is_full_dump': is_full_dump,
             'total_steam_games': meta.get("total_steam_games", 0),
+            'failed_games': len(meta.get("failed_game_ids") or []),
             # 向后兼容字段
             'total_genres': dim_stats.get('genres', {}).get('count', 0),
             'total_games': sum(d['games'] for d in dim_stats.values()),
         }
 
+    IGDB_STEAM_GAMES_ESTIMATE = 200000  # 尚未下载过时估算用的 Steam 关联游戏数
+    IGDB_DUMP_PAGE_SIZE = 500           # 全量下载每个请求的条数（external_games 翻页 / games 批量查询）
+
+    def estimate_igdb_full_download(self):
+        """按请求数和速率上限估算全量下载耗时，用于 UI 提示
+
+        请求数 = external_games 翻页数 + games 批量查询数 + 各扫描区间的末页和预查询；
+        游戏数取上次下载的结果，没有时取 IGDB_STEAM_GAMES_ESTIMATE。
+        速率上限给出耗时下限，上限按网络延迟和重试多留一半。
+
+        Returns:
+            str: 如 "3-5 分钟"
+        """
+        meta = self.get_igdb_store().get_meta()
+        games = meta.get("total_steam_games") or self.IGDB_STEAM_GAMES_ESTIMATE
+        pages = -(-games // self.IGDB_DUMP_PAGE_SIZE)
+        requests = pages * 2 + self.IGDB_MAX_CONCURRENCY * 4 + 1
+        seconds = requests / self.IGDB_REQUESTS_PER_SECOND
+        low = max(1, round(seconds / 60))
+        high = max(low + 1, round(seconds * 1.5 / 60))
+        return f"{low}-{high} 分钟"
+
     def clear_igdb_genre_cache(self):
-        """清除所有 IGDB 缓存"""
-        path = self.get_igdb_cache_path()
-        if os.path.exists(path):
-            try:
-                os.remove(path)
-            except:
-                pass
+        """清除所有 IGDB 缓存（包括依赖它的 IGDB 公司来源结果缓存）"""
+        try:
+            self.get_igdb_store().clear()
+            self.invalidate_source_cache("igdb_company")
+        except Exception:
+            pass
 
     # ==================== IGDB API 请求 ====================
 
-    def igdb_api_request(self, url, body, headers):
-        """发送 IGDB API 请求，自动处理速率限制和重试"""
+    IGDB_REQUESTS_PER_SECOND = 4  # IGDB 速率上限：每秒 4 个请求
+    IGDB_MAX_CONCURRENCY = 8      # IGDB 同时进行中的请求上限
+    IGDB_DUMP_CHECKPOINT_MAX_AGE = 86400  # 全量下载断点的有效期（秒），过期后重新开始
+    IGDB_BATCH_MAX_RETRIES = 4            # 全量下载中失败批次的最大重试轮数
+    IGDB_BACKOFF_BASE = 2.0               # 重试退避基数（秒），第 n 轮等待约 base * 2^(n-1) 秒
+    IGDB_BACKOFF_MAX = 30.0               # 单次退避等待上限（秒）
+
+    def igdb_api_request(self, url, body, headers, cancel_flag=None):
+        """发送 IGDB API 请求，自动处理速率限制和重试
+
+        请求前从共享令牌桶取令牌，多线程并发调用时总速率不超过 IGDB_REQUESTS_PER_SECOND。
+        """
         max_retries = 3
         for attempt in range(max_retries):
+            if not self.igdb_rate_limiter.acquire(cancel_flag=cancel_flag):
+                return None, "用户取消"
             try:
-                req = urllib.request.Request(url, data=body.encode('utf-8'), headers=headers, method='POST')
-                with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                    return json.loads(resp.read().decode('utf-8')), None
+                resp = self.http.request(url, data=body.encode('utf-8'), headers=headers, method='POST', timeout=30)
+                return resp.json(), None
             except urllib.error.HTTPError as e:
                 if e.code == 429:
-                    time.sleep(1.5)
+                    self.igdb_rate_limiter.penalize(1.5)
                     continue
                 return None, f"HTTP 错误 {e.code}"
             except urllib.error.URLError as e:
@@ -524,6 +569,8 @@ class SteamToolboxCore:
         """下载 IGDB 中所有有 Steam 关联的游戏及其多维度分类信息，存入本地缓存。
 
         策略：先从 external_games 拉取所有 Steam 关联，再批量查 genres/themes/keywords 等。
+        两个阶段都按 IGDB_MAX_CONCURRENCY 个线程并发请求，总速率由令牌桶控制在上限以内。
+        每页/每批完成后写入断点，取消、网络错误或程序关闭后再次调用会从断点继续。
 
         Args:
             progress_callback: fn(current, total, phase_str, detail_str)
@@ -543,136 +590,218 @@ class SteamToolboxCore:
             'Accept': 'application/json',
         }
 
-        # ===== 预查询：获取 Steam 关联记录的最大 ID，用于估算进度 =====
-        if progress_callback:
-            progress_callback(0, 0, "正在估算数据量...", "")
-
-        max_ext_id = 0
-        body = "fields id; where external_game_source = 1; sort id desc; limit 1;"
-        results, err = self.igdb_api_request(
-            "https://api.igdb.com/v4/external_games", body, headers)
-        if results:
-            max_ext_id = results[0].get('id', 0)
-        time.sleep(0.28)
-
-        # ===== 第1步：遍历 external_games 获取所有 Steam 关联 =====
-        game_to_steam = {}
-        last_id = 0
-        limit = 500
-
-        while True:
-            if cancel_flag and cancel_flag[0]:
-                return {}, "用户取消"
+        cancel_flag = cancel_flag if cancel_flag is not None else [False]
+        abort_flag = [False]  # 某个区间失败时通知其余区间停止
+        progress_lock = threading.Lock()
 
+        def report(current, total, phase, detail):
             if progress_callback:
-                step1_pct = (last_id / max_ext_id * 50) if max_ext_id > 0 else 0
-                progress_callback(int(step1_pct), 100,
-                                  "正在下载 Steam 游戏列表...",
-                                  f"已获取 {len(game_to_steam)} 个游戏")
-
-            body = (f"fields id,uid,game; "
-                    f"where external_game_source = 1 & id > {last_id}; "
-                    f"sort id asc; limit {limit};")
+                with progress_lock:
+                    progress_callback(current, total, phase, detail)
+
+        store = self.get_igdb_store()
+        checkpoint = store.get_dump_checkpoint()
+        if checkpoint and time.time() - checkpoint.get("started_at", 0) > self.IGDB_DUMP_CHECKPOINT_MAX_AGE:
+            checkpoint = None
+
+        if checkpoint:
+            # ===== 从上次中断处继续（断点在每页/每批完成后写入磁盘）=====
+            max_ext_id = checkpoint.get("max_ext_id", 0)
+            segments = checkpoint["segments"]
+            game_to_steam = store.get_dump_game_to_steam()
+            report(0, 0, "正在从上次中断处继续下载...", f"已有 {len(game_to_steam)} 个游戏")
+        else:
+            # ===== 预查询：获取 Steam 关联记录的最大 ID，用于估算进度和划分扫描区间 =====
+            report(0, 0, "正在估算数据量...", "")
 
+            max_ext_id = 0
+            body = "fields id; where external_game_source = 1; sort id desc; limit 1;"
             results, err = self.igdb_api_request(
-                "https://api.igdb.com/v4/external_games", body, headers)
+                "https://api.igdb.com/v4/external_games", body, headers, cancel_flag)
+            if results:
+                max_ext_id = results[0].get('id', 0)
 
-            if err:
-                return {}, f"下载 Steam 游戏列表失败：{err}"
-            if not results:
-                break
+            # 按 id 区间切分，每个区间内部仍按 id > last_id 顺序翻页（最后一个区间不设上界）
+            segments = store.start_dump_checkpoint(
+                max_ext_id, self._split_id_range(max_ext_id, self.IGDB_MAX_CONCURRENCY * 4))["segments"]
+            game_to_steam = {}
 
-            for item in results:
-                uid = item.get('uid', '')
-                game_id = item.get('game')
-                ext_id = item.get('id', 0)
-                if uid and uid.isdigit() and game_id:
-                    game_to_steam[int(game_id)] = int(uid)
-                if ext_id > last_id:
-                    last_id = ext_id
+        # ===== 第1步：并发遍历 external_games 获取所有 Steam 关联 =====
+        limit = self.IGDB_DUMP_PAGE_SIZE
 
-            if len(results) < limit:
-                break
-            time.sleep(0.28)
+        def scanned_count():
+            return sum(cursor - low for low, _, cursor, _ in segments)
+
+        def scan_segment(idx):
+            low, high, last_id, _ = segments[idx]
+            found = {}
+            while True:
+                if cancel_flag[0] or abort_flag[0]:
+                    return found, None
+                where = f"external_game_source = 1 & id > {last_id}"
+                if high is not None:
+                    where += f" & id <= {high}"
+                body = f"fields id,uid,game; where {where}; sort id asc; limit {limit};"
+                results, err = self.igdb_api_request(
+                    "https://api.igdb.com/v4/external_games", body, headers, cancel_flag)
+                if err:
+                    return found, err
+                page = {}
+                for item in results or []:
+                    uid = item.get('uid', '')
+                    game_id = item.get('game')
+                    ext_id = item.get('id', 0)
+                    if uid and uid.isdigit() and game_id:
+                        page[int(game_id)] = int(uid)
+                    if ext_id > last_id:
+                        last_id = ext_id
+                found.update(page)
+                finished = not results or len(results) < limit
+                # 写入断点：本页映射 + 区间扫描位置
+                with progress_lock:
+                    segments[idx][2] = last_id
+                    segments[idx][3] = finished
+                    store.save_dump_segment(segments, page)
+                    done = scanned_count()
+                report(int(done / max_ext_id * 50) if max_ext_id > 0 else 0, 100,
+                       "正在下载 Steam 游戏列表...",
+                       f"已扫描 {min(done, max_ext_id)}/{max_ext_id} 条关联记录")
+                if finished:
+                    break
+            return found, None
+
+        error = None
+        pending_segments = [idx for idx, seg in enumerate(segments) if not seg[3]]
+        if pending_segments:
+            report(int(scanned_count() / max_ext_id * 50) if max_ext_id > 0 else 0, 100,
+                   "正在下载 Steam 游戏列表...", f"并发扫描 {len(pending_segments)} 个区间")
+        with ThreadPoolExecutor(max_workers=self.IGDB_MAX_CONCURRENCY) as pool:
+            futures = [pool.submit(scan_segment, idx) for idx in pending_segments]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                found, err = future.result()
+                game_to_steam.update(found)
+                if err and not error:
+                    # 任一区间失败即中止其余区间（已下载的部分保留在断点中）
+                    error = err
+                    abort_flag[0] = True
+                if cancel_flag[0] or abort_flag[0]:
+                    for f in futures:
+                        f.cancel()
+
+        if cancel_flag[0]:
+            return {}, "用户取消"
+        if error:
+            return {}, f"下载 Steam 游戏列表失败：{error}"
 
         if not game_to_steam:
+            store.clear_dump_checkpoint()
             return {}, "未找到任何 Steam 游戏"
 
-        # ===== 第2步：批量查询这些游戏的多维度分类信息 =====
-        all_game_ids = list(game_to_steam.keys())
-        # dim_maps: {dimension: {item_id: set of steam_app_ids}}
-        dim_maps = {dim: {} for dim in self.IGDB_DIMENSIONS}
-        batch_size = 500
+        # ===== 第2步：并发批量查询这些游戏的多维度分类信息（跳过断点中已完成的游戏）=====
+        done_games = store.get_dump_done_games()
+        all_game_ids = sorted(gid for gid in game_to_steam if gid not in done_games)
+        batch_size = self.IGDB_DUMP_PAGE_SIZE
         total_batches = (len(all_game_ids) + batch_size - 1) // batch_size
 
-        for batch_idx in range(total_batches):
-            if cancel_flag and cancel_flag[0]:
-                return {}, "用户取消"
-
-            if progress_callback:
-                step2_pct = 50 + (batch_idx / total_batches * 50) if total_batches > 0 else 50
-                progress_callback(int(step2_pct), 100,
-                                  "正在下载游戏分类信息...",
-                                  f"进度 {batch_idx + 1}/{total_batches}（共 {len(all_game_ids)} 个游戏）")
-
+        def fetch_batch(batch_idx):
+            if cancel_flag[0]:
+                return None, "用户取消"
             batch = all_game_ids[batch_idx * batch_size: (batch_idx + 1) * batch_size]
             ids_str = ",".join(str(gid) for gid in batch)
-
             body = (f"fields id,{self.IGDB_GAME_FIELDS}; "
                     f"where id = ({ids_str}); "
                     f"limit {limit};")
+            results, err = self.igdb_api_request("https://api.igdb.com/v4/games", body, headers, cancel_flag)
+            if err:
+                return None, err
 
-            results, err = self.igdb_api_request(
-                "https://api.igdb.com/v4/games", body, headers)
+            rows = []
+            for item in results or []:
+                gid = item.get('id')
+                if not gid or gid not in game_to_steam:
+                    continue
+                # 遍历每个维度
+                for dim_name, dim_info in self.IGDB_DIMENSIONS.items():
+                    for item_id in item.get(dim_info['game_field'], None) or []:
+                        rows.append((gid, dim_name, item_id))
+            # 写入断点：本批次标记为已完成
+            store.save_dump_game_batch(batch, rows)
+            return rows, None
+
+        completed = 0
+        if done_games:
+            report(50, 100, "正在下载游戏分类信息...",
+                   f"已完成 {len(done_games)} 个游戏，剩余 {total_batches} 批")
+        else:
+            report(50, 100, "正在下载游戏分类信息...", f"进度 0/{total_batches}（共 {len(all_game_ids)} 个游戏）")
 
-            if err:
-                time.sleep(0.28)
-                continue
+        # 失败的批次进入重试队列，按指数退避（带随机抖动）分轮重试
+        pending = list(range(total_batches))
+        for attempt in range(self.IGDB_BATCH_MAX_RETRIES + 1):
+            if not pending:
+                break
+            if attempt > 0:
+                delay = self._backoff_delay(attempt)
+                report(int(50 + completed / total_batches * 50), 100,
+                       "正在下载游戏分类信息...",
+                       f"{len(pending)} 批下载失败，{delay:.0f} 秒后第 {attempt} 次重试")
+                if not self._cancellable_sleep(delay, cancel_flag):
+                    break
 
-            if results:
-                for item in results:
-                    gid = item.get('id')
-                    if not gid or gid not in game_to_steam:
+            failed = []
+            with ThreadPoolExecutor(max_workers=self.IGDB_MAX_CONCURRENCY) as pool:
+                futures = {pool.submit(fetch_batch, batch_idx): batch_idx for batch_idx in pending}
+                for future in as_completed(futures):
+                    if cancel_flag[0]:
+                        for f in futures:
+                            f.cancel()
+                        break
+
+                    _, err = future.result()
+                    if err:
+                        failed.append(futures[future])
                         continue
-                    steam_id = game_to_steam[gid]
-                    # 遍历每个维度
-                    for dim_name, dim_info in self.IGDB_DIMENSIONS.items():
-                        field_name = dim_info['game_field']
-                        item_ids = item.get(field_name, [])
-                        if item_ids:
-                            for item_id in item_ids:
-                                dim_maps[dim_name].setdefault(item_id, set()).add(steam_id)
+                    completed += 1
+                    report(int(50 + completed / total_batches * 50), 100,
+                           "正在下载游戏分类信息...",
+                           f"进度 {completed}/{total_batches}（共 {len(all_game_ids)} 个游戏）")
+            pending = sorted(failed)
 
-            time.sleep(0.28)
+        if cancel_flag[0]:
+            return {}, "用户取消"
 
-        # ===== 第3步：写入缓存 =====
-        cache = {}
-        now = time.time()
+        # 重试后仍失败的批次记入 _meta，下次使用时只补全这些游戏
+        failed_game_ids = sorted(gid for batch_idx in pending
+                                 for gid in all_game_ids[batch_idx * batch_size: (batch_idx + 1) * batch_size])
 
-        for dim_name, dim_data in dim_maps.items():
-            cache[dim_name] = {}
-            for item_id, steam_ids_set in dim_data.items():
-                cache[dim_name][str(item_id)] = {
-                    "steam_ids": sorted(steam_ids_set),
-                    "cached_at": now,
-                }
-
-        # 保存 game_to_steam 映射（供公司搜索等功能使用）
-        cache["_game_to_steam"] = {str(k): v for k, v in game_to_steam.items()}
+        # dim_maps: {dimension: {item_id: set of steam_app_ids}}（含断点中之前完成的批次）
+        dump_maps = store.get_dump_dim_maps()
+        dim_maps = {dim: dump_maps.get(dim, {}) for dim in self.IGDB_DIMENSIONS}
 
+        # ===== 第3步：写入缓存 =====
+        now = time.time()
         dim_summary = ", ".join(f"{self.IGDB_DIMENSIONS[d]['name']} {len(dim_maps[d])}" for d in dim_maps if dim_maps[d])
-        cache["_meta"] = {
+        meta = {
             "type": "full_dump",
             "cached_at": now,
+            "dumped_at": now,
             "total_steam_games": len(game_to_steam),
             "dimensions": list(self.IGDB_DIMENSIONS.keys()),
+            "failed_game_ids": failed_game_ids,
         }
-        self.save_igdb_cache(cache)
-
-        if progress_callback:
-            progress_callback(100, 100,
-                              "✅ 下载完成",
-                              f"共 {len(game_to_steam)} 个 Steam 游戏（{dim_summary}）")
+        # game_to_steam 映射一并保存（供公司搜索等功能使用）
+        store.replace_all(dim_maps, game_to_steam, meta, cached_at=now)
+        store.clear_dump_checkpoint()
+        # IGDB 公司来源的结果依赖 game_to_steam 映射
+        self.invalidate_source_cache("igdb_company")
+
+        if failed_game_ids:
+            report(100, 100, "⚠️ 下载完成（部分失败）",
+                   f"共 {len(game_to_steam)} 个 Steam 游戏，{len(failed_game_ids)} 个游戏的分类下载失败，下次使用时自动补全")
+        else:
+            report(100, 100, "✅ 下载完成", f"共 {len(game_to_steam)} 个 Steam 游戏（{dim_summary}）")
 
         # 返回值保持 genre_map 形式以兼容旧调用
         result = {}
@@ -682,10 +811,259 @@ class SteamToolboxCore:
                     result[item_id] = sorted(sids)
         return result, None
 
+    def _backoff_delay(self, attempt):
+        """第 attempt 轮重试前的等待时间：指数退避 + 随机抖动"""
+        delay = min(self.IGDB_BACKOFF_MAX, self.IGDB_BACKOFF_BASE * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def _cancellable_sleep(seconds, cancel_flag):
+        """可中断的等待，被取消时返回 False"""
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            if cancel_flag and cancel_flag[0]:
+                return False
+            time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+        return not (cancel_flag and cancel_flag[0])
+
+    @staticmethod
+    def _split_id_range(max_id, parts):
+        """将 (0, max_id] 切分为若干个 (low, high] 区间，最后一个区间不设上界（high=None）"""
+        if max_id <= 0 or parts <= 1:
+            return [(0, None)]
+        step = max(1, -(-max_id // parts))
+        segments = [(low, low + step) for low in range(0, max_id, step)]
+        segments[-1] = (segments[-1][0], None)
+        return segments
+
+    def refresh_igdb_cache_incremental(self, progress_callback=None, cancel_flag=None):
+        """增量刷新 IGDB 全量缓存：只下载上次全量/增量刷新之后 updated_at 有变化的记录
+
+        1. external_games 中 updated_at 更新过的 Steam 关联 → 修补 game_to_steam
+        2. games 中 updated_at 更新过、且有 Steam 关联的游戏 → 重新获取其分类
+        3. 受影响的 Steam AppID 在各维度下的倒排记录整体替换（同一 AppID 关联多个 game 时取并集）
+
+        只拉取有 Steam 关联的游戏（where 中按 external_games.external_game_source 过滤），
+        通常只有几千条记录，而不是 IGDB 中所有更新过的游戏。
+
+        局限：IGDB 中被删除（而不是改到其他 AppID）的 Steam 关联、被删除的游戏都不会出现在 updated_at 扫描中，
+        原 AppID 会一直保留这些游戏的分类。因此距上次全量下载超过 IGDB_FULL_REBUILD_DAYS 天后，
+        fetch_igdb_games_by_dimension 在缓存过期时改为全量重建（见 is_igdb_full_rebuild_due）。
+
+        Returns:
+            error: str | None
+        """
+        store = self.get_igdb_store()
+        meta = store.get_meta()
+        since = int(meta.get("cached_at") or 0)
+        if meta.get("type") != "full_dump" or not since:
+            return "本地没有全量数据，无法增量刷新"
+
+        client_id, _ = self.get_igdb_credentials()
+        access_token, error = self.get_igdb_access_token()
+        if error:
+            return error
+
+        headers = {
+            'Client-ID': client_id,
+            'Authorization': f'Bearer {access_token}',
+            'Accept': 'application/json',
+        }
+        cancel_flag = cancel_flag if cancel_flag is not None else [False]
+        limit = 500
+        now = time.time()
+
+        def keyset_scan(endpoint, fields, where, phase):
+            """按 id 顺序翻页拉取满足条件的全部记录"""
+            records = []
+            last_id = 0
+            while True:
+                if cancel_flag[0]:
+                    return None, "用户取消"
+                body = f"fields {fields}; where {where} & id > {last_id}; sort id asc; limit {limit};"
+                results, err = self.igdb_api_request(
+                    f"https://api.igdb.com/v4/{endpoint}", body, headers, cancel_flag)
+                if err:
+                    return None, err
+                if not results:
+                    break
+                records.extend(results)
+                last_id = max(item.get('id', 0) for item in results)
+                if progress_callback:
+                    progress_callback(0, 0, phase, f"已获取 {len(records)} 条变化记录")
+                if len(results) < limit:
+                    break
+            return records, None
+
+        # ===== 第1步：变化的 Steam 关联 =====
+        records, err = keyset_scan("external_games", "id,uid,game",
+                                   f"external_game_source = 1 & updated_at > {since}",
+                                   "正在检查 Steam 关联变化...")
+        if err:
+            return f"增量刷新失败：{err}"
+        game_to_steam_delta = {}
+        for item in records:
+            uid = item.get('uid', '')
+            game_id = item.get('game')
+            if uid and uid.isdigit() and game_id:
+                game_to_steam_delta[int(game_id)] = int(uid)
+
+        # ===== 第2步：分类有变化的游戏 =====
+        fields = f"id,{self.IGDB_GAME_FIELDS}"
+        records, err = keyset_scan("games", fields,
+                                   f"external_games.external_game_source = 1 & updated_at > {since}",
+                                   "正在检查游戏分类变化...")
+        if err:
+            return f"增量刷新失败：{err}"
+        game_records = {item['id']: item for item in records if item.get('id')}
+
+        # 上次下载失败的游戏一并补全
+        known = store.lookup_steam_ids(set(game_records) | set(meta.get("failed_game_ids") or []))
+        game_to_steam = dict(known)
+        game_to_steam.update(game_to_steam_delta)
+        changed_games = set(game_to_steam_delta) | set(known)
+
+        # 改关联到其他 AppID 的游戏：原 AppID 的倒排记录也要按剩下的游戏重建
+        previous = store.lookup_steam_ids(game_to_steam_delta)
+        moved_from = {sid for gid, sid in previous.items() if sid != game_to_steam_delta[gid]}
+
+        # ===== 第3步：补齐受影响 AppID 关联的其他游戏，按 AppID 汇总分类 =====
+        steam_items, err = self._collect_igdb_steam_items(
+            game_to_steam, changed_games, game_records, headers, cancel_flag, progress_callback,
+            extra_steam_ids=moved_from)
+        if err:
+            return f"增量刷新失败：{err}"
+
+        # ===== 第4步：原地修补倒排表 =====
+        store.apply_incremental_update(game_to_steam_delta, steam_items, {
+            "cached_at": now,
+            "refreshed_at": now,
+            "refresh_type": "incremental",
+            "failed_game_ids": [],
+            "repair_attempts": 0,
+        }, cached_at=now)
+        store.set_meta({"total_steam_games": store.count_game_to_steam()})
+        if game_to_steam_delta:
+            self.invalidate_source_cache("igdb_company")
+
+        if progress_callback:
+            progress_callback(100, 100, "✅ 增量刷新完成",
+                              f"{len(game_to_steam_delta)} 个新关联，{len(steam_items)} 个 Steam 游戏分类有变化")
+        return None
+
+    def _collect_igdb_steam_items(self, game_to_steam, changed_games, game_records, headers,
+                                  cancel_flag, progress_callback=None, extra_steam_ids=()):
+        """按 Steam AppID 汇总分类：受影响 AppID 关联的所有游戏（含未变化的）都会纳入并集
+
+        Args:
+            game_to_steam: 至少包含 changed_games 的 {game_id: steam_id}（新的映射）
+            changed_games: 有变化（需要重新计算分类）的 game ID 集合
+            game_records: 已获取的 {game_id: games 记录}，缺失的会按 ID 批量补齐
+            extra_steam_ids: 另外需要重建的 AppID（如游戏改关联前的原 AppID，可能已没有任何游戏）
+
+        Returns:
+            (steam_items, error): steam_items = {steam_id: {dimension: set of item_ids}}
+        """
+        store = self.get_igdb_store()
+        affected_sids = {game_to_steam[gid] for gid in changed_games if gid in game_to_steam}
+        affected_sids.update(int(sid) for sid in extra_steam_ids)
+        # 本地映射以 game_to_steam 为准：已改关联到其他 AppID 的游戏不再计入原 AppID
+        sid_games = {sid: [gid for gid in gids if game_to_steam.get(gid, sid) == sid]
+                     for sid, gids in store.get_games_for_steam_ids(affected_sids).items()}
+        for sid in affected_sids:
+            sid_games.setdefault(sid, [])
+        for gid in changed_games:
+            if gid not in game_to_steam:
+                continue
+            gids = sid_games.setdefault(game_to_steam[gid], [])
+            if gid not in gids:
+                gids.append(gid)
+
+        limit = 500
+        fields = f"id,{self.IGDB_GAME_FIELDS}"
+        missing = sorted({gid for gids in sid_games.values() for gid in gids} - set(game_records))
+        for i in range(0, len(missing), limit):
+            if cancel_flag[0]:
+                return None, "用户取消"
+            if progress_callback:
+                progress_callback(i, len(missing), "正在获取受影响游戏的分类...", f"{i}/{len(missing)}")
+            ids_str = ",".join(str(gid) for gid in missing[i:i + limit])
+            results, err = self.igdb_api_request(
+                "https://api.igdb.com/v4/games", f"fields {fields}; where id = ({ids_str}); limit {limit};",
+                headers, cancel_flag)
+            if err:
+                return None, err
+            for item in results or []:
+                if item.get('id'):
+                    game_records[item['id']] = item
+
+        steam_items = {}
+        for sid, gids in sid_games.items():
+            dims = {dim: set() for dim in self.IGDB_DIMENSIONS}
+            for gid in gids:
+                item = game_records.get(gid, {})
+                for dim_name, dim_info in self.IGDB_DIMENSIONS.items():
+                    dims[dim_name].update(item.get(dim_info['game_field'], None) or [])
+            steam_items[sid] = dims
+        return steam_items, None
+
+    IGDB_REPAIR_COOLDOWN = 3600     # 两次自动补全之间的最短间隔（秒）
+    IGDB_REPAIR_MAX_ATTEMPTS = 5    # 自动补全的最多尝试次数，之后等下次全量下载
+
+    def repair_igdb_cache(self, progress_callback=None, cancel_flag=None, force=False):
+        """补全上次全量下载中多次重试仍失败的游戏批次（只请求 _meta.failed_game_ids 中的游戏）
+
+        尝试时间和次数记入 _meta（repair_attempted_at / repair_attempts）：距上次尝试不足
+        IGDB_REPAIR_COOLDOWN 秒，或已尝试 IGDB_REPAIR_MAX_ATTEMPTS 次时跳过（force=True 除外），
+        避免一直失败的游戏让每次分类查询都多一次网络请求。全量下载会清空这些记录。
+
+        Returns:
+            error: str | None（无需补全或跳过时返回 None）
+        """
+        store = self.get_igdb_store()
+        meta = store.get_meta()
+        failed_ids = meta.get("failed_game_ids") or []
+        if not failed_ids:
+            return None
+
+        attempts = meta.get("repair_attempts") or 0
+        if not force:
+            if attempts >= self.IGDB_REPAIR_MAX_ATTEMPTS:
+                return None
+            if time.time() - (meta.get("repair_attempted_at") or 0) < self.IGDB_REPAIR_COOLDOWN:
+                return None
+        store.set_meta({"repair_attempted_at": time.time(), "repair_attempts": attempts + 1})
+
+        client_id, _ = self.get_igdb_credentials()
+        access_token, error = self.get_igdb_access_token()
+        if error:
+            return error
+
+        headers = {
+            'Client-ID': client_id,
+            'Authorization': f'Bearer {access_token}',
+            'Accept': 'application/json',
+        }
+        cancel_flag = cancel_flag if cancel_flag is not None else [False]
+        if progress_callback:
+            progress_callback(0, 0, "正在补全上次下载失败的数据...", f"{len(failed_ids)} 个游戏")
+
+        game_to_steam = store.lookup_steam_ids(failed_ids)
+        steam_items, err = self._collect_igdb_steam_items(
+            game_to_steam, set(game_to_steam), {}, headers, cancel_flag, progress_callback)
+        if err:
+            return f"补全失败：{err}"
+
+        store.apply_incremental_update({}, steam_items, {"failed_game_ids": [], "repair_attempts": 0})
+        if progress_callback:
+            progress_callback(100, 100, "✅ 补全完成", f"{len(failed_ids)} 个游戏")
+        return None
+
     def fetch_igdb_games_by_dimension(self, dimension, item_id, item_name, progress_callback=None, force_refresh=False):
         """根据维度和条目 ID 获取该条目下所有游戏的 Steam AppID
 
-        优先使用本地全量缓存。如果缓存不存在或已过期，则自动触发全量构建。
+        优先使用本地全量缓存。缓存已过期时增量刷新，缓存不存在、距上次全量下载超过
+        IGDB_FULL_REBUILD_DAYS 天（或 force_refresh）时全量构建。
 
         Args:
             dimension: 维度名称，如 'genres', 'themes', 'keywords', ...
@@ -693,6 +1071,10 @@ class SteamToolboxCore:
             item_name: 条目名称（用于显示）
         """
         if not force_refresh:
+            # 上次全量下载有失败的批次：先补全这些游戏（补全失败时仍使用现有缓存，冷却期过后再试）
+            if self.get_igdb_store().get_meta().get("failed_game_ids"):
+                self.repair_igdb_cache(progress_callback)
+
             cached_ids, cached_at = self.get_igdb_dimension_cache(dimension, item_id)
             if cached_ids is not None and self.is_igdb_cache_valid(cached_at):
                 if progress_callback:
@@ -703,8 +1085,7 @@ class SteamToolboxCore:
                 return cached_ids, None
 
             # 该条目无缓存，但全量缓存可能已构建（只是该条目确实没有 Steam 游戏）
-            cache = self.load_igdb_cache()
-            meta = cache.get("_meta", {})
+            meta = self.get_igdb_store().get_meta()
             if meta.get("type") == "full_dump" and self.is_igdb_cache_valid(meta.get("cached_at", 0)):
                 if progress_callback:
                     age_hours = (time.time() - meta["cached_at"]) / 3600
@@ -712,11 +1093,18 @@ class SteamToolboxCore:
                                       f"使用本地缓存", f"{item_name}: 0 个 Steam 游戏（缓存于 {age_hours:.0f} 小时前）")
                 return [], None
 
-        # === 缓存不存在或已过期：触发下载 ===
-        if progress_callback:
-            progress_callback(0, 0, "本地数据不完整，正在从 IGDB 下载...", "首次下载约需 5-8 分钟")
-
-        genre_map, error = self.build_igdb_full_cache(progress_callback)
+        # === 缓存已过期但有全量数据：只下载变化的部分 ===
+        meta = self.get_igdb_store().get_meta()
+        if (not force_refresh and meta.get("type") == "full_dump" and meta.get("cached_at")
+                and not self.is_igdb_full_rebuild_due(meta)):
+            error = self.refresh_igdb_cache_incremental(progress_callback)
+        else:
+            # === 缓存不存在，或距上次全量下载太久：触发全量下载 ===
+            if progress_callback:
+                phase = ("正在从 IGDB 全量更新（定期清除已删除的关联）..." if meta.get("type") == "full_dump"
+                         else "本地数据不完整，正在从 IGDB 下载...")
+                progress_callback(0, 0, phase, f"全量下载约需 {self.estimate_igdb_full_download()}")
+            _, error = self.build_igdb_full_cache(progress_callback)
         if error:
             return [], error
 
@@ -808,20 +1196,19 @@ class SteamToolboxCore:
             if len(results) < limit:
                 break
             offset += limit
-            time.sleep(0.28)
 
-        # 用本地缓存的 game_to_steam 映射计算 Steam 游戏数
-        cache = self.load_igdb_cache()
-        game_to_steam = cache.get("_game_to_steam", {})
+        # 用本地缓存的 game_to_steam 映射计算 Steam 游戏数（只查询涉及的 game）
+        all_game_ids = set().union(*company_games.values())
+        game_to_steam = self.get_igdb_store().lookup_steam_ids(all_game_ids)
 
         counts = {}
         for cid, game_ids in company_games.items():
-            steam_count = sum(1 for gid in game_ids if game_to_steam.get(str(gid)))
+            steam_count = sum(1 for gid in game_ids if game_to_steam.get(gid))
             counts[cid] = steam_count
 
         return counts
 
-    def fetch_igdb_games_by_company(self, company_id, company_name, progress_callback=None):
+    def fetch_igdb_games_by_company(self, company_id, company_name, progress_callback=None, use_cache=True):
         """获取某公司关联的所有 Steam 游戏
 
         策略：查 involved_companies → 获取 game IDs → 用本地 game_to_steam 映射转换
@@ -830,10 +1217,18 @@ class SteamToolboxCore:
             company_id: IGDB 公司 ID
             company_name: 公司名称（用于显示）
             progress_callback: 进度回调
+            use_cache: 是否使用来源结果缓存；为 False 时重新查询并覆盖缓存。
+                       结果依赖本地 game_to_steam 映射，IGDB 缓存重建或增量刷新后缓存失效
 
         Returns:
             (steam_ids, error)
         """
+        cache_key = self.source_cache.make_key("igdb_company", company_id)
+        if use_cache:
+            cached = self.get_cached_source_result("igdb_company", cache_key, progress_callback, company_name)
+            if cached:
+                return cached[0], None
+
         client_id, _ = self.get_igdb_credentials()
         access_token, error = self.get_igdb_access_token()
         if error:
@@ -873,7 +1268,6 @@ class SteamToolboxCore:
             if len(results) < limit:
                 break
             offset += limit
-            time.sleep(0.28)
 
         if not game_ids:
             return [], None
@@ -882,20 +1276,20 @@ class SteamToolboxCore:
             progress_callback(50, 100, f"正在匹配 Steam 游戏...", f"共 {len(game_ids)} 个 IGDB 游戏")
 
         # 尝试用本地 game_to_steam 映射
-        cache = self.load_igdb_cache()
-        game_to_steam = cache.get("_game_to_steam", {})
+        game_to_steam = self.get_igdb_store().lookup_steam_ids(game_ids)
 
         steam_ids = set()
         unmapped_ids = []
 
         for gid in game_ids:
-            steam_id = game_to_steam.get(str(gid))
+            steam_id = game_to_steam.get(gid)
             if steam_id:
                 steam_ids.add(int(steam_id))
             else:
                 unmapped_ids.append(gid)
 
-        # 对于未映射的游戏，通过 API 查询 external_games
+        # 对于未映射的游戏，通过 API 查询 external_games（有批次失败时结果不完整，不写入缓存）
+        incomplete = False
         if unmapped_ids:
             batch_size = 500
             for i in range(0, len(unmapped_ids), batch_size):
@@ -906,18 +1300,22 @@ class SteamToolboxCore:
                         f"limit {batch_size};")
                 results, err = self.igdb_api_request(
                     "https://api.igdb.com/v4/external_games", body, headers)
+                if err:
+                    incomplete = True
                 if results:
                     for item in results:
                         uid = item.get('uid', '')
                         if uid and uid.isdigit():
                             steam_ids.add(int(uid))
-                time.sleep(0.28)
 
         if progress_callback:
             progress_callback(100, 100, f"✅ 查询完成",
                               f"{company_name}: {len(steam_ids)} 个 Steam 游戏")
 
-        return sorted(steam_ids), None
+        steam_ids = sorted(steam_ids)
+        if steam_ids and not incomplete:
+            self.source_cache.put(cache_key, "igdb_company", steam_ids, company_name, label=str(company_id))
+        return steam_ids, None
 
     def load_json(self):
         if not self.current_account.storage_path or not os.path.exists(self.current_account.storage_path):
@@ -925,7 +1323,7 @@ class SteamToolboxCore:
             return None
         try:
             with open(self.current_account.storage_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return CloudStorageData.from_text(f.read())
         except Exception as e:
             messagebox.showerror("读取错误", f"解析失败: {e}")
             return None
@@ -956,7 +1354,11 @@ class SteamToolboxCore:
         tmp_path = self.current_account.storage_path + ".tmp"
         try:
             with open(tmp_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                if isinstance(data, CloudStorageData):
+                    # 增量序列化：未改动的条目直接复用读取时的原文，只编码新增/修改的条目
+                    f.write(data.dumps()[0])
+                else:
+                    json_codec.dump(data, f)
 
             # 原子替换
             if os.path.exists(self.current_account.storage_path):
@@ -989,26 +1391,17 @@ class SteamToolboxCore:
     def get_all_collections_with_refs(data):
         """获取所有收藏夹（含动态收藏夹）及其 entry 引用，按字母排序"""
         collections = []
-        for entry in data:
-            key = entry[0]
-            meta = entry[1]
-            if key.startswith("user-collections."):
-                if meta.get("is_deleted") is True or "value" not in meta:
-                    continue
-                try:
-                    val_obj = json.loads(meta['value'])
-                    is_dynamic = "filterSpec" in val_obj
-                    icon = "🔍" if is_dynamic else "📁"
-                    collections.append({
-                        "entry_ref": entry,
-                        "id": val_obj.get("id"),
-                        "name": val_obj.get("name"),
-                        "added": val_obj.get("added", []),
-                        "is_dynamic": is_dynamic,
-                        "display_name": f"{icon} {val_obj.get('name', '未命名')}"
-                    })
-                except Exception:
-                    continue
+        for rec in CollectionStore.of(data).records():
+            val_obj = rec.value
+            icon = "🔍" if rec.is_dynamic else "📁"
+            collections.append({
+                "entry_ref": rec.entry,
+                "id": val_obj.get("id"),
+                "name": val_obj.get("name"),
+                "added": val_obj.get("added", []),
+                "is_dynamic": rec.is_dynamic,
+                "display_name": f"{icon} {val_obj.get('name', '未命名')}"
+            })
         collections.sort(key=lambda c: (c.get('name') or '').lower())
         return collections
 
@@ -1016,51 +1409,70 @@ class SteamToolboxCore:
     def get_all_collections_ordered(data):
         """获取所有收藏夹（按字母顺序排序，与 Steam 客户端一致）"""
         collections = []
-        for entry in data:
-            key = entry[0]
-            meta = entry[1]
-            if key.startswith("user-collections."):
-                if meta.get("is_deleted") is True or "value" not in meta:
-                    continue
-                try:
-                    val_obj = json.loads(meta['value'])
-                    is_dynamic = "filterSpec" in val_obj
-                    col_info = {
-                        "id": val_obj.get("id"),
-                        "name": val_obj.get("name", "未命名"),
-                        "added": val_obj.get("added", []),
-                        "removed": val_obj.get("removed", []),
-                        "is_dynamic": is_dynamic
-                    }
-                    if is_dynamic:
-                        col_info["filterSpec"] = val_obj.get("filterSpec")
-                    collections.append(col_info)
-                except Exception:
-                    continue
+        for rec in CollectionStore.of(data).records():
+            val_obj = rec.value
+            col_info = {
+                "id": val_obj.get("id"),
+                "name": val_obj.get("name", "未命名"),
+                "added": val_obj.get("added", []),
+                "removed": val_obj.get("removed", []),
+                "is_dynamic": rec.is_dynamic
+            }
+            if rec.is_dynamic:
+                col_info["filterSpec"] = val_obj.get("filterSpec")
+            collections.append(col_info)
         collections.sort(key=lambda c: c['name'].lower())
         return collections
 
     @staticmethod
     def extract_ids_from_html(html_text):
-        """核心提取逻辑：从 HTML 中提取 AppID"""
-        search_area = html_text
+        """核心提取逻辑：从 HTML 中提取 AppID（网络页面请用 scan_html_page 流式提取）"""
+        start, end = 0, len(html_text)
         list_start = html_text.find('id="RecommendationsRows"')
         if list_start == -1:
             list_start = html_text.find('class="creator_grid_ctn"')
 
         if list_start != -1:
             footer_start = html_text.find('id="footer"', list_start)
-            search_area = html_text[list_start: (footer_start if footer_start != -1 else len(html_text))]
+            start, end = list_start, (footer_start if footer_start != -1 else end)
 
-        raw_matches = re.findall(r'data-ds-appid="([\d,]+)"', search_area)
-        all_ids = []
-        for m in raw_matches:
-            if ',' in m:
-                all_ids.extend(m.split(','))
-            else:
-                all_ids.append(m)
+        # 直接在原字符串的 [start, end) 区间内匹配，不复制搜索区域
+        all_ids = {}
+        for m in re.compile(r'data-ds-appid="([\d,]+)"').finditer(html_text, start, end):
+            for aid in m.group(1).split(','):
+                if aid.isdigit():
+                    all_ids[int(aid)] = None
+        return list(all_ids)
 
-        return list(dict.fromkeys([int(aid) for aid in all_ids if aid.isdigit()]))
+    def scan_html_page(self, url, headers, timeout=30, cache_ttl=None, **scanner_options):
+        """流式下载页面并用 HtmlStreamScanner 边下载边扫描，扫描结束（遇到页脚等）后不再下载剩余内容
+
+        Args:
+            scanner_options: 传给 HtmlStreamScanner 的参数（id_pattern、first_patterns、limit 等）
+
+        Returns:
+            HtmlStreamScanner：ids 为提取到的 AppID，first / maxima 为 first_patterns / max_patterns 的匹配结果
+        """
+        scanner = HtmlStreamScanner(**scanner_options)
+        chunks = self.http.stream(url, headers=headers, timeout=timeout, cache_ttl=cache_ttl)
+        try:
+            for text in chunks:
+                scanner.feed(text)
+                if scanner.done:
+                    break
+        finally:
+            chunks.close()
+        scanner.close()
+        return scanner
+
+    @staticmethod
+    def clean_page_name(raw_name):
+        """去掉页面名称中的标签和常见实体，无效（为空或过长）时返回 None"""
+        if not raw_name:
+            return None
+        name = re.sub(r'<[^>]+>', '', raw_name).strip()
+        name = name.replace('&amp;', '&').replace('&quot;', '"')
+        return name if name and len(name) < 100 else None
 
     def extract_page_name_from_html(self, html_text, url_hint=""):
         """从 HTML 中智能提取页面名称（带类型前缀）"""
@@ -1131,8 +1543,110 @@ class SteamToolboxCore:
 
         return None, None
 
-    def fetch_steam_list(self, page_type, identifier, progress_callback=None, login_cookies=None):
-        """通过 Steam API 自动获取列表页面的所有游戏"""
+    HTTP_MAX_CONCURRENCY_PER_HOST = 6  # 同一主机（如 Steam 商店）同时进行中的请求上限
+    HTTP_CACHE_TTL = 3600              # 页面缓存默认有效期（秒），可在 config.json 的 http_cache_ttl 中修改
+    HTTP_CACHE_MAX_AGE = 7 * 86400     # 超过此时间未更新的页面缓存在启动时清理
+    # 来源结果缓存的有效期（秒），按来源类型区分，可在 config.json 的 source_cache_ttls 中覆盖
+    SOURCE_CACHE_TTLS = {
+        "steam250": 24 * 3600,       # Steam250 榜单每天更新一次
+        "curator": 6 * 3600,
+        "publisher": 12 * 3600,
+        "developer": 12 * 3600,
+        "igdb_company": 7 * 86400,   # 与 IGDB 缓存有效期一致
+    }
+    SOURCE_CACHE_DEFAULT_TTL = 12 * 3600
+    CURATOR_PAGE_SIZE = 100            # 鉴赏家推荐 API 每页条数
+    CURATOR_PAGE_MAX_RETRIES = 3       # 鉴赏家推荐分页失败（异常或 success 为假）时的最大重试次数
+    GENERIC_LIST_MAX_PAGES = 50        # 发行商/开发商/系列等页面最多抓取的页数
+    # 分页链接中的页码，用于从已获取的页面推断总页数
+    GENERIC_LIST_PAGE_LINK_PATTERN = r'[?&](?:amp;)?page=(\d+)'
+    # 鉴赏家推荐在不同语言下可能隐藏部分游戏，需逐语言扫描后合并：(l 参数, Accept-Language, 显示名)
+    CURATOR_LANG_CONFIGS = [
+        ("schinese", "zh-CN,zh;q=0.9,en;q=0.8", "简体中文"),
+        ("english", "en-US,en;q=0.9", "English"),
+        ("japanese", "ja,en;q=0.8", "日本語"),
+        ("tchinese", "zh-TW,zh;q=0.9,en;q=0.8", "繁體中文"),
+        ("koreana", "ko,en;q=0.8", "한국어"),
+    ]
+
+    def get_http_cache_ttl(self):
+        """页面缓存有效期（秒）。有效期内直接使用本地内容，过期后向服务器发条件请求重新验证"""
+        try:
+            return max(0, int(self.load_config().get("http_cache_ttl", self.HTTP_CACHE_TTL)))
+        except (TypeError, ValueError):
+            return self.HTTP_CACHE_TTL
+
+    def get_source_cache_ttl(self, source_type):
+        """某类来源结果缓存的有效期（秒）"""
+        overrides = self.load_config().get("source_cache_ttls", {})
+        try:
+            return max(0, int(overrides[source_type]))
+        except (KeyError, TypeError, ValueError):
+            return self.SOURCE_CACHE_TTLS.get(source_type, self.SOURCE_CACHE_DEFAULT_TTL)
+
+    def get_cached_source_result(self, source_type, key, progress_callback=None, label=""):
+        """读取来源结果缓存，命中时通过 progress_callback 提示
+
+        Returns:
+            (ids, name, extra)，未命中时返回 None
+        """
+        cached = self.source_cache.get(key, self.get_source_cache_ttl(source_type))
+        if cached is None:
+            return None
+        ids, name, stored_at, extra = cached
+        if progress_callback:
+            age_minutes = (time.time() - stored_at) / 60
+            age_str = f"{age_minutes:.0f} 分钟前" if age_minutes < 60 else f"{age_minutes / 60:.1f} 小时前"
+            progress_callback(len(ids), len(ids), "使用本地缓存",
+                              f"{name or label}: {len(ids)} 个游戏（缓存于 {age_str}）")
+        return ids, name, extra
+
+    def invalidate_source_cache(self, source_type=None):
+        """清除来源结果缓存（默认全部），之后的获取重新请求网络"""
+        self.source_cache.invalidate(source_type)
+
+    def get_curator_lang_history_path(self):
+        return os.path.join(self.data_dir, "curator_lang_history.json")
+
+    def load_curator_lang_history(self):
+        """加载鉴赏家多语言扫描历史：{curator_id: {lang_code: {'scans': int, 'contributed': int}}}"""
+        path = self.get_curator_lang_history_path()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json_codec.load(f)
+            except:
+                pass
+        return {}
+
+    def update_curator_lang_history(self, curator_id, lang_yield):
+        """记录一次扫描中各语言是否补充了新游戏（被跳过、未扫完或有分页失败的语言不计入）"""
+        with self._curator_history_lock:
+            history = self.load_curator_lang_history()
+            curator_history = history.setdefault(str(curator_id), {})
+            for lang_code, info in lang_yield.items():
+                if info['skipped'] or info['failed_pages'] or info['pages'] < info['total_pages']:
+                    continue
+                lang_history = curator_history.setdefault(lang_code, {'scans': 0, 'contributed': 0})
+                lang_history['scans'] += 1
+                if info['new_ids'] > 0:
+                    lang_history['contributed'] += 1
+            try:
+                with open(self.get_curator_lang_history_path(), 'w', encoding='utf-8') as f:
+                    json_codec.dump(history, f, indent=2)
+            except:
+                pass
+
+    def fetch_steam_list(self, page_type, identifier, progress_callback=None, login_cookies=None,
+                         smart_sweep=True, sweep_report=None, use_cache=True):
+        """通过 Steam API 自动获取列表页面的所有游戏
+
+        Args:
+            smart_sweep: 鉴赏家类页面是否启用智能多语言扫描（见 fetch_curator_style_api）
+            sweep_report: 可选的 dict，鉴赏家类页面扫描后写入各语言的贡献统计（命中结果缓存时写入缓存时的统计）
+            use_cache: 是否使用来源结果缓存（缓存键区分是否登录和 smart_sweep，有效期见 SOURCE_CACHE_TTLS）；
+                       为 False 时重新获取并覆盖缓存
+        """
         type_names = {
             "curator": "鉴赏家",
             "publisher": "发行商",
@@ -1151,18 +1665,59 @@ class SteamToolboxCore:
         else:
             cookies = base_cookies
 
+        # 登录与否会影响能看到的游戏，智能扫描可能跳过部分语言，因此 has_login、smart_sweep 都是缓存键的一部分
+        cache_key = self.source_cache.make_key("steam_list", page_type, identifier, has_login, smart_sweep)
+        if use_cache:
+            cached = self.get_cached_source_result(page_type, cache_key, progress_callback, identifier)
+            if cached:
+                ids, display_name, cached_report = cached
+                if sweep_report is not None and cached_report:
+                    sweep_report.clear()
+                    sweep_report.update(cached_report)
+                return ids, display_name, None, has_login
+
+        # 调用方不关心扫描统计时也需要它来判断结果是否完整
+        if sweep_report is None:
+            sweep_report = {}
         if page_type in ("curator", "publisher", "developer"):
-            return self.fetch_curator_style_api(page_type, identifier, type_name_cn, cookies, has_login,
-                                                 progress_callback)
+            result = self.fetch_curator_style_api(page_type, identifier, type_name_cn, cookies, has_login,
+                                                  progress_callback, smart_sweep, sweep_report)
+            failed_pages = self.count_failed_pages(sweep_report)
         else:
-            return self.fetch_generic_list(page_type, identifier, type_name_cn, cookies, has_login, progress_callback)
+            page_report = {}
+            result = self.fetch_generic_list(page_type, identifier, type_name_cn, cookies, has_login, progress_callback,
+                                             page_report)
+            failed_pages = page_report.get('failed_pages', 0)
+
+        ids, display_name, error, _ = result
+        # 有分页重试后仍失败的结果不完整，不写入缓存，下次重新获取
+        if not error and ids and not failed_pages:
+            self.source_cache.put(cache_key, page_type, ids, display_name, label=f"{page_type}/{identifier}",
+                                  extra=sweep_report or None)
+        return result
 
-    def fetch_curator_style_api(self, page_type, identifier, type_name_cn, cookies, has_login, progress_callback=None):
-        """统一的 ajaxgetfilteredrecommendations API 抓取"""
+    @staticmethod
+    def count_failed_pages(sweep_report):
+        """sweep_report（见 fetch_curator_style_api）中重试后仍失败的分页总数"""
+        return sum(info.get('failed_pages', 0) for info in sweep_report.values())
+
+    def fetch_curator_style_api(self, page_type, identifier, type_name_cn, cookies, has_login, progress_callback=None,
+                                smart_sweep=True, sweep_report=None):
+        """统一的 ajaxgetfilteredrecommendations API 抓取
+
+        Args:
+            smart_sweep: 智能扫描。主语言完整扫描；其余语言先只取第一页，若其 total_count 不超过
+                         已收集的数量、第一页没有新游戏、且该鉴赏家的历史记录中此语言从未补充过新游戏，
+                         则跳过剩余分页。为 False 时所有语言完整扫描。
+            sweep_report: 可选的 dict，扫描后写入 {lang_code: {'name', 'total_count', 'pages',
+                          'total_pages', 'new_ids', 'failed_pages', 'skipped', 'reason'}}，new_ids 为该语言比
+                          之前的语言多出的游戏数，failed_pages 为重试后仍失败的分页数（不为 0 时结果不完整）
+        """
         from urllib.parse import unquote
 
         page_url = f"https://store.steampowered.com/{page_type}/{identifier}/"
         curator_id = None
+        cache_ttl = self.get_http_cache_ttl()
         page_name = None
 
         headers_html = {
@@ -1177,23 +1732,17 @@ class SteamToolboxCore:
             if progress_callback:
                 progress_callback(0, 0, "正在验证鉴赏家页面...", "正在连接 Steam 商店...")
             try:
-                req = urllib.request.Request(page_url, headers=headers_html)
-                with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                    html_content = resp.read().decode('utf-8')
-
                 name_patterns = [
                     r'class="curator_name"[^>]*>.*?<a[^>]*>(.*?)</a>',
                     r'<title>Steam 鉴赏家：([^<]+?)</title>',
                     r'<title>([^<]+?)(?:\s*[-–—]\s*Steam)?</title>',
                 ]
-                for pattern in name_patterns:
-                    match = re.search(pattern, html_content, re.S | re.I)
-                    if match:
-                        extracted = re.sub(r'<[^>]+>', '', match.group(1)).strip()
-                        extracted = extracted.replace('&amp;', '&').replace('&quot;', '"')
-                        if extracted and len(extracted) < 100:
-                            page_name = extracted
-                            break
+                scanner = self.scan_html_page(page_url, headers_html, timeout=30, cache_ttl=cache_ttl, id_pattern=None,
+                                              first_patterns=dict(enumerate(name_patterns)))
+                for idx in range(len(name_patterns)):
+                    page_name = self.clean_page_name(scanner.first[idx])
+                    if page_name:
+                        break
 
             except urllib.error.HTTPError:
                 pass
@@ -1204,26 +1753,21 @@ class SteamToolboxCore:
                 progress_callback(0, 0, "正在获取页面信息...", f"正在访问 {page_type}/{identifier} ...")
 
             try:
-                req = urllib.request.Request(page_url, headers=headers_html)
-                with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                    html_content = resp.read().decode('utf-8')
-
-                clanid_match = re.search(r'curator_clanid[=:][\s"\']*(\d+)', html_content)
-                if clanid_match:
-                    curator_id = clanid_match.group(1)
-
                 name_patterns = [
                     r'class="curator_name"[^>]*>.*?<a[^>]*>(.*?)</a>',
                     r'<title>(?:Steam (?:Publisher|Developer):\s*)?([^<]+?)(?:\s*[-–—]\s*Steam)?</title>',
                 ]
-                for pattern in name_patterns:
-                    match = re.search(pattern, html_content, re.S | re.I)
-                    if match:
-                        extracted = re.sub(r'<[^>]+>', '', match.group(1)).strip()
-                        extracted = extracted.replace('&amp;', '&').replace('&quot;', '"')
-                        if extracted and len(extracted) < 100:
-                            page_name = extracted
-                            break
+                first_patterns = dict(enumerate(name_patterns))
+                first_patterns['clanid'] = r'curator_clanid[=:][\s"\']*(\d+)'
+                scanner = self.scan_html_page(page_url, headers_html, timeout=30, cache_ttl=cache_ttl, id_pattern=None,
+                                              first_patterns=first_patterns)
+                if scanner.first['clanid']:
+                    curator_id = scanner.first['clanid']
+
+                for idx in range(len(name_patterns)):
+                    page_name = self.clean_page_name(scanner.first[idx])
+                    if page_name:
+                        break
 
             except urllib.error.HTTPError as e:
                 return [], None, f"HTTP 错误 {e.code}：无法访问该{type_name_cn}页面。", has_login
@@ -1234,19 +1778,12 @@ class SteamToolboxCore:
             return [], None, f"无法从该{type_name_cn}页面提取 curator ID。", has_login
 
         base_url = f"https://store.steampowered.com/curator/{curator_id}/ajaxgetfilteredrecommendations/"
+        lang_configs = self.CURATOR_LANG_CONFIGS
+        count = self.CURATOR_PAGE_SIZE
 
-        lang_configs = [
-            ("schinese", "zh-CN,zh;q=0.9,en;q=0.8", "简体中文"),
-            ("english", "en-US,en;q=0.9", "English"),
-            ("japanese", "ja,en;q=0.8", "日本語"),
-            ("tchinese", "zh-TW,zh;q=0.9,en;q=0.8", "繁體中文"),
-            ("koreana", "ko,en;q=0.8", "한국어"),
-        ]
-
-        all_unique_ids = set()
-        max_total = 0
-
-        for lang_idx, (lang_code, accept_lang, lang_display) in enumerate(lang_configs):
+        def fetch_page(lang_idx, start):
+            """抓取某种语言下从 start 开始的一页推荐，返回 data（重试 CURATOR_PAGE_MAX_RETRIES 次仍失败时返回 None）"""
+            lang_code, accept_lang, _ = lang_configs[lang_idx]
             headers_api = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Accept': 'application/json, text/javascript, */*; q=0.01',
@@ -1255,80 +1792,158 @@ class SteamToolboxCore:
                 'Referer': page_url,
                 'Cookie': cookies,
             }
-
-            start = 0
-            count = 100
-            total_count = None
-            lang_page = 0
-
-            if progress_callback:
-                progress_callback(
-                    len(all_unique_ids), max_total,
-                    f"已获取 {len(all_unique_ids)} 个",
-                    f"🌐 扫描语言 [{lang_idx + 1}/{len(lang_configs)}]：{lang_display} — 正在连接..."
-                )
-
-            while True:
-                url = f"{base_url}?start={start}&count={count}&l={lang_code}"
-                lang_page += 1
-
+            url = f"{base_url}?start={start}&count={count}&l={lang_code}"
+            for attempt in range(self.CURATOR_PAGE_MAX_RETRIES + 1):
+                if attempt:
+                    self._cancellable_sleep(self._backoff_delay(attempt), None)
                 try:
-                    req = urllib.request.Request(url, headers=headers_api)
-                    with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                        data = json.loads(resp.read().decode('utf-8'))
+                    data = self.http.get(url, headers=headers_api, timeout=30, cache_ttl=cache_ttl).json()
+                except Exception:
+                    continue
+                if isinstance(data, dict) and data.get('success'):
+                    return data
+            return None
 
-                    if not data.get('success'):
-                        break
+        all_unique_ids = set()
+        max_total = 0
+        # 每种语言的扫描状态：total_pages 在第一页返回 total_count 后确定
+        lang_states = [{'total_count': None, 'total_pages': 1, 'done_pages': 0, 'failed_pages': 0, 'ids': set(),
+                        'deferred': False, 'skipped': False, 'reason': ""} for _ in lang_configs]
+        history = self.load_curator_lang_history().get(str(curator_id), {}) if smart_sweep else {}
 
-                    if total_count is None:
+        if progress_callback:
+            progress_callback(0, 0, "已获取 0 个",
+                              f"🌐 同时扫描 {len(lang_configs)} 种语言 — 正在连接...")
+
+        def submit_remaining(pool, pending, lang_idx):
+            state = lang_states[lang_idx]
+            for next_start in range(count, state['total_count'] or 0, count):
+                pending[pool.submit(fetch_page, lang_idx, next_start)] = (lang_idx, next_start)
+
+        def drain(pool, pending):
+            """处理已提交的分页，直到全部完成"""
+            nonlocal max_total, page_name
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lang_idx, start = pending.pop(future)
+                    lang_display = lang_configs[lang_idx][2]
+                    state = lang_states[lang_idx]
+                    state['done_pages'] += 1
+                    data = future.result()
+
+                    if data is None:
+                        state['failed_pages'] += 1
+                        if start == 0:
+                            # 第一页失败时不知道总页数，该语言无法继续扫描
+                            state['reason'] = "第一页获取失败，未能扫描"
+                        if progress_callback:
+                            progress_callback(
+                                len(all_unique_ids), max_total,
+                                f"已获取 {len(all_unique_ids)} 个",
+                                f"⚠️ [{lang_idx + 1}/{len(lang_configs)}] {lang_display} — 第 {start // count + 1} 页获取失败（已重试 {self.CURATOR_PAGE_MAX_RETRIES} 次）"
+                            )
+                        continue
+
+                    if start == 0:
                         total_count = int(data.get('total_count', 0))
-                        if total_count == 0:
-                            break
-                        if total_count > max_total:
-                            max_total = total_count
+                        state['total_count'] = total_count
+                        max_total = max(max_total, total_count)
+                        state['total_pages'] = max(1, (total_count + count - 1) // count)
+                        # 智能扫描：主语言立即翻页，其余语言先只取第一页，等主语言扫完再决定是否继续
+                        if smart_sweep and lang_idx != 0 and state['total_pages'] > 1:
+                            state['deferred'] = True
+                        else:
+                            submit_remaining(pool, pending, lang_idx)
 
                     html_chunk = data.get('results_html', '')
+                    chunk_ids = re.findall(r'data-ds-appid="(\d+)"', html_chunk) if html_chunk else []
                     new_in_page = 0
-                    if html_chunk:
-                        chunk_ids = re.findall(r'data-ds-appid="(\d+)"', html_chunk)
-                        for aid in chunk_ids:
-                            aid_int = int(aid)
-                            if aid_int not in all_unique_ids:
-                                new_in_page += 1
+                    for aid in chunk_ids:
+                        aid_int = int(aid)
+                        state['ids'].add(aid_int)
+                        if aid_int not in all_unique_ids:
+                            new_in_page += 1
                             all_unique_ids.add(aid_int)
 
-                        if page_name is None:
-                            name_match = re.search(r'class="curator_name"[^>]*>.*?<a[^>]*>(.*?)</a>', html_chunk, re.S)
-                            if name_match:
-                                page_name = re.sub(r'<[^>]+>', '', name_match.group(1)).strip()
+                    if page_name is None and html_chunk:
+                        name_match = re.search(r'class="curator_name"[^>]*>.*?<a[^>]*>(.*?)</a>', html_chunk, re.S)
+                        if name_match:
+                            page_name = re.sub(r'<[^>]+>', '', name_match.group(1)).strip()
 
                     if progress_callback:
-                        total_pages = (total_count + count - 1) // count if total_count else "?"
                         progress_callback(
                             len(all_unique_ids), max_total,
                             f"已获取 {len(all_unique_ids)} 个",
-                            f"🌐 [{lang_idx + 1}/{len(lang_configs)}] {lang_display} — 第 {lang_page}/{total_pages} 页（本页新增 {new_in_page}，共 {len(chunk_ids) if html_chunk else 0} 条）"
+                            f"🌐 [{lang_idx + 1}/{len(lang_configs)}] {lang_display} — 第 {start // count + 1}/{state['total_pages']} 页（本页新增 {new_in_page}，共 {len(chunk_ids)} 条）"
                         )
+                        if state['done_pages'] >= state['total_pages']:
+                            progress_callback(
+                                len(all_unique_ids), max_total if max_total else len(all_unique_ids),
+                                f"已获取 {len(all_unique_ids)} 个",
+                                f"✅ {lang_display} 扫描完成 — 当前共 {len(all_unique_ids)} 个唯一游戏"
+                            )
+
+        # 各语言的第一页并发请求；拿到 total_count 后，该语言剩余的分页一次性提交并发抓取。
+        # 同一主机的并发数由 self.http 的 HTTP_MAX_CONCURRENCY_PER_HOST 限制
+        with ThreadPoolExecutor(max_workers=self.HTTP_MAX_CONCURRENCY_PER_HOST) as pool:
+            pending = {pool.submit(fetch_page, lang_idx, 0): (lang_idx, 0) for lang_idx in range(len(lang_configs))}
+            drain(pool, pending)
+
+            # 智能扫描：主语言扫完后，逐个判断其余语言能否补充新游戏，不能的跳过剩余分页
+            for lang_idx, state in enumerate(lang_states):
+                if not state['deferred']:
+                    continue
+                lang_code, _, lang_display = lang_configs[lang_idx]
+                others = set().union(*(s['ids'] for i, s in enumerate(lang_states) if i != lang_idx))
+                lang_history = history.get(lang_code, {})
+                if lang_history.get('contributed', 0) > 0:
+                    state['reason'] = f"历史上 {lang_history['contributed']}/{lang_history['scans']} 次补充过新游戏"
+                elif state['total_count'] > len(others):
+                    state['reason'] = f"总数 {state['total_count']} 多于已收集的 {len(others)} 个"
+                elif state['ids'] - others:
+                    state['reason'] = f"第一页出现 {len(state['ids'] - others)} 个其他语言没有的游戏"
+                else:
+                    state['skipped'] = True
+                    state['reason'] = f"总数 {state['total_count']} 不超过已收集的 {len(others)} 个，第一页没有新游戏"
+                    if lang_history.get('scans'):
+                        state['reason'] += f"，历史上 {lang_history['scans']} 次扫描从未补充新游戏"
+                    if progress_callback:
+                        progress_callback(
+                            len(all_unique_ids), max_total,
+                            f"已获取 {len(all_unique_ids)} 个",
+                            f"⏭️ {lang_display} 跳过 — {state['reason']}"
+                        )
+                    continue
+                submit_remaining(pool, pending, lang_idx)
+            drain(pool, pending)
 
-                    start += count
-                    if start >= total_count or not html_chunk:
-                        break
-
-                    time.sleep(0.1)
-
-                except Exception:
-                    break
-
-            if progress_callback:
-                progress_callback(
-                    len(all_unique_ids), max_total if max_total else len(all_unique_ids),
-                    f"已获取 {len(all_unique_ids)} 个",
-                    f"✅ {lang_display} 扫描完成 — 当前共 {len(all_unique_ids)} 个唯一游戏"
-                )
-
-            time.sleep(0.2)
+        # 各语言的贡献：按语言顺序计算每种语言比之前的语言多出的游戏数
+        lang_yield = {}
+        seen = set()
+        for (lang_code, _, lang_display), state in zip(lang_configs, lang_states):
+            new_ids = len(state['ids'] - seen)
+            seen |= state['ids']
+            lang_yield[lang_code] = {
+                'name': lang_display,
+                'total_count': state['total_count'] or 0,
+                'pages': state['done_pages'],
+                'total_pages': state['total_pages'],
+                'new_ids': new_ids,
+                'failed_pages': state['failed_pages'],
+                'skipped': state['skipped'],
+                'reason': state['reason'],
+            }
+        if sweep_report is not None:
+            sweep_report.clear()
+            sweep_report.update(lang_yield)
+        if all_unique_ids:
+            self.update_curator_lang_history(curator_id, lang_yield)
 
+        failed_pages = sum(state['failed_pages'] for state in lang_states)
         if not all_unique_ids:
+            if failed_pages:
+                return [], None, f"获取{type_name_cn}推荐失败：{failed_pages} 个分页在重试后仍未成功，请稍后重试。", has_login
             return [], None, f"该{type_name_cn}没有任何游戏，或标识符无效。\n请检查 URL 是否正确。", has_login
 
         unique_ids = list(all_unique_ids)
@@ -1340,11 +1955,17 @@ class SteamToolboxCore:
 
         return unique_ids, display_name, None, has_login
 
-    def fetch_generic_list(self, page_type, identifier, type_name_cn, cookies, has_login, progress_callback=None):
-        """通过通用方式抓取发行商/开发商/系列等页面的游戏列表"""
+    def fetch_generic_list(self, page_type, identifier, type_name_cn, cookies, has_login, progress_callback=None,
+                           page_report=None):
+        """通过通用方式抓取发行商/开发商/系列等页面的游戏列表
+
+        Args:
+            page_report: 可选的 dict，抓取后写入 {'failed_pages': 获取失败的分页数}（不为 0 时结果不完整）
+        """
         from urllib.parse import unquote
 
         base_url = f"https://store.steampowered.com/{page_type}/{identifier}"
+        cache_ttl = self.get_http_cache_ttl()
 
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -1355,36 +1976,32 @@ class SteamToolboxCore:
 
         all_unique_ids = set()
         page_name = None
+        failed_pages = 0
 
         if progress_callback:
             progress_callback(0, 0, "正在获取页面...", f"正在连接 {page_type}/{identifier} ...")
 
         try:
-            req = urllib.request.Request(base_url, headers=headers)
-            with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as resp:
-                html_content = resp.read().decode('utf-8')
-
             name_patterns = [
                 r'<div class="curator_name"[^>]*>.*?<a[^>]*>(.*?)</a>',
                 r'<div class="page_title_area[^"]*"[^>]*>.*?<span[^>]*>(.*?)</span>',
                 r'<h2 class="pageheader">(.*?)</h2>',
                 r'<title>([^<]+?)(?:\s*[-–—]\s*Steam|\s*on Steam)?</title>',
             ]
-
-            for pattern in name_patterns:
-                match = re.search(pattern, html_content, re.S | re.I)
-                if match:
-                    extracted_name = match.group(1).strip()
-                    extracted_name = re.sub(r'<[^>]+>', '', extracted_name)
-                    extracted_name = extracted_name.replace('&amp;', '&').replace('&quot;', '"')
-                    if extracted_name and len(extracted_name) < 100:
-                        page_name = extracted_name
-                        break
+            # 边下载边提取 AppID、名称和分页链接中的最大页码，读到页脚即停止
+            scanner = self.scan_html_page(base_url, headers, timeout=30, cache_ttl=cache_ttl,
+                                          first_patterns=dict(enumerate(name_patterns)),
+                                          max_patterns={'page': self.GENERIC_LIST_PAGE_LINK_PATTERN})
+
+            for idx in range(len(name_patterns)):
+                page_name = self.clean_page_name(scanner.first[idx])
+                if page_name:
+                    break
 
             if not page_name:
                 page_name = unquote(identifier).replace('%20', ' ').replace('+', ' ')
 
-            ids = self.extract_ids_from_html(html_content)
+            ids = scanner.ids
             for aid in ids:
                 all_unique_ids.add(aid)
 
@@ -1392,44 +2009,49 @@ class SteamToolboxCore:
                 progress_callback(len(all_unique_ids), len(all_unique_ids), "已获取主页面",
                                   f"📄 主页面提取了 {len(ids)} 个游戏，正在检查分页...")
 
-            page = 2
-            while True:
-                ajax_url = f"{base_url}?page={page}"
-                try:
-                    if progress_callback:
-                        progress_callback(len(all_unique_ids), len(all_unique_ids), f"正在获取第 {page} 页",
-                                          f"📄 正在加载第 {page} 页...")
+            last_page = scanner.maxima['page']
+            if last_page and last_page >= 2:
+                failed_pages = self._fetch_generic_pages_parallel(base_url, headers, cache_ttl, last_page,
+                                                                  all_unique_ids, progress_callback)
+            else:
+                # 页面中没有分页链接：逐页尝试，直到某页没有新游戏为止
+                page = 2
+                while True:
+                    ajax_url = f"{base_url}?page={page}"
+                    try:
+                        if progress_callback:
+                            progress_callback(len(all_unique_ids), len(all_unique_ids), f"正在获取第 {page} 页",
+                                              f"📄 正在加载第 {page} 页...")
+
+                        page_ids = self.scan_html_page(ajax_url, headers, timeout=15, cache_ttl=cache_ttl).ids
+                        if not page_ids or all(aid in all_unique_ids for aid in page_ids):
+                            break
 
-                    req = urllib.request.Request(ajax_url, headers=headers)
-                    with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as resp:
-                        page_html = resp.read().decode('utf-8')
+                        new_count = sum(1 for aid in page_ids if aid not in all_unique_ids)
+                        for aid in page_ids:
+                            all_unique_ids.add(aid)
 
-                    page_ids = self.extract_ids_from_html(page_html)
-                    if not page_ids or all(aid in all_unique_ids for aid in page_ids):
-                        break
+                        if progress_callback:
+                            progress_callback(len(all_unique_ids), len(all_unique_ids), f"已获取第 {page} 页",
+                                              f"📄 第 {page} 页新增 {new_count} 个游戏，当前共 {len(all_unique_ids)} 个")
 
-                    new_count = sum(1 for aid in page_ids if aid not in all_unique_ids)
-                    for aid in page_ids:
-                        all_unique_ids.add(aid)
+                        page += 1
+                        time.sleep(0.3)
 
-                    if progress_callback:
-                        progress_callback(len(all_unique_ids), len(all_unique_ids), f"已获取第 {page} 页",
-                                          f"📄 第 {page} 页新增 {new_count} 个游戏，当前共 {len(all_unique_ids)} 个")
-
-                    page += 1
-                    time.sleep(0.3)
+                        if page > self.GENERIC_LIST_MAX_PAGES:
+                            break
 
-                    if page > 50:
+                    except Exception:
+                        failed_pages += 1
                         break
 
-                except Exception:
-                    break
-
         except urllib.error.HTTPError as e:
             return [], None, f"HTTP 错误 {e.code}：无法访问该页面。", has_login
         except Exception as e:
             return [], None, f"获取失败：{str(e)}", has_login
 
+        if page_report is not None:
+            page_report['failed_pages'] = failed_pages
         if not all_unique_ids:
             return [], None, f"该{type_name_cn}页面没有找到任何游戏。", has_login
 
@@ -1438,6 +2060,63 @@ class SteamToolboxCore:
 
         return unique_ids, display_name, None, has_login
 
+    def _fetch_generic_pages_parallel(self, base_url, headers, cache_ttl, last_page, all_unique_ids,
+                                      progress_callback=None):
+        """并发获取第 2 页起的分页，结果并入 all_unique_ids
+
+        页数由分页链接中的最大页码确定；分页链接只显示附近页码时，
+        后续页面中出现的更大页码会继续加入队列（总数不超过 GENERIC_LIST_MAX_PAGES）。
+        单页失败不影响其他页。同一主机的并发数由 HttpClient 限制，无需额外等待。
+
+        Returns:
+            获取失败的分页数
+        """
+        max_pages = self.GENERIC_LIST_MAX_PAGES
+        page_pattern = {'page': self.GENERIC_LIST_PAGE_LINK_PATTERN}
+
+        def fetch_page(page):
+            scanner = self.scan_html_page(f"{base_url}?page={page}", headers, timeout=15,
+                                          cache_ttl=cache_ttl, max_patterns=page_pattern)
+            return scanner.ids, scanner.maxima['page']
+
+        submitted = 1
+        done_pages = 0
+        failed_pages = 0
+        with ThreadPoolExecutor(max_workers=self.HTTP_MAX_CONCURRENCY_PER_HOST) as pool:
+            pending = {}
+
+            def submit_up_to(page_limit):
+                nonlocal submitted
+                while submitted < min(page_limit, max_pages):
+                    submitted += 1
+                    pending[pool.submit(fetch_page, submitted)] = submitted
+
+            submit_up_to(last_page)
+            if progress_callback:
+                progress_callback(len(all_unique_ids), len(all_unique_ids), f"正在获取分页（共 {submitted} 页）",
+                                  f"📄 正在并发加载第 2-{submitted} 页...")
+
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    page = pending.pop(future)
+                    done_pages += 1
+                    try:
+                        page_ids, page_max = future.result()
+                    except Exception:
+                        failed_pages += 1
+                        continue
+                    new_count = sum(1 for aid in page_ids if aid not in all_unique_ids)
+                    all_unique_ids.update(page_ids)
+                    if page_max:
+                        submit_up_to(page_max)
+
+                    if progress_callback:
+                        progress_callback(len(all_unique_ids), len(all_unique_ids),
+                                          f"已获取 {done_pages + 1}/{submitted} 页",
+                                          f"📄 第 {page} 页新增 {new_count} 个游戏，当前共 {len(all_unique_ids)} 个")
+        return failed_pages
+
     @staticmethod
     def extract_ids_from_steamdb_html(html_text):
         """从 SteamDB 页面源代码中提取 AppID"""
@@ -1453,24 +2132,27 @@ class SteamToolboxCore:
             (added_count, removed_count, total_count, is_updated)
             如果没有新增任何游戏，is_updated 为 False，此时不会做任何修改
         """
-        val_obj = json.loads(target_entry[1]['value'])
+        store = CollectionStore.of(data)
+        record = store.record_for(target_entry)
+        val_obj = record.value
         old_ids = val_obj.get("added", [])
 
-        old_set = set(old_ids)
-        src_set = set(new_ids_from_src)
+        # 在升序数组上二分查找，不为大收藏夹临时构造整数集合
+        old_sorted = record.sorted_added()
+        src_sorted = sorted_id_array(new_ids_from_src)
 
-        added_list = [aid for aid in new_ids_from_src if aid not in old_set]
-        removed_list = [aid for aid in old_ids if aid not in src_set]
+        added_list = [aid for aid in new_ids_from_src if not contains_sorted(old_sorted, aid)]
+        removed_list = [aid for aid in old_ids if not contains_sorted(src_sorted, aid)]
 
         # 如果没有新增任何游戏，不做任何操作
         if not added_list:
             return 0, len(removed_list), len(old_ids), False
 
         # 有新增，执行更新
-        val_obj['added'] = old_ids + added_list
+        val_obj['added'] = concat_ids(old_ids, added_list)
         clean_name = raw_name.replace(self.induce_suffix, "").strip()
         val_obj['name'] = f"{clean_name}{self.induce_suffix}"
-        target_entry[1]['value'] = json.dumps(val_obj, ensure_ascii=False, separators=(',', ':'))
+        store.mark_dirty(record)
         target_entry[1]['timestamp'] = int(time.time())
         target_entry[1]['version'] = self.next_version(data)
         target_entry[1].setdefault('conflictResolutionMethod', 'custom')
@@ -1489,13 +2171,15 @@ class SteamToolboxCore:
         Returns:
             (old_count, new_count)
         """
-        val_obj = json.loads(target_entry[1]['value'])
+        store = CollectionStore.of(data)
+        record = store.record_for(target_entry)
+        val_obj = record.value
         old_count = len(val_obj.get("added", []))
 
-        val_obj['added'] = new_ids
+        val_obj['added'] = to_id_array(new_ids)
         clean_name = val_obj.get('name', '').replace(self.induce_suffix, "").strip()
         val_obj['name'] = f"{clean_name}{self.induce_suffix}"
-        target_entry[1]['value'] = json.dumps(val_obj, ensure_ascii=False, separators=(',', ':'))
+        store.mark_dirty(record)
         target_entry[1]['timestamp'] = int(time.time())
         target_entry[1]['version'] = self.next_version(data)
         target_entry[1].setdefault('conflictResolutionMethod', 'custom')
@@ -1532,8 +2216,8 @@ class SteamToolboxCore:
             entry = {
                 "name": col.get("name", "未命名"),
                 "is_dynamic": col.get("is_dynamic", False),
-                "added": col.get("added", []),
-                "removed": col.get("removed", []),
+                "added": list(col.get("added", [])),
+                "removed": list(col.get("removed", [])),
             }
             if col.get("is_dynamic") and col.get("filterSpec"):
                 entry["filterSpec"] = col["filterSpec"]
@@ -1554,8 +2238,8 @@ class SteamToolboxCore:
         """格式二：导入结构化 JSON 文件，还原多个收藏夹（含动态逻辑）"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
-        except JSONDecodeError as e:
+                import_data = json_codec.load(f)
+        except json_codec.JSONDecodeError:
             return None, "文件不是有效的 JSON 格式。"
 
         if import_data.get("format") != "steam_collections_structured":
@@ -1575,7 +2259,6 @@ class SteamToolboxCore:
             if is_dynamic and "filterSpec" in col:
                 # 还原动态收藏夹
                 col_id = f"uc-{secrets.token_hex(4)}"
-                storage_key = f"user-collections.{col_id}"
                 val_obj = {
                     "id": col_id,
                     "name": name + self.induce_suffix,
@@ -1583,15 +2266,7 @@ class SteamToolboxCore:
                     "removed": removed,
                     "filterSpec": col["filterSpec"]
                 }
-                new_entry = [storage_key, {
-                    "key": storage_key,
-                    "timestamp": int(time.time()),
-                    "value": json.dumps(val_obj, ensure_ascii=False, separators=(',', ':')),
-                    "version": self.next_version(data),
-                    "conflictResolutionMethod": "custom",
-                    "strMethodId": "union-collections"
-                }]
-                data.append(new_entry)
+                self._append_collection(data, val_obj)
             else:
                 # 静态收藏夹
                 self.add_static_collection(data, name.replace(self.induce_suffix, "").strip(), added)
@@ -1601,21 +2276,28 @@ class SteamToolboxCore:
 
     def add_dynamic_collection(self, data, name, friend_code):
         col_id = f"uc-{secrets.token_hex(4)}"
-        storage_key = f"user-collections.{col_id}"
         filter_groups = [{"rgOptions": [], "bAcceptUnion": False} for _ in range(9)]
         filter_groups[0]["bAcceptUnion"] = True
         filter_groups[6]["rgOptions"] = [int(friend_code)]
         val_obj = {"id": col_id, "name": name + self.induce_suffix, "added": [], "removed": [],
                    "filterSpec": {"nFormatVersion": 2, "strSearchText": "", "filterGroups": filter_groups,
                                   "setSuggestions": {}}}
-        new_entry = [storage_key, {"key": storage_key, "timestamp": int(time.time()),
-                                   "value": json.dumps(val_obj, ensure_ascii=False, separators=(',', ':')),
-                                   "version": self.next_version(data),
-                                   "conflictResolutionMethod": "custom", "strMethodId": "union-collections"}]
-        data.append(new_entry)
+        self._append_collection(data, val_obj)
+
+    def fetch_steam250_ids(self, url, progress_callback=None, use_cache=True):
+        """从 Steam250 页面提取 AppID 列表
+
+        Args:
+            use_cache: 是否使用来源结果缓存；为 False 时重新获取并覆盖缓存。
+                       不足 STEAM250_LIST_SIZE 个的结果可能来自不完整的页面，不写入缓存
+        """
+        # 提取规则参与键计算，规则变化后旧结果不再命中
+        cache_key = self.source_cache.make_key("steam250", url, self.STEAM250_ID_PATTERN)
+        if use_cache:
+            cached = self.get_cached_source_result("steam250", cache_key, progress_callback, url)
+            if cached:
+                return cached[0], None
 
-    def fetch_steam250_ids(self, url, progress_callback=None):
-        """从 Steam250 页面提取 AppID 列表"""
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -1626,25 +2308,22 @@ class SteamToolboxCore:
             progress_callback(0, 0, "正在连接 Steam250...", "")
 
         try:
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=20, context=self.ssl_context) as resp:
-                html_content = resp.read().decode('utf-8')
-
             if progress_callback:
-                progress_callback(0, 0, "正在解析页面...", "")
-
-            raw_ids = re.findall(r'store\.steampowered\.com/app/(\d+)', html_content)
+                progress_callback(0, 0, "正在下载并解析页面...", "")
 
-            unique_ids = []
-            for aid in raw_ids:
-                if aid not in unique_ids:
-                    unique_ids.append(aid)
+            # 边下载边按出现顺序提取商店链接中的 AppID（集合去重），凑满 250 个即停止下载
+            # （Steam250 页面没有 Steam 商店的列表/页脚标记）
+            scanner = self.scan_html_page(url, headers, timeout=20, cache_ttl=self.get_http_cache_ttl(),
+                                          id_pattern=self.STEAM250_ID_PATTERN,
+                                          start_markers=(), stop_marker=None, limit=self.STEAM250_LIST_SIZE)
 
-            app_ids = [int(aid) for aid in unique_ids[:250]]
+            app_ids = scanner.ids
 
             if not app_ids:
                 return [], "未能从页面提取到任何 AppID。页面结构可能已变化。"
 
+            if len(app_ids) >= self.STEAM250_LIST_SIZE:
+                self.source_cache.put(cache_key, "steam250", app_ids, label=url)
             return app_ids, None
 
         except urllib.error.HTTPError as e:
@@ -1654,4 +2333,165 @@ class SteamToolboxCore:
         except Exception as e:
             return [], f"提取失败：{str(e)}"
 
+    def fetch_steam250_ids_bulk(self, urls, result_callback=None, use_cache=True):
+        """一次获取多个 Steam250 页面（如全部年份榜单）：并发下载、流式解析
+
+        Args:
+            urls: Steam250 页面 URL 列表
+            result_callback: 每个页面完成时调用 result_callback(url, ids, error)（在工作线程中调用）
+            use_cache: 是否使用来源结果缓存
+
+        Returns:
+            dict: {url: (ids, error)}，按 urls 的顺序排列
+        """
+        urls = list(dict.fromkeys(urls))
+        results = {}
+
+        def fetch_one(url):
+            ids, error = self.fetch_steam250_ids(url, use_cache=use_cache)
+            results[url] = (ids, error)
+            if result_callback:
+                result_callback(url, ids, error)
+
+        with ThreadPoolExecutor(max_workers=self.HTTP_MAX_CONCURRENCY_PER_HOST) as pool:
+            for future in as_completed([pool.submit(fetch_one, url) for url in urls]):
+                future.result()
+        return {url: results[url] for url in urls}
+
+    # ==================== 多来源并发获取 ====================
 
+    SOURCE_MAX_CONCURRENCY = 8  # 同时获取的来源数上限（同一主机的请求数另由 HttpClient 限制）
+    STEAM250_LIST_SIZE = 250    # Steam250 每个榜单的游戏数
+    # Steam250 页面中的商店链接；AppID 须取完整的数字串（跨块截断由 HtmlScanner 把触及块末尾的匹配留到下一块处理）
+    STEAM250_ID_PATTERN = r'store\.steampowered\.com/app/(\d+)(?!\d)'
+
+    def fetch_recommendation_source(self, src_type, url_or_id, name, progress_callback=None,
+                                    login_cookies=None, igdb_force_refresh=False, use_cache=True):
+        """获取单个推荐来源的游戏列表
+
+        Args:
+            src_type: 'steam250' | 'curator' | 'igdb_category' | 'igdb_company'
+            url_or_id: steam250/curator 为 URL，igdb_category 为 (dimension, item_id)，igdb_company 为公司 ID
+            name: 来源显示名称
+            progress_callback: 进度回调 (current, total, phase, detail)
+            login_cookies: 鉴赏家来源使用的登录 Cookie
+            igdb_force_refresh: IGDB 分类来源是否强制重新下载
+            use_cache: 是否使用来源结果缓存（鉴赏家、Steam250、IGDB 公司来源）
+
+        Returns:
+            (ids, error, note): note 为附加在状态信息后的说明（登录状态、是否来自缓存等）
+        """
+        if src_type == "steam250":
+            ids, error = self.fetch_steam250_ids(url_or_id, progress_callback, use_cache)
+            return ids, error, ""
+
+        if src_type == "curator":
+            page_type, identifier = self.extract_steam_list_info(url_or_id)
+            if not page_type or not identifier:
+                return [], "无法解析 URL", ""
+            sweep_report = {}
+            ids, _, error, has_login = self.fetch_steam_list(page_type, identifier, progress_callback, login_cookies,
+                                                             sweep_report=sweep_report, use_cache=use_cache)
+            note = " 🔐" if has_login else " ⚠️"
+            failed_pages = self.count_failed_pages(sweep_report)
+            if failed_pages and not error:
+                note += f"（{failed_pages} 页获取失败，结果可能不完整）"
+            return ids, error, note
+
+        if src_type == "igdb_category":
+            dimension, item_id = url_or_id
+            # 移除维度前缀 emoji 用于显示
+            display_name = name
+            for dim_info in self.IGDB_DIMENSIONS.values():
+                display_name = display_name.replace(dim_info["label"] + " ", "")
+            ids, error = self.fetch_igdb_games_by_dimension(dimension, item_id, display_name, progress_callback,
+                                                            force_refresh=igdb_force_refresh)
+            if error:
+                return ids, error, ""
+            cached_ids, cached_at = self.get_igdb_dimension_cache(dimension, item_id)
+            if not igdb_force_refresh and cached_ids is not None and self.is_igdb_cache_valid(cached_at):
+                return ids, None, "（本地缓存）"
+            return ids, None, "（已缓存）"
+
+        if src_type == "igdb_company":
+            ids, error = self.fetch_igdb_games_by_company(url_or_id, name.replace("🏢 ", ""), progress_callback,
+                                                          use_cache)
+            return ids, error, ""
+
+        return [], f"未知的来源类型：{src_type}", ""
+
+    def fetch_recommendation_sources(self, sources, result_callback=None, progress_callback=None,
+                                     login_cookies=None, igdb_force_refresh=False, use_cache=True):
+        """并发获取多个推荐来源
+
+        各来源互相独立，最多 SOURCE_MAX_CONCURRENCY 个同时获取；同一主机的并发请求数由 self.http 限制，
+        IGDB 请求另受令牌桶限速。IGDB 分类来源共用本地缓存（首次可能需要先下载），
+        因此放在同一个线程中依次获取，只有第一个会触发下载。Steam250 页面统一交给
+        fetch_steam250_ids_bulk 一次获取。
+
+        Args:
+            sources: [(key, src_type, url_or_id, name), ...]
+            result_callback: 每个来源完成时调用 result_callback(key, name, ids, error, note)，
+                             在工作线程中调用，done/total 由调用方自行统计
+            progress_callback: 来源内部进度 progress_callback(key, name, phase, detail)
+            login_cookies: 鉴赏家来源使用的登录 Cookie
+            igdb_force_refresh: 是否强制重新下载 IGDB 数据（只对第一个 IGDB 分类来源生效）
+            use_cache: 是否使用来源结果缓存，为 False 时全部重新获取
+
+        Returns:
+            dict: {key: {'ids': [...], 'name': name}}，只包含获取成功的来源，按 sources 的顺序排列
+        """
+        outcomes = {}
+        outcomes_lock = threading.Lock()
+
+        def record(key, name, ids, error, note):
+            with outcomes_lock:
+                outcomes[key] = (ids, error)
+            if result_callback:
+                result_callback(key, name, ids, error, note)
+
+        def run_source(key, src_type, url_or_id, name, force_refresh=False):
+            def source_progress(current, total, phase, detail):
+                if progress_callback:
+                    progress_callback(key, name, phase, detail)
+
+            try:
+                ids, error, note = self.fetch_recommendation_source(src_type, url_or_id, name, source_progress,
+                                                                    login_cookies, force_refresh, use_cache)
+            except Exception as e:
+                ids, error, note = [], f"获取失败：{str(e)}", ""
+            record(key, name, ids, error, note)
+
+        def run_igdb_lane(lane):
+            for idx, source in enumerate(lane):
+                run_source(*source, force_refresh=igdb_force_refresh and idx == 0)
+
+        def run_steam250_batch(batch):
+            sources_by_url = {}
+            for key, _, url, name in batch:
+                sources_by_url.setdefault(url, []).append((key, name))
+
+            def on_page(url, ids, error):
+                for key, name in sources_by_url[url]:
+                    record(key, name, ids, error, "")
+
+            self.fetch_steam250_ids_bulk(list(sources_by_url), on_page, use_cache)
+
+        igdb_lane = [source for source in sources if source[1] == "igdb_category"]
+        steam250_batch = [source for source in sources if source[1] == "steam250"]
+        with ThreadPoolExecutor(max_workers=self.SOURCE_MAX_CONCURRENCY) as pool:
+            futures = [pool.submit(run_source, *source) for source in sources
+                       if source[1] not in ("igdb_category", "steam250")]
+            if igdb_lane:
+                futures.append(pool.submit(run_igdb_lane, igdb_lane))
+            if steam250_batch:
+                futures.append(pool.submit(run_steam250_batch, steam250_batch))
+            for future in as_completed(futures):
+                future.result()
+
+        results = {}
+        for key, _, _, name in sources:
+            ids, error = outcomes.get(key, ([], "未获取"))
+            if not error:
+                results[key] = {'ids': ids, 'name': name}
+        return results
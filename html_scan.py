@@ -0,0 +1,142 @@
+import re
+
+
+class HtmlStreamScanner:
+    """分块扫描 HTML，增量提取 AppID 和页面信息（不缓冲整页）
+
+    用法：逐块调用 feed(text)，每次返回本块新发现的 AppID；done 为 True（遇到结束标记或达到数量上限）
+    后调用方即可停止读取；最后调用 close() 处理剩余内容。
+
+    规则与 SteamToolboxCore.extract_ids_from_html 一致：页面中出现列表起始标记时，
+    只统计起始标记之后的 AppID（之前的推荐位等不算）；遇到结束标记（默认页脚 id="footer"）停止。
+
+    块之间保留最后 OVERLAP 个字符，跨块的标签/标记在下一块中仍能完整匹配；触及块末尾的 AppID 匹配
+    （数字可能被截断）留到下一块再判断。first_patterns 尚未全部匹配时保留最后 FIRST_PATTERN_WINDOW 个字符，
+    长度不超过该值的匹配不会因跨块而漏掉。
+    """
+
+    OVERLAP = 4096
+    FIRST_PATTERN_WINDOW = 65536
+
+    DEFAULT_ID_PATTERN = r'data-ds-appid="([\d,]+)"'
+    DEFAULT_START_MARKERS = ('id="RecommendationsRows"', 'class="creator_grid_ctn"')
+    DEFAULT_STOP_MARKER = 'id="footer"'
+
+    def __init__(self, id_pattern=DEFAULT_ID_PATTERN, start_markers=DEFAULT_START_MARKERS,
+                 stop_marker=DEFAULT_STOP_MARKER, first_patterns=None, max_patterns=None, limit=None):
+        """
+        Args:
+            id_pattern: 提取 AppID 的正则（第 1 组为以逗号分隔的 AppID），None 表示不提取
+            start_markers: 列表起始标记，按顺序优先
+            stop_marker: 结束标记，None 表示读到结尾
+            first_patterns: {字段: 正则}，记录每个正则的第一个匹配（第 1 组），结果见 first[字段]
+            max_patterns: {字段: 正则}，记录每个正则所有匹配中第 1 组（整数）的最大值，结果见 maxima[字段]
+            limit: 收集到这么多个不重复的 AppID 后停止
+        """
+        self._id_re = re.compile(id_pattern) if id_pattern else None
+        self._start_markers = tuple(start_markers or ())
+        self._stop_marker = stop_marker
+        self._first_patterns = {field: re.compile(p, re.S | re.I) for field, p in (first_patterns or {}).items()}
+        self.first = {field: None for field in self._first_patterns}
+        self._max_patterns = {field: re.compile(p) for field, p in (max_patterns or {}).items()}
+        self.maxima = {field: None for field in self._max_patterns}
+        self.limit = limit
+
+        self._carry = ""
+        self._id_offset = 0   # carry 中已提取过 AppID 的部分（下一块从这里继续提取）
+        self._ids = {}        # 列表区域内的 AppID（dict 保序去重）
+        self._pre_ids = {}    # 尚未遇到起始标记时收集的 AppID
+        self.in_list = not self._start_markers
+        self.done = False
+
+    @property
+    def ids(self):
+        """按出现顺序去重后的 AppID（int）"""
+        return list(self._ids if self.in_list else self._pre_ids)
+
+    def feed(self, text):
+        """扫描一块文本，返回本块新发现的 AppID 列表
+
+        尚未遇到起始标记时返回的 AppID 可能在之后遇到起始标记时被丢弃，最终结果以 ids 为准。
+        """
+        if self.done:
+            return []
+        return self._scan(self._carry + text, final=False)
+
+    def close(self):
+        """扫描剩余内容，返回本块新发现的 AppID 列表"""
+        if self.done:
+            return []
+        new_ids = self._scan(self._carry, final=True)
+        self.done = True
+        return new_ids
+
+    def _scan(self, buf, final):
+        id_start = self._id_offset
+        if not self.in_list:
+            start = min((pos for pos in (buf.find(m) for m in self._start_markers) if pos != -1), default=-1)
+            if start != -1:
+                self._match_first(buf, start)
+                self._match_max(buf, start)
+                buf = buf[start:]
+                id_start = 0
+                self.in_list = True
+                self._pre_ids = {}
+
+        end = len(buf)
+        if self._stop_marker:
+            stop = buf.find(self._stop_marker)
+            if stop != -1:
+                end = stop
+                final = True
+
+        self._match_first(buf, end)
+        self._match_max(buf, end)
+
+        new_ids = []
+        target = self._ids if self.in_list else self._pre_ids
+        last_end = id_start
+        resume = None  # 触及块末尾的匹配的起点，下一块从这里重新匹配
+        if self._id_re:
+            for m in self._id_re.finditer(buf, id_start, end):
+                if not final and m.end() == len(buf):
+                    resume = m.start()
+                    break
+                last_end = m.end()
+                for aid in m.group(1).split(','):
+                    if aid.isdigit():
+                        aid_int = int(aid)
+                        if aid_int not in target:
+                            target[aid_int] = None
+                            new_ids.append(aid_int)
+                            if self.limit is not None and len(target) >= self.limit:
+                                self.done = True
+                                self._carry = ""
+                                return new_ids
+
+        if final:
+            self.done = True
+            self._carry = ""
+        else:
+            id_resume = resume if resume is not None else max(last_end, len(buf) - self.OVERLAP)
+            carry_start = id_resume
+            if any(value is None for value in self.first.values()):
+                carry_start = min(carry_start, max(0, len(buf) - self.FIRST_PATTERN_WINDOW))
+            self._carry = buf[carry_start:]
+            self._id_offset = id_resume - carry_start
+        return new_ids
+
+    def _match_first(self, buf, end):
+        for field, pattern in self._first_patterns.items():
+            if self.first[field] is None:
+                m = pattern.search(buf, 0, end)
+                if m:
+                    self.first[field] = m.group(1)
+
+    def _match_max(self, buf, end):
+        # 块之间的重叠部分会被重复匹配，取最大值不受影响
+        for field, pattern in self._max_patterns.items():
+            for m in pattern.finditer(buf, 0, end):
+                value = int(m.group(1))
+                if self.maxima[field] is None or value > self.maxima[field]:
+                    self.maxima[field] = value
@@ -0,0 +1,548 @@
+import codecs
+import gzip
+import hashlib
+import http.client
+import io
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from contextlib import nullcontext
+
+import json_codec
+from throttle import HostLimiter
+
+
+class HttpResponse:
+    """已完整读取（并解压）的 HTTP 响应"""
+
+    __slots__ = ("url", "status", "headers", "body")
+
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def read(self):
+        return self.body
+
+    def text(self, encoding="utf-8"):
+        return self.body.decode(encoding)
+
+    def json(self):
+        return json_codec.loads(self.body)
+
+
+def is_cacheable_response(resp):
+    """默认的缓存判定：JSON 对象响应中 success 为假（false/0）时不缓存，其余响应均可缓存
+
+    Steam 的接口出错时仍返回 200 和 {"success": false}（或 0），缓存下来会在有效期内反复返回同一个错误。
+    """
+    body = resp.body.lstrip()
+    if not body.startswith(b"{") or b'"success"' not in body:
+        return True
+    try:
+        data = json_codec.loads(body)
+    except ValueError:
+        return True
+    return not isinstance(data, dict) or "success" not in data or bool(data["success"])
+
+
+class HttpResponseCache:
+    """磁盘 HTTP 响应缓存（SQLite，线程安全）
+
+    只缓存 GET 的 200 响应体（zlib 压缩）及其 ETag/Last-Modified。
+    HttpClient.stream() 的调用方主动停止读取时只缓存已读取的前缀（partial=1），这类条目只供 stream() 使用；
+    读取出错中断的响应不缓存。
+    缓存键包含 URL 以及 Cookie/Accept-Language 请求头（登录态和语言不同，页面内容也不同），
+    Cookie 只以哈希形式参与计算，不落盘。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key           TEXT PRIMARY KEY,
+            url           TEXT NOT NULL,
+            etag          TEXT,
+            last_modified TEXT,
+            stored_at     REAL NOT NULL,
+            body          BLOB NOT NULL,
+            partial       INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_responses_stored ON responses (stored_at);
+    """
+
+    VARY_HEADERS = ("cookie", "accept-language")
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        if "partial" not in columns:
+            self._conn.execute("ALTER TABLE responses ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+
+    def make_key(self, url, headers):
+        """由 URL 和影响页面内容的请求头计算缓存键"""
+        lowered = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = [url] + [f"{name}:{lowered.get(name, '')}" for name in self.VARY_HEADERS]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key, allow_partial=False, compressed=False):
+        """返回 (body, etag, last_modified, stored_at, partial)，不存在时返回 None
+
+        Args:
+            allow_partial: 是否接受只有前缀的条目
+            compressed: 为 True 时 body 保持 zlib 压缩形式（供分块解压）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at, partial FROM responses WHERE key = ?",
+                (key,)).fetchone()
+        if not row or (row[4] and not allow_partial):
+            return None
+        return (row[0] if compressed else zlib.decompress(row[0])), row[1], row[2], row[3], bool(row[4])
+
+    def put(self, key, url, body, etag=None, last_modified=None, partial=False, compressed=False):
+        """
+        Args:
+            partial: body 是否只是响应的前缀
+            compressed: body 是否已经是 zlib 压缩数据
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, etag, last_modified, stored_at, body, partial) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, time.time(), body if compressed else zlib.compress(body),
+                 int(partial)))
+
+    def touch(self, key):
+        """服务器返回 304 后刷新存储时间，重新计算 TTL"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def purge(self, max_age):
+        """删除存储时间超过 max_age 秒的条目，返回删除数量"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - max_age,))
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class HttpClient:
+    """基于 http.client 的长连接 HTTP 客户端（线程安全）
+
+    按 (scheme, host, port) 维护空闲连接池，同一主机的后续请求复用已建立的 TCP/TLS 连接，
+    省去每次请求的握手往返，并可按主机限制同时进行中的请求数。
+    自动发送 Accept-Encoding: gzip, deflate 并解压响应体，自动跟随重定向，遵循系统/环境变量代理设置。
+
+    错误行为与 urllib.request.urlopen 保持一致：HTTP 状态码 >= 400 抛出 urllib.error.HTTPError，
+    连接失败/超时抛出 urllib.error.URLError，调用方原有的 except 分支无需修改。
+    """
+
+    MAX_IDLE_PER_HOST = 8   # 每个主机最多保留的空闲连接数
+    IDLE_TIMEOUT = 30       # 空闲连接超过此秒数后丢弃（服务器通常会先关闭）
+    MAX_REDIRECTS = 5
+
+    # 复用的空闲连接可能已被服务器关闭，遇到这些错误时换新连接重试一次
+    _STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                     BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+    def __init__(self, ssl_context=None, max_per_host=None, host_limits=None, cache=None):
+        """
+        Args:
+            ssl_context: HTTPS 连接使用的 ssl.SSLContext
+            max_per_host: 每个主机同时进行中的请求上限，None 表示不限制
+            host_limits: {host: limit}，为个别主机单独指定上限
+            cache: HttpResponseCache，get(..., cache_ttl=...) 使用
+        """
+        self.ssl_context = ssl_context
+        self.cache = cache
+        self.host_limiter = HostLimiter(max_per_host, host_limits) if max_per_host else None
+        self._idle = {}  # {(scheme, host, port): [(conn, last_used), ...]}
+        self._lock = threading.Lock()
+        self._proxies = urllib.request.getproxies()
+
+    # ==================== 对外接口 ====================
+
+    def request(self, url, data=None, headers=None, method=None, timeout=30):
+        """发送请求并读取完整响应
+
+        Args:
+            url: 完整 URL
+            data: 请求体（bytes），为 None 时不发送
+            headers: 请求头 dict
+            method: 请求方法，默认有 data 时为 POST，否则为 GET
+            timeout: 超时秒数
+
+        Returns:
+            HttpResponse
+        """
+        method = method or ("POST" if data is not None else "GET")
+        headers = dict(headers or {})
+        if not any(k.lower() == "accept-encoding" for k in headers):
+            headers["Accept-Encoding"] = "gzip, deflate"
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            status, reason, resp_headers, body = self._send(url, method, data, headers, timeout)
+            location = resp_headers.get("Location")
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                if status == 303 or (status in (301, 302) and method == "POST"):
+                    method, data = "GET", None
+                continue
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, reason, resp_headers, io.BytesIO(body))
+            return HttpResponse(url, status, resp_headers, body)
+        raise urllib.error.HTTPError(url, status, "重定向次数过多", resp_headers, io.BytesIO(body))
+
+    def get(self, url, headers=None, timeout=30, cache_ttl=None, validate=None):
+        """GET 请求
+
+        Args:
+            cache_ttl: 不为 None 时使用磁盘缓存：缓存未超过 cache_ttl 秒直接返回本地内容；
+                       超过后带 If-None-Match/If-Modified-Since 重新验证，304 时沿用本地内容
+            validate: 判断 200 响应能否写入缓存的函数（接收 HttpResponse，返回 bool）；
+                      默认 is_cacheable_response，即 JSON 响应 success 为假时不缓存。
+                      已缓存的内容不满足 validate 时视为未缓存，重新请求
+        """
+        if cache_ttl is None or self.cache is None:
+            return self.request(url, headers=headers, method="GET", timeout=timeout)
+        validate = validate or is_cacheable_response
+
+        key = self.cache.make_key(url, headers)
+        entry = self.cache.get(key)
+        if entry is not None and not validate(HttpResponse(url, 200, {"X-Cache": "hit"}, entry[0])):
+            entry = None
+        if entry is not None:
+            body, etag, last_modified, stored_at, _ = entry
+            if time.time() - stored_at < cache_ttl:
+                return HttpResponse(url, 200, {"X-Cache": "hit"}, body)
+            headers = dict(headers or {})
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        resp = self.request(url, headers=headers, method="GET", timeout=timeout)
+        if resp.status == 304 and entry is not None:
+            self.cache.touch(key)
+            return HttpResponse(resp.url, 200, resp.headers, entry[0])
+        if resp.status == 200 and validate(resp):
+            self.cache.put(key, url, resp.body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp
+
+    def stream(self, url, headers=None, timeout=30, cache_ttl=None, chunk_size=65536):
+        """GET 请求，边下载边按块产出解码后的文本（生成器），不在内存中保留整个响应体
+
+        调用方读到所需内容后可以直接停止迭代（或 close()），剩余部分不再下载（该连接关闭，不放回连接池）。
+        cache_ttl 含义同 get()；调用方主动停止时缓存已读取的前缀：之后的 stream() 调用先产出这段前缀，
+        需要更多内容时再从网络获取（跳过已产出的部分）。前缀条目不用于 If-None-Match/If-Modified-Since 验证。
+        读取出错时不写入缓存。错误行为同 request()：HTTPError / URLError 在第一次迭代时抛出。
+        """
+        headers = dict(headers or {})
+        if not any(k.lower() == "accept-encoding" for k in headers):
+            headers["Accept-Encoding"] = "gzip, deflate"
+
+        cache_key = entry = None
+        skip = 0  # 已从前缀缓存产出的字节数，网络响应中跳过这部分
+        if cache_ttl is not None and self.cache is not None:
+            cache_key = self.cache.make_key(url, headers)
+            entry = self.cache.get(cache_key, allow_partial=True, compressed=True)
+            if entry is not None:
+                body, etag, last_modified, stored_at, partial = entry
+                if partial:
+                    # 只有前缀：未过期时先产出，调用方读完前缀仍未停止时再请求网络；前缀不能用于条件请求
+                    entry = None
+                    if time.time() - stored_at < cache_ttl:
+                        skip = yield from self._iter_compressed(body, chunk_size, final=False)
+                elif time.time() - stored_at < cache_ttl:
+                    yield from self._iter_compressed(body, chunk_size)
+                    return
+                else:
+                    if etag:
+                        headers["If-None-Match"] = etag
+                    if last_modified:
+                        headers["If-Modified-Since"] = last_modified
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            key, proxy, target, send_headers = self._prepare(url, headers)
+            with self._host_slot(key[1]):
+                conn, resp = self._open_on_pool(key, proxy, "GET", target, None, send_headers, timeout)
+                if resp.status != 200:
+                    try:
+                        body = resp.read()
+                    except (socket.timeout, OSError, http.client.HTTPException) as e:
+                        conn.close()
+                        raise urllib.error.URLError(e)
+                    self._finish(key, conn, resp)
+                else:
+                    yield from self._iter_response(key, conn, resp, url, cache_key, chunk_size, skip)
+                    return
+
+            location = resp.headers.get("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if resp.status == 304 and entry is not None:
+                self.cache.touch(cache_key)
+                yield from self._iter_compressed(entry[0], chunk_size)
+                return
+            body = self._decode(body, resp.getheader("Content-Encoding", ""))[skip:]
+            if resp.status >= 400:
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+            if body:
+                yield body.decode("utf-8", "replace")
+            return
+        raise urllib.error.HTTPError(url, resp.status, "重定向次数过多", resp.headers, io.BytesIO(b""))
+
+    def _iter_response(self, key, conn, resp, url, cache_key, chunk_size, skip=0):
+        """分块读取 200 响应：解压 → 解码 → 产出文本，同时把已读取的内容压缩写入缓存
+
+        只在读完整个响应，或调用方主动停止迭代（GeneratorExit）时写入缓存（后者记为前缀）；
+        读取出错时不缓存，以免把被截断的内容当作完整页面返回。
+
+        Args:
+            skip: 跳过解压后的前 skip 个字节不产出（已由前缀缓存产出），缓存仍包含完整内容
+        """
+        decompress = self._stream_decoder(resp.getheader("Content-Encoding", ""))
+        text_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        compressor = zlib.compressobj() if cache_key else None
+        cached_parts = []
+        complete = stopped = False
+        try:
+            while True:
+                try:
+                    raw = resp.read(chunk_size)
+                except (socket.timeout, OSError, http.client.HTTPException) as e:
+                    raise urllib.error.URLError(e)
+                data = decompress(raw) if raw else decompress(None)
+                if compressor and data:
+                    cached_parts.append(compressor.compress(data))
+                if skip:
+                    data, skip = data[skip:], max(0, skip - len(data))
+                text = text_decoder.decode(data, final=not raw)
+                if text:
+                    yield text
+                if not raw:
+                    complete = True
+                    return
+        except GeneratorExit:
+            stopped = True
+            raise
+        finally:
+            if complete:
+                self._finish(key, conn, resp)
+            else:
+                conn.close()
+            if compressor and (complete or (stopped and cached_parts)):
+                cached_parts.append(compressor.flush())
+                self.cache.put(cache_key, url, b"".join(cached_parts), resp.headers.get("ETag"),
+                               resp.headers.get("Last-Modified"), partial=not complete, compressed=True)
+
+    @staticmethod
+    def _iter_compressed(blob, chunk_size, final=True):
+        """把缓存中的 zlib 数据分块解压、解码后产出
+
+        Args:
+            final: 为 False 时（blob 只是响应的前缀）末尾不完整的 UTF-8 字符留待后续内容，不产出
+
+        Returns:
+            已产出的解压后字节数（生成器返回值）
+        """
+        decompressor = zlib.decompressobj()
+        text_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        consumed = 0
+        for pos in range(0, len(blob), chunk_size):
+            data = decompressor.decompress(blob[pos:pos + chunk_size])
+            consumed += len(data)
+            text = text_decoder.decode(data)
+            if text:
+                yield text
+        data = decompressor.flush()
+        consumed += len(data)
+        text = text_decoder.decode(data, final=final)
+        if text:
+            yield text
+        return consumed - len(text_decoder.getstate()[0])
+
+    @staticmethod
+    def _stream_decoder(encoding):
+        """按 Content-Encoding 返回分块解压函数 decompress(raw)，raw 为 None 表示结束"""
+        encoding = encoding.strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            decompressor = None
+        else:
+            return lambda raw: raw or b""
+
+        state = {"obj": decompressor}
+
+        def decompress(raw):
+            obj = state["obj"]
+            if raw is None:
+                return obj.flush() if obj else b""
+            if obj is None:
+                # deflate：先按 zlib 格式解，失败则按不带头的原始 deflate 流解
+                try:
+                    obj = zlib.decompressobj()
+                    data = obj.decompress(raw)
+                except zlib.error:
+                    obj = zlib.decompressobj(-zlib.MAX_WBITS)
+                    data = obj.decompress(raw)
+                state["obj"] = obj
+                return data
+            return obj.decompress(raw)
+
+        return decompress
+
+    def post(self, url, data=None, headers=None, timeout=30):
+        return self.request(url, data=data, headers=headers, method="POST", timeout=timeout)
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for conns in pools.values():
+            for conn, _ in conns:
+                conn.close()
+
+    # ==================== 连接池 ====================
+
+    def _prepare(self, url, headers):
+        """解析 URL，返回 (连接池键, 代理, 请求目标, 请求头)"""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"不支持的协议：{scheme}")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+
+        proxy = self._proxy_for(scheme, host)
+        if proxy and scheme == "http":
+            # 普通 HTTP 代理：请求行使用完整 URL
+            target = url
+        else:
+            target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+        send_headers = dict(headers)
+        send_headers.setdefault("Host", parts.netloc)
+        return key, proxy, target, send_headers
+
+    def _host_slot(self, host):
+        return self.host_limiter.slot(host) if self.host_limiter is not None else nullcontext()
+
+    def _send(self, url, method, data, headers, timeout):
+        key, proxy, target, send_headers = self._prepare(url, headers)
+        with self._host_slot(key[1]):
+            conn, resp = self._open_on_pool(key, proxy, method, target, data, send_headers, timeout)
+            try:
+                body = resp.read()
+            except (socket.timeout, OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            self._finish(key, conn, resp)
+        body = self._decode(body, resp.getheader("Content-Encoding", ""))
+        return resp.status, resp.reason, resp.headers, body
+
+    def _open_on_pool(self, key, proxy, method, target, data, send_headers, timeout):
+        """发出请求并读取响应头，返回 (conn, resp)，响应体由调用方读取"""
+        while True:
+            conn, reused = self._acquire(key, proxy, timeout)
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, target, body=data, headers=send_headers)
+                return conn, conn.getresponse()
+            except self._STALE_ERRORS as e:
+                conn.close()
+                if reused:
+                    continue
+                raise urllib.error.URLError(e)
+            except (socket.timeout, OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+
+    def _finish(self, key, conn, resp):
+        """响应体读完后归还连接"""
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+    def _acquire(self, key, proxy, timeout):
+        """取一个空闲连接，没有则新建。返回 (conn, 是否为复用连接)"""
+        now = time.monotonic()
+        with self._lock:
+            conns = self._idle.get(key, [])
+            while conns:
+                conn, last_used = conns.pop()
+                if now - last_used < self.IDLE_TIMEOUT:
+                    return conn, True
+                conn.close()
+
+        scheme, host, port = key
+        if proxy:
+            proxy_parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            proxy_host = proxy_parts.hostname
+            proxy_port = proxy_parts.port or 80
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout,
+                                                   context=self.ssl_context)
+                conn.set_tunnel(host, port)
+            else:
+                conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def _release(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.MAX_IDLE_PER_HOST:
+                conns.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _proxy_for(self, scheme, host):
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        return proxy
+
+    @staticmethod
+    def _decode(body, encoding):
+        """按 Content-Encoding 解压响应体"""
+        encoding = encoding.strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # 部分服务器发送不带 zlib 头的原始 deflate 流
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
@@ -0,0 +1,584 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import json_codec
+
+
+class IGDBCacheStore:
+    """IGDB 本地缓存（SQLite 索引存储）
+
+    取代旧版单文件 igdb_cache.json：按维度/条目/倒排表/game_to_steam 分表存储，
+    单个条目的查询只走索引，不再需要解析整份全量数据。
+
+    表结构：
+        meta          — _meta 信息（key → JSON 值）
+        dimensions    — 维度名称 → 维度编号
+        items         — (维度, 条目 ID) → 缓存时间、游戏数
+        postings      — (维度, 条目 ID) → Steam AppID 倒排表
+        game_to_steam — IGDB game ID → Steam AppID
+        dump_*        — 全量下载的断点数据（下载完成后清空）
+
+    读取结果会在进程内缓存（见 _memoized），数据库文件的 mtime/大小变化或本进程写入后自动失效；
+    同一路径的实例通过 shared() 在进程内共享，可供多个工作线程同时读取。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS dimensions (
+            dim_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name   TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS items (
+            dim_id     INTEGER NOT NULL,
+            item_id    INTEGER NOT NULL,
+            cached_at  REAL NOT NULL DEFAULT 0,
+            game_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dim_id, item_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS postings (
+            dim_id   INTEGER NOT NULL,
+            item_id  INTEGER NOT NULL,
+            steam_id INTEGER NOT NULL,
+            PRIMARY KEY (dim_id, item_id, steam_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_postings_steam ON postings (steam_id);
+        CREATE TABLE IF NOT EXISTS game_to_steam (
+            game_id  INTEGER PRIMARY KEY,
+            steam_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_game_to_steam_steam ON game_to_steam (steam_id);
+        CREATE TABLE IF NOT EXISTS dump_state (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS dump_game_to_steam (
+            game_id  INTEGER PRIMARY KEY,
+            steam_id INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS dump_games_done (
+            game_id INTEGER PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS dump_game_items (
+            game_id INTEGER NOT NULL,
+            dim_id  INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            PRIMARY KEY (game_id, dim_id, item_id)
+        ) WITHOUT ROWID;
+    """
+
+    _instances = {}  # 进程内共享实例 {db_path: IGDBCacheStore}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path, legacy_json_path=None):
+        """获取进程内共享的实例（同一数据库路径只打开一次）"""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(db_path, legacy_json_path=legacy_json_path)
+                cls._instances[key] = store
+            return store
+
+    def __init__(self, db_path, legacy_json_path=None):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+            legacy_json_path: 旧版 igdb_cache.json 路径（存在时首次打开自动迁移）
+        """
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._dim_ids = {}
+        # 读取结果缓存：文件签名变化时整体失效
+        self._memo = {}
+        self._memo_sig = None
+        self._generation = 0
+        self.migrate_legacy_json()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ==================== 内部工具 ====================
+
+    def _dim_id(self, dimension, create=False):
+        """维度名称 → 维度编号（不存在且 create=False 时返回 None）"""
+        dim_id = self._dim_ids.get(dimension)
+        if dim_id is not None:
+            return dim_id
+        row = self._conn.execute("SELECT dim_id FROM dimensions WHERE name = ?", (dimension,)).fetchone()
+        if row:
+            dim_id = row[0]
+        elif create:
+            dim_id = self._conn.execute("INSERT INTO dimensions (name) VALUES (?)", (dimension,)).lastrowid
+        else:
+            return None
+        self._dim_ids[dimension] = dim_id
+        return dim_id
+
+    def _file_signature(self):
+        """数据库文件（含 WAL 日志）的 mtime/大小 + 本进程写入计数"""
+        sig = [self._generation]
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                st = os.stat(path)
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+    def _memoized(self, key, loader):
+        """读取缓存：文件未变化时直接返回内存中的结果，否则重新加载"""
+        sig = self._file_signature()
+        with self._lock:
+            if sig != self._memo_sig:
+                self._memo.clear()
+                self._memo_sig = sig
+            if key in self._memo:
+                return self._memo[key]
+            value = loader()
+            self._memo[key] = value
+            return value
+
+    @contextmanager
+    def _writing(self):
+        """写事务：提交（或回滚）后使读取缓存失效"""
+        with self._lock:
+            try:
+                with self._conn:
+                    yield
+            finally:
+                self._generation += 1
+
+    def _write_item(self, dim_id, item_id, steam_ids, cached_at):
+        """写入单个条目（覆盖旧的倒排表），调用方负责事务"""
+        steam_ids = sorted(set(int(sid) for sid in steam_ids))
+        self._conn.execute("DELETE FROM postings WHERE dim_id = ? AND item_id = ?", (dim_id, item_id))
+        self._conn.executemany("INSERT INTO postings (dim_id, item_id, steam_id) VALUES (?, ?, ?)",
+                               ((dim_id, item_id, sid) for sid in steam_ids))
+        self._conn.execute("INSERT OR REPLACE INTO items (dim_id, item_id, cached_at, game_count) "
+                           "VALUES (?, ?, ?, ?)", (dim_id, item_id, cached_at, len(steam_ids)))
+
+    # ==================== 旧版 JSON 迁移 ====================
+
+    def migrate_legacy_json(self):
+        """数据库为空且存在旧版 igdb_cache.json 时，将其导入数据库
+
+        迁移成功后旧文件会被重命名为 igdb_cache.json.migrated，避免重复迁移。
+        """
+        path = self.legacy_json_path
+        if not path or not os.path.exists(path) or not self.is_empty():
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cache = json_codec.load(f)
+        except Exception:
+            return False
+        if not isinstance(cache, dict):
+            return False
+
+        # 兼容更旧的格式（无维度分区，genre_id 直接在顶层）
+        known_dims = [k for k, v in cache.items() if not k.startswith("_") and isinstance(v, dict)
+                      and not ("steam_ids" in v)]
+        if not known_dims:
+            old_entries = {k: v for k, v in cache.items()
+                           if k != "_meta" and isinstance(v, dict) and "steam_ids" in v}
+            if old_entries:
+                cache = {"genres": old_entries, "_meta": cache.get("_meta", {})}
+
+        self.import_dict(cache)
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError:
+            pass
+        return True
+
+    # ==================== 读取 ====================
+
+    def is_empty(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT EXISTS(SELECT 1 FROM items) OR EXISTS(SELECT 1 FROM game_to_steam) "
+                "OR EXISTS(SELECT 1 FROM meta)").fetchone()
+            return not row[0]
+
+    def get_meta(self):
+        """读取 _meta 信息（dict）"""
+        return dict(self._memoized(("meta",), self._load_meta))
+
+    def _load_meta(self):
+        rows = self._conn.execute("SELECT key, value FROM meta").fetchall()
+        meta = {}
+        for key, value in rows:
+            try:
+                meta[key] = json_codec.loads(value)
+            except (TypeError, ValueError):
+                continue
+        return meta
+
+    def get_item(self, dimension, item_id):
+        """读取某个维度下某个条目的缓存
+
+        Returns:
+            (steam_ids, cached_at) 或 (None, None)
+        """
+        try:
+            item_id = int(item_id)
+        except (ValueError, TypeError):
+            return None, None
+        steam_ids, cached_at = self._memoized(("item", dimension, item_id),
+                                              lambda: self._load_item(dimension, item_id))
+        if steam_ids is None:
+            return None, None
+        return list(steam_ids), cached_at
+
+    def _load_item(self, dimension, item_id):
+        dim_id = self._dim_id(dimension)
+        if dim_id is None:
+            return None, None
+        row = self._conn.execute("SELECT cached_at FROM items WHERE dim_id = ? AND item_id = ?",
+                                 (dim_id, item_id)).fetchone()
+        if not row:
+            return None, None
+        steam_ids = tuple(r[0] for r in self._conn.execute(
+            "SELECT steam_id FROM postings WHERE dim_id = ? AND item_id = ? ORDER BY steam_id",
+            (dim_id, item_id)))
+        return steam_ids, row[0]
+
+    def get_dimension_counts(self, dimension):
+        """读取某个维度下各条目的 Steam 游戏数
+
+        Returns:
+            dict: {item_id(int): count(int)}
+        """
+        return dict(self._memoized(("counts", dimension), lambda: self._load_dimension_counts(dimension)))
+
+    def _load_dimension_counts(self, dimension):
+        dim_id = self._dim_id(dimension)
+        if dim_id is None:
+            return {}
+        return dict(self._conn.execute(
+            "SELECT item_id, game_count FROM items WHERE dim_id = ?", (dim_id,)).fetchall())
+
+    def get_item_ids(self, dimension):
+        """读取某个维度下所有已缓存的条目 ID（字符串形式）"""
+        return [str(item_id) for item_id in sorted(self._memoized(
+            ("counts", dimension), lambda: self._load_dimension_counts(dimension)))]
+
+    def get_dimension_stats(self):
+        """按维度汇总条目数、游戏数和缓存时间
+
+        Returns:
+            dict: {dimension: {'count': int, 'games': int, 'oldest_at': float, 'newest_at': float}}
+        """
+        stats = self._memoized(("stats",), self._load_dimension_stats)
+        return {name: dict(stat) for name, stat in stats.items()}
+
+    def _load_dimension_stats(self):
+        rows = self._conn.execute(
+            "SELECT d.name, COUNT(*), SUM(i.game_count), "
+            "MIN(NULLIF(i.cached_at, 0)), MAX(NULLIF(i.cached_at, 0)) "
+            "FROM items i JOIN dimensions d ON d.dim_id = i.dim_id GROUP BY d.name").fetchall()
+        return {name: {'count': count, 'games': games or 0, 'oldest_at': oldest or 0, 'newest_at': newest or 0}
+                for name, count, games, oldest, newest in rows}
+
+    def lookup_steam_ids(self, game_ids):
+        """批量查询 IGDB game ID 对应的 Steam AppID
+
+        Returns:
+            dict: {game_id(int): steam_id(int)}，未映射的 game 不出现在结果中
+        """
+        game_to_steam = self._memoized(("game_to_steam",), self._load_game_to_steam)
+        result = {}
+        for gid in game_ids:
+            try:
+                steam_id = game_to_steam.get(int(gid))
+            except (ValueError, TypeError):
+                continue
+            if steam_id:
+                result[int(gid)] = steam_id
+        return result
+
+    def get_game_to_steam(self):
+        """读取完整的 game_to_steam 映射 {game_id(int): steam_id(int)}"""
+        return dict(self._memoized(("game_to_steam",), self._load_game_to_steam))
+
+    def _load_game_to_steam(self):
+        return dict(self._conn.execute("SELECT game_id, steam_id FROM game_to_steam").fetchall())
+
+    # ==================== 写入 ====================
+
+    def set_item(self, dimension, item_id, steam_ids, cached_at=None):
+        """写入某个维度下某个条目的缓存（只改动该条目）"""
+        with self._writing():
+            dim_id = self._dim_id(dimension, create=True)
+            self._write_item(dim_id, int(item_id), steam_ids,
+                             time.time() if cached_at is None else cached_at)
+
+    def set_meta(self, meta):
+        """合并写入 _meta 信息"""
+        with self._writing():
+            self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                   ((k, json_codec.dumps(v)) for k, v in meta.items()))
+
+    def replace_all(self, dim_maps, game_to_steam, meta, cached_at=None):
+        """用一次全量下载的结果整体替换缓存（单个事务）
+
+        Args:
+            dim_maps: {dimension: {item_id: iterable of steam_ids}}
+            game_to_steam: {game_id: steam_id}
+            meta: _meta 信息
+            cached_at: 所有条目的缓存时间（默认为当前时间）
+        """
+        with self._writing():
+            self._replace_all(dim_maps, game_to_steam, meta, time.time() if cached_at is None else cached_at)
+
+    def _replace_all(self, dim_maps, game_to_steam, meta, now):
+        """replace_all 的实现，调用方负责加锁和事务"""
+        self._conn.execute("DELETE FROM postings")
+        self._conn.execute("DELETE FROM items")
+        self._conn.execute("DELETE FROM game_to_steam")
+        self._conn.execute("DELETE FROM meta")
+        for dimension, items in dim_maps.items():
+            dim_id = self._dim_id(dimension, create=True)
+            for item_id, steam_ids in items.items():
+                self._write_item(dim_id, int(item_id), steam_ids, now)
+        self._conn.executemany("INSERT INTO game_to_steam (game_id, steam_id) VALUES (?, ?)",
+                               ((int(g), int(s)) for g, s in game_to_steam.items()))
+        self._conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                               ((k, json_codec.dumps(v)) for k, v in meta.items()))
+
+    def get_games_for_steam_ids(self, steam_ids):
+        """反查映射到指定 Steam AppID 的所有 IGDB game ID
+
+        Returns:
+            dict: {steam_id: [game_id, ...]}
+        """
+        result = {}
+        with self._lock:
+            for sid in steam_ids:
+                gids = [r[0] for r in self._conn.execute(
+                    "SELECT game_id FROM game_to_steam WHERE steam_id = ?", (int(sid),))]
+                if gids:
+                    result[int(sid)] = gids
+        return result
+
+    def apply_incremental_update(self, game_to_steam_delta, steam_items, meta, cached_at=None):
+        """增量刷新：原地修补倒排表（单个事务）
+
+        Args:
+            game_to_steam_delta: 新增或变化的 {game_id: steam_id}
+            steam_items: {steam_id: {dimension: iterable of item_ids}}，
+                         对其中每个 Steam AppID，用新的分类集合整体替换其在各维度下的倒排记录；
+                         game_to_steam_delta 中改关联的游戏，其原 AppID 也须在此给出（没有游戏时为空集合）
+            meta: 合并写入的 _meta 信息
+            cached_at: 刷新时间（所有条目的 cached_at 都更新为该时间；为 None 时只修补，不更新时间）
+        """
+        now = time.time() if cached_at is None else cached_at
+        with self._writing():
+            self._conn.executemany("INSERT OR REPLACE INTO game_to_steam (game_id, steam_id) VALUES (?, ?)",
+                                   ((int(g), int(s)) for g, s in game_to_steam_delta.items()))
+
+            touched = set()
+            for sid, dims in steam_items.items():
+                sid = int(sid)
+                touched.update(self._conn.execute(
+                    "SELECT dim_id, item_id FROM postings WHERE steam_id = ?", (sid,)).fetchall())
+                self._conn.execute("DELETE FROM postings WHERE steam_id = ?", (sid,))
+                for dimension, item_ids in dims.items():
+                    dim_id = self._dim_id(dimension, create=True)
+                    for item_id in set(item_ids):
+                        self._conn.execute("INSERT OR IGNORE INTO postings (dim_id, item_id, steam_id) "
+                                           "VALUES (?, ?, ?)", (dim_id, int(item_id), sid))
+                        touched.add((dim_id, int(item_id)))
+
+            # 重新统计受影响条目的游戏数；新条目补建，清空的条目删除
+            self._conn.executemany("INSERT OR IGNORE INTO items (dim_id, item_id, cached_at, game_count) "
+                                   "VALUES (?, ?, ?, 0)", ((d, i, now) for d, i in touched))
+            self._conn.executemany(
+                "UPDATE items SET game_count = (SELECT COUNT(*) FROM postings p "
+                "WHERE p.dim_id = items.dim_id AND p.item_id = items.item_id) "
+                "WHERE dim_id = ? AND item_id = ?", touched)
+            self._conn.executemany("DELETE FROM items WHERE dim_id = ? AND item_id = ? AND game_count = 0", touched)
+            if cached_at is not None:
+                self._conn.execute("UPDATE items SET cached_at = ?", (cached_at,))
+            self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                   ((k, json_codec.dumps(v)) for k, v in meta.items()))
+
+    def count_game_to_steam(self):
+        """game_to_steam 映射条数（与全量下载时的 total_steam_games 口径一致）"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM game_to_steam").fetchone()[0]
+
+    def clear(self):
+        """清空所有缓存数据（含未完成的下载断点）"""
+        with self._writing():
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM items")
+            self._conn.execute("DELETE FROM game_to_steam")
+            self._conn.execute("DELETE FROM meta")
+            self._clear_dump_checkpoint()
+
+    # ==================== 全量下载断点 ====================
+
+    def get_dump_checkpoint(self):
+        """读取未完成的全量下载断点
+
+        Returns:
+            dict: {'started_at': float, 'max_ext_id': int, 'segments': [[low, high, cursor, done], ...]}
+                  无断点时返回 None
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM dump_state").fetchall()
+        state = {}
+        for key, value in rows:
+            try:
+                state[key] = json_codec.loads(value)
+            except (TypeError, ValueError):
+                return None
+        if not state.get("segments"):
+            return None
+        return state
+
+    def start_dump_checkpoint(self, max_ext_id, segments):
+        """开始新的全量下载：清空旧断点并记录扫描区间
+
+        Args:
+            max_ext_id: external_games 最大 ID（用于估算进度）
+            segments: [(low, high), ...]，high 为 None 表示不设上界
+        """
+        state = {
+            "started_at": time.time(),
+            "max_ext_id": max_ext_id,
+            "segments": [[low, high, low, False] for low, high in segments],
+        }
+        with self._lock, self._conn:
+            self._clear_dump_checkpoint()
+            self._conn.executemany("INSERT INTO dump_state (key, value) VALUES (?, ?)",
+                                   ((k, json_codec.dumps(v)) for k, v in state.items()))
+        return state
+
+    def save_dump_segment(self, segments, game_to_steam_page):
+        """记录第1步某一页的结果：新增的 game→steam 映射 + 各区间的扫描位置（同一事务）
+
+        Args:
+            segments: 当前全部区间状态 [[low, high, cursor, done], ...]
+            game_to_steam_page: {game_id: steam_id}
+        """
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO dump_game_to_steam (game_id, steam_id) VALUES (?, ?)",
+                                   game_to_steam_page.items())
+            self._conn.execute("INSERT OR REPLACE INTO dump_state (key, value) VALUES ('segments', ?)",
+                               (json_codec.dumps(segments),))
+
+    def get_dump_game_to_steam(self):
+        """读取断点中已获取的 game→steam 映射"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT game_id, steam_id FROM dump_game_to_steam").fetchall())
+
+    def save_dump_game_batch(self, game_ids, item_rows):
+        """记录第2步一个已完成批次的分类结果
+
+        Args:
+            game_ids: 本批次的全部 game ID（无论是否有分类，都标记为已完成）
+            item_rows: [(game_id, dimension, item_id), ...]
+        """
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO dump_games_done (game_id) VALUES (?)",
+                                   ((int(gid),) for gid in game_ids))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO dump_game_items (game_id, dim_id, item_id) VALUES (?, ?, ?)",
+                ((int(gid), self._dim_id(dim, create=True), int(item_id)) for gid, dim, item_id in item_rows))
+
+    def get_dump_done_games(self):
+        """读取断点中已完成分类查询的 game ID 集合"""
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT game_id FROM dump_games_done")}
+
+    def get_dump_dim_maps(self):
+        """由断点数据汇总出各维度的倒排表 {dimension: {item_id: set of steam_ids}}"""
+        dim_maps = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.name, gi.item_id, g.steam_id FROM dump_game_items gi "
+                "JOIN dump_game_to_steam g ON g.game_id = gi.game_id "
+                "JOIN dimensions d ON d.dim_id = gi.dim_id").fetchall()
+        for dimension, item_id, steam_id in rows:
+            dim_maps.setdefault(dimension, {}).setdefault(item_id, set()).add(steam_id)
+        return dim_maps
+
+    def clear_dump_checkpoint(self):
+        """清除全量下载断点"""
+        with self._lock, self._conn:
+            self._clear_dump_checkpoint()
+
+    def _clear_dump_checkpoint(self):
+        self._conn.execute("DELETE FROM dump_state")
+        self._conn.execute("DELETE FROM dump_game_to_steam")
+        self._conn.execute("DELETE FROM dump_games_done")
+        self._conn.execute("DELETE FROM dump_game_items")
+
+    # ==================== 与旧版 dict 格式互转 ====================
+
+    def import_dict(self, cache):
+        """从旧版 dict 格式（igdb_cache.json 的内容）整体导入"""
+        dim_maps = {}
+        timestamps = {}
+        for dimension, dim_data in cache.items():
+            if dimension.startswith("_") or not isinstance(dim_data, dict):
+                continue
+            for item_key, entry in dim_data.items():
+                if not isinstance(entry, dict) or "steam_ids" not in entry:
+                    continue
+                try:
+                    item_id = int(item_key)
+                except (ValueError, TypeError):
+                    continue
+                dim_maps.setdefault(dimension, {})[item_id] = entry.get("steam_ids", [])
+                timestamps[(dimension, item_id)] = entry.get("cached_at", 0)
+
+        game_to_steam = {}
+        for gid, sid in (cache.get("_game_to_steam") or {}).items():
+            try:
+                game_to_steam[int(gid)] = int(sid)
+            except (ValueError, TypeError):
+                continue
+
+        with self._writing():
+            self._replace_all(dim_maps, game_to_steam, cache.get("_meta") or {}, time.time())
+            self._conn.executemany(
+                "UPDATE items SET cached_at = ? WHERE dim_id = ? AND item_id = ?",
+                ((ts, self._dim_id(dim), item_id) for (dim, item_id), ts in timestamps.items()))
+
+    def export_dict(self):
+        """导出为旧版 dict 格式（仅用于兼容旧调用，会读取全部数据）"""
+        cache = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.name, i.item_id, i.cached_at FROM items i "
+                "JOIN dimensions d ON d.dim_id = i.dim_id").fetchall()
+            for dimension, item_id, cached_at in rows:
+                cache.setdefault(dimension, {})[str(item_id)] = {"steam_ids": [], "cached_at": cached_at}
+            postings = self._conn.execute(
+                "SELECT d.name, p.item_id, p.steam_id FROM postings p "
+                "JOIN dimensions d ON d.dim_id = p.dim_id ORDER BY p.steam_id").fetchall()
+            for dimension, item_id, steam_id in postings:
+                cache[dimension][str(item_id)]["steam_ids"].append(steam_id)
+        game_to_steam = self.get_game_to_steam()
+        if game_to_steam:
+            cache["_game_to_steam"] = {str(k): v for k, v in game_to_steam.items()}
+        meta = self.get_meta()
+        if meta:
+            cache["_meta"] = meta
+        return cache
@@ -0,0 +1,94 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# 可选后端按优先顺序排列；"json" 为标准库，始终可用
+BACKENDS = ("orjson", "ujson", "json")
+
+JSONDecodeError = json.JSONDecodeError
+
+_backend = "json"
+
+
+def available_backends():
+    """当前环境中可用的后端名称（按优先顺序）"""
+    return [name for name in BACKENDS if name == "json" or globals()[name] is not None]
+
+
+def set_backend(name="auto"):
+    """选择 JSON 编解码后端
+
+    Args:
+        name: "auto"（优先 orjson，其次 ujson，最后标准库）、"orjson"、"ujson" 或 "json"；
+              指定的后端未安装时退回 "auto" 的选择
+
+    Returns:
+        实际使用的后端名称
+    """
+    global _backend
+    available = available_backends()
+    _backend = name if name in available else available[0]
+    return _backend
+
+
+def get_backend():
+    return _backend
+
+
+def loads(s):
+    """解析 JSON（str 或 bytes）；解析失败统一抛出 json.JSONDecodeError"""
+    if _backend == "orjson":
+        return orjson.loads(s)  # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+    if _backend == "ujson":
+        try:
+            return ujson.loads(s)
+        except ValueError as e:
+            doc = s if isinstance(s, str) else s.decode("utf-8", "replace")
+            raise JSONDecodeError(str(e), doc, 0) from e
+    return json.loads(s)
+
+
+def dumps(obj, indent=None, default=None):
+    """编码为 JSON 字符串（不转义非 ASCII 字符）
+
+    Args:
+        indent: None 为紧凑格式（无空格，与 Steam 客户端一致），否则按该缩进美化输出
+        default: 无法直接编码的对象的转换函数，同 json.dumps 的 default
+
+    后端不支持的情况（orjson 不支持的缩进宽度、超出 64 位的整数等）自动改用标准库。
+    """
+    if _backend == "orjson" and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    elif _backend == "ujson" and default is None:
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, indent=indent or 0)
+        except (TypeError, OverflowError):
+            pass
+    separators = (',', ':') if indent is None else (',', ': ')
+    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators, default=default)
+
+
+def load(f):
+    """从已打开的文件（文本或二进制模式）解析 JSON"""
+    return loads(f.read())
+
+
+def dump(obj, f, indent=None, default=None):
+    """编码后写入以文本模式打开的文件"""
+    f.write(dumps(obj, indent=indent, default=default))
+
+
+set_backend()
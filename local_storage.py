@@ -1,25 +1,222 @@
-import json
 import os
 import re
-import shutil
 from datetime import datetime
 
+import backup_codec
+import json_codec
+from backup_catalog import BackupCatalog
+from backup_store import CompressedFileStore, ContentAddressedStore, DeltaChainStore, copy_stream
+from cloud_storage import CloudStorageData, CollectionStore, merge_difference, sorted_id_array
+
+# 备份文件名：原文件名_时间戳[_序号].后缀，如 cloud-storage-namespace-1_20240101_120000.snap
+# （增量链为 .delta，压缩副本为 .json.gz 等，旧版为 .json）
+BACKUP_NAME_PATTERN = re.compile(r'_(\d{8}_\d{6})(?:_(\d+))?\.(?:json(?:\.(?:gz|xz|zst))?|snap|delta)$')
+
+
+def summarize_collections(data):
+    """收藏夹摘要：[[收藏夹 ID, 名称, 游戏数, 是否动态], ...]，记录在备份目录中"""
+    summary = []
+    for rec in CollectionStore.of(data).records():
+        val_obj = rec.value
+        summary.append([val_obj.get("id", rec.key), val_obj.get("name", "未命名"), len(rec.sorted_added()),
+                        rec.is_dynamic])
+    return summary
+
+
+class RetentionPolicy:
+    """备份保留策略
+
+    各条规则取并集：被任一规则选中的备份都保留，其余的清理。
+      - keep_last: 保留最新的 N 个备份
+      - hourly / daily / weekly / monthly: 祖父-父-子（GFS）轮换，在最近的 N 个小时/天/周/月中，
+        每个时间段保留其中最新的一个备份
+      - max_total_size: 保留的备份占用空间合计上限（字节），从新到旧累计，超出后更旧的备份也清理；
+        每个备份计入的大小由 select() 的 measure 决定（CAS 快照共享对象，需按去重后的实际占用计算）
+    最新的备份始终保留。没有任何数量规则时只按 max_total_size 清理。
+    """
+
+    GFS_PERIODS = {
+        'hourly': lambda t: (t.year, t.month, t.day, t.hour),
+        'daily': lambda t: (t.year, t.month, t.day),
+        'weekly': lambda t: t.isocalendar()[:2],
+        'monthly': lambda t: (t.year, t.month),
+    }
+
+    def __init__(self, keep_last=0, hourly=0, daily=0, weekly=0, monthly=0, max_total_size=None):
+        self.keep_last = keep_last
+        self.counts = {'hourly': hourly, 'daily': daily, 'weekly': weekly, 'monthly': monthly}
+        self.max_total_size = max_total_size
+
+    @classmethod
+    def from_config(cls, options):
+        """由 config.json 的 backup_retention 创建策略，未配置或全部为 0 时返回 None（不自动清理）
 
-class BackupManager:
-    """备份管理器：管理 JSON 文件的备份"""
+        Args:
+            options: {"keep_last": 20, "hourly": 24, "daily": 7, "weekly": 4, "monthly": 12, "max_total_mb": 500}，
+                     各项均可省略
+        """
+        if not options:
+            return None
+        max_total_mb = options.get('max_total_mb')
+        policy = cls(keep_last=int(options.get('keep_last') or 0),
+                     hourly=int(options.get('hourly') or 0),
+                     daily=int(options.get('daily') or 0),
+                     weekly=int(options.get('weekly') or 0),
+                     monthly=int(options.get('monthly') or 0),
+                     max_total_size=int(max_total_mb * 1024 * 1024) if max_total_mb else None)
+        return policy if policy.is_active() else None
+
+    def _has_count_rules(self):
+        return self.keep_last > 0 or any(n > 0 for n in self.counts.values())
+
+    def is_active(self):
+        return self._has_count_rules() or self.max_total_size is not None
 
-    def __init__(self, json_path):
+    def select(self, backups, measure=None):
+        """划分保留和清理的备份
+
+        Args:
+            backups: list_backups() 的结果（按时间倒序）
+            measure: 可选函数，接收按时间倒序排列的备份列表，返回依次保留它们时各自增加的占用空间（字节）；
+                     默认取各备份的 stored_size（没有时取 size）
+
+        Returns:
+            (keep, remove)：两个列表，均按时间倒序
+        """
+        ordered = sorted(backups, key=lambda b: (b['created_at'], b.get('seq', 1)), reverse=True)
+        if not ordered:
+            return [], []
+
+        if self._has_count_rules():
+            kept = {b['filename'] for b in ordered[:max(self.keep_last, 1)]}
+            for name, count in self.counts.items():
+                if count <= 0:
+                    continue
+                period_of = self.GFS_PERIODS[name]
+                periods = set()
+                for b in ordered:
+                    period = period_of(b['created_at'])
+                    if period in periods:
+                        continue
+                    if len(periods) >= count:
+                        break
+                    # 倒序遍历，每个时间段遇到的第一个即其中最新的备份
+                    periods.add(period)
+                    kept.add(b['filename'])
+        else:
+            kept = {b['filename'] for b in ordered}
+
+        if self.max_total_size is not None:
+            candidates = [b for b in ordered if b['filename'] in kept]
+            if measure is None:
+                sizes = [b.get('stored_size') or b['size'] for b in candidates]
+            else:
+                sizes = measure(candidates)
+            total = 0
+            for b, size in zip(candidates, sizes):
+                total += size
+                if b is not ordered[0] and total > self.max_total_size:
+                    kept.discard(b['filename'])
+
+        keep = [b for b in ordered if b['filename'] in kept]
+        remove = [b for b in ordered if b['filename'] not in kept]
+        return keep, remove
+
+
+class BackupManager:
+    """备份管理器：管理 JSON 文件的备份
+
+    新备份写入所选的存储后端（backend）：
+      - "cas"（默认）：内容寻址存储（ContentAddressedStore，.snap），各条目内容去重后压缩存放，
+        每个备份只是一份条目哈希清单
+      - "delta"：增量链存储（DeltaChainStore，.delta），记录相对上一个备份的差异，定期写完整关键帧
+      - "full"：压缩的完整副本（CompressedFileStore，.json.zst / .json.gz / .json.xz）
+    "delta" 和 "full" 按 codec 压缩（见 backup_codec）。
+    已有备份按文件后缀交给对应的存储读取，切换后端不影响旧备份；旧版的完整副本（.json）同样可用。
+
+    备份列表来自备份目录索引（BackupCatalog，backups/backup_catalog.db），由 create_backup / delete_backup
+    维护；备份文件夹在本程序之外被改动（文件夹 mtime 变化）时按实际文件重新同步，旧版 backup_metadata.json
+    中的描述在同步时导入。
+    """
+
+    LEGACY_SUFFIX = ".json"
+    METADATA_NAME = "backup_metadata.json"
+    BACKENDS = ("cas", "delta", "full")
+
+    def __init__(self, json_path, backend="cas", keyframe_interval=10, codec="auto", compress_level=None,
+                 retention=None):
+        """
+        Args:
+            json_path: 云存储 JSON 文件路径
+            backend: 新备份使用的存储后端，"cas"、"delta" 或 "full"（未知值按 "cas" 处理）
+            keyframe_interval: "delta" 后端的关键帧间隔
+            codec: 压缩格式，"auto"、"zstd"、"gzip"、"xz" 或 "none"（"full" 后端不接受 "none"，按 "auto" 处理）
+            compress_level: 压缩级别，None 取该格式的默认级别
+            retention: 保留策略（RetentionPolicy），每次 create_backup 后按它清理旧备份；None 不自动清理
+        """
         self.json_path = json_path
+        self.retention = retention
         self.json_dir = os.path.dirname(json_path)
         self.backup_dir = os.path.join(self.json_dir, "backups")
         self.json_name = os.path.basename(json_path)
+        self.catalog = BackupCatalog(self.backup_dir)
+
+        codec = backup_codec.resolve(codec)
+        self.cas_store = cas_store = ContentAddressedStore(self.backup_dir)
+        self.delta_store = DeltaChainStore(self.backup_dir, keyframe_interval=keyframe_interval,
+                                           codec=codec, level=compress_level)
+        # 每种压缩格式一个完整副本存储，以便读取用其他格式创建的旧备份
+        full_stores = {name: CompressedFileStore(self.backup_dir, name, compress_level)
+                       for name in backup_codec.CODECS}
+        self.stores = [cas_store, self.delta_store, *full_stores.values()]
+
+        if backend == "delta":
+            self.store = self.delta_store
+        elif backend == "full":
+            self.store = full_stores[codec or backup_codec.resolve()]
+        else:
+            self.store = cas_store
+
+    def _store_for(self, filename):
+        """备份文件对应的存储，旧版完整副本返回 None"""
+        for store in self.stores:
+            if filename.endswith(store.SUFFIX):
+                return store
+        return None
+
+    def _is_backup_file(self, filename):
+        if filename in (self.METADATA_NAME, DeltaChainStore.CHAIN_NAME):
+            return False
+        return filename.endswith(self.LEGACY_SUFFIX) or self._store_for(filename) is not None
+
+    def open_backup(self, backup_filename):
+        """以二进制读取流打开备份对应的原文件内容（压缩的备份边读边解压）"""
+        backup_path = os.path.join(self.backup_dir, backup_filename)
+        store = self._store_for(backup_filename)
+        if store is not None:
+            return store.open(backup_path)
+        return open(backup_path, 'rb')
 
+    def read_backup_bytes(self, backup_filename):
+        """读取备份对应的原文件内容（bytes）"""
+        with self.open_backup(backup_filename) as f:
+            return f.read()
 
-    def create_backup(self, description=""):
+    def load_backup_data(self, backup_filename):
+        """解析备份内容（与 SteamToolboxCore.load_json 相同的数据结构）"""
+        return CloudStorageData.from_text(self.read_backup_bytes(backup_filename).decode('utf-8'))
+
+    def _load_current_data(self):
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            return CloudStorageData.from_text(f.read())
+
+
+    def create_backup(self, description="", prune=True):
         """创建备份
 
         Args:
             description: 备份描述（可选）
+            prune: 创建后是否按保留策略清理旧备份
 
         Returns:
             str: 备份文件路径，失败返回 None
@@ -28,109 +225,177 @@ class BackupManager:
             return None
 
         os.makedirs(self.backup_dir, exist_ok=True)
-
-        # 生成备份文件名：原文件名_时间戳.json
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{os.path.splitext(self.json_name)[0]}_{timestamp}.json"
-        backup_path = os.path.join(self.backup_dir, backup_name)
+        self._sync_catalog()
+
+        # 生成备份文件名：原文件名_时间戳 + 存储后缀（.snap / .delta / .json.gz 等）
+        created_at = datetime.now().replace(microsecond=0)
+        prefix = f"{os.path.splitext(self.json_name)[0]}_{created_at:%Y%m%d_%H%M%S}"
+        # 同一秒内多次备份（如恢复前自动备份）时加序号，避免覆盖；
+        # 序号取同一秒内已有备份的最大序号 + 1，保证新备份排在最后（即使较早的已被清理）
+        seq = self.catalog.max_seq(created_at.isoformat()) + 1
+        while True:
+            backup_name = f"{prefix}_{seq}{self.store.SUFFIX}" if seq > 1 else f"{prefix}{self.store.SUFFIX}"
+            backup_path = os.path.join(self.backup_dir, backup_name)
+            if not os.path.exists(backup_path):
+                break
+            seq += 1
 
         try:
-            shutil.copy2(self.json_path, backup_path)
-
-            # 保存备份元数据
-            self._save_backup_metadata(backup_name, description)
+            info = self.store.write(self.json_path, backup_path)
 
-            return backup_path
+            # 收藏夹摘要（原文件无法解析时不记录）
+            try:
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    summary = summarize_collections(CloudStorageData.from_text(f.read()))
+            except Exception:
+                summary = None
+
+            # 登记到备份目录索引
+            self.catalog.add({
+                'filename': backup_name,
+                'created_at': created_at.isoformat(),
+                'seq': seq,
+                'description': description,
+                'original_file': self.json_name,
+                'size': info['size'],
+                'stored_size': info['stored_size'],
+                'sha256': info['sha256'],
+                'collections': len(summary) if summary is not None else None,
+                'games': sum(item[2] for item in summary) if summary is not None else None,
+            }, summary)
+            self._mark_catalog_synced()
         except Exception as e:
             print(f"创建备份失败: {e}")
             return None
 
-    def _save_backup_metadata(self, backup_name, description):
-        """保存备份元数据"""
-        metadata_path = os.path.join(self.backup_dir, "backup_metadata.json")
-        metadata = {}
-
-        if os.path.exists(metadata_path):
+        if prune and self.retention is not None:
             try:
-                with open(metadata_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-            except:
-                metadata = {}
+                self.prune_backups()
+            except Exception as e:
+                print(f"清理旧备份失败: {e}")
 
-        if 'backups' not in metadata:
-            metadata['backups'] = {}
-
-        metadata['backups'][backup_name] = {
-            'created_at': datetime.now().isoformat(),
-            'description': description,
-            'original_file': self.json_name,
-        }
-
-        try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-        except:
-            pass
+        return backup_path
 
     def list_backups(self):
-        """列出所有备份
+        """列出所有备份（从备份目录索引读取）
 
         Returns:
-            list of dict: [{'filename': '...', 'path': '...', 'created_at': '...', 'description': '...', 'size': ...}]
+            list of dict: [{'filename': '...', 'path': '...', 'created_at': datetime, 'seq': 同一秒内的序号,
+                            'description': '...', 'original_file': '...', 'size': 原文件大小,
+                            'stored_size': 压缩后占用的磁盘空间, 'sha256': '...',
+                            'collections': 收藏夹数, 'games': 游戏数}]，按时间倒序；
+            旧版备份的 sha256、收藏夹数和游戏数可能为 None
         """
         if not os.path.exists(self.backup_dir):
             return []
 
-        backups = []
-        metadata = self._load_metadata()
-
-        for entry in os.listdir(self.backup_dir):
-            if not entry.endswith('.json') or entry == 'backup_metadata.json':
-                continue
+        self._sync_catalog()
+        backups = self.catalog.list()
+        for b in backups:
+            b['path'] = os.path.join(self.backup_dir, b['filename'])
+            b['created_at'] = datetime.fromisoformat(b['created_at'])
+        return backups
 
-            backup_path = os.path.join(self.backup_dir, entry)
-            if not os.path.isfile(backup_path):
-                continue
+    def get_collection_summary(self, backup_filename):
+        """备份的收藏夹摘要 [[收藏夹 ID, 名称, 游戏数, 是否动态], ...]
 
-            # 从文件名解析时间戳
+        同步时登记的旧备份首次查询时才解析备份内容，结果写回备份目录索引。
+        """
+        summary = self.catalog.get_summary(backup_filename)
+        if summary is None:
+            summary = summarize_collections(self.load_backup_data(backup_filename))
+            self.catalog.set_summary(backup_filename, summary)
+        return summary
+
+    @staticmethod
+    def _parse_backup_name(entry, backup_path):
+        """从文件名解析创建时间和同一秒内的序号，无法解析时取文件 mtime"""
+        match = BACKUP_NAME_PATTERN.search(entry)
+        if match:
             try:
-                # 格式: cloud-storage-namespace-1_20240101_120000.json
-                match = re.search(r'_(\d{8}_\d{6})\.json$', entry)
-                if match:
-                    ts_str = match.group(1)
-                    created_at = datetime.strptime(ts_str, "%Y%m%d_%H%M%S")
-                else:
-                    created_at = datetime.fromtimestamp(os.path.getmtime(backup_path))
-            except:
-                created_at = datetime.fromtimestamp(os.path.getmtime(backup_path))
+                return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S"), int(match.group(2) or 1)
+            except ValueError:
+                pass
+        return datetime.fromtimestamp(os.path.getmtime(backup_path)).replace(microsecond=0), 1
 
-            # 获取元数据中的描述
-            meta = metadata.get('backups', {}).get(entry, {})
-            description = meta.get('description', '')
+    def _catalog_stamp(self):
+        return str(os.stat(self.backup_dir).st_mtime_ns)
 
-            backups.append({
-                'filename': entry,
-                'path': backup_path,
-                'created_at': created_at,
-                'description': description,
-                'size': os.path.getsize(backup_path),
-            })
+    def _mark_catalog_synced(self):
+        """记录备份目录索引与文件夹一致时的文件夹 mtime"""
+        self.catalog.set_state('dir_mtime', self._catalog_stamp())
 
-        # 按时间倒序排列
-        backups.sort(key=lambda x: x['created_at'], reverse=True)
-        return backups
+    def _sync_catalog(self):
+        """备份文件夹在本程序之外被改动时，按实际文件同步备份目录索引
+
+        文件夹的 mtime 与上次同步时不同才检查。对象库和备份目录索引的 SQLite 数据库也在这个文件夹中，
+        打开/关闭连接时会创建、删除 -wal/-shm 文件，mtime 经常变化，因此检查只列出文件名：
+        补登记新出现的备份文件（只对它们读取大小，描述取自旧版 backup_metadata.json），移除已不存在的；
+        已登记的备份不逐个 stat（本程序改写增量链后会自行刷新占用空间）。
+        """
+        if self._catalog_stamp() == self.catalog.get_state('dir_mtime'):
+            return
 
-    def _load_metadata(self):
-        """加载备份元数据"""
-        metadata_path = os.path.join(self.backup_dir, "backup_metadata.json")
+        known = {b['filename'] for b in self.catalog.list()}
+        present = set()
+        added = []
+        legacy = None
+        for entry in os.listdir(self.backup_dir):
+            if not self._is_backup_file(entry):
+                continue
+            if entry in known:
+                present.add(entry)
+                continue
+            backup_path = os.path.join(self.backup_dir, entry)
+            if not os.path.isfile(backup_path):
+                continue
+            present.add(entry)
+            file_size = os.path.getsize(backup_path)
+            # .snap 与其他快照共享对象，占用空间取创建时新增的部分
+            is_snapshot = entry.endswith(ContentAddressedStore.SUFFIX)
+
+            if legacy is None:
+                legacy = self._load_legacy_metadata().get('backups', {})
+            meta = legacy.get(entry, {})
+            created_at, seq = self._parse_backup_name(entry, backup_path)
+            added.append(({
+                'filename': entry,
+                'created_at': created_at.isoformat(),
+                'seq': seq,
+                'description': meta.get('description', ''),
+                'original_file': meta.get('original_file'),
+                'size': meta.get('size') or file_size,
+                'stored_size': (meta.get('stored_size') or file_size) if is_snapshot else file_size,
+            }, None))
+
+        gone = [name for name in known if name not in present]
+        if gone:
+            self.catalog.remove(gone)
+        if added:
+            self.catalog.add_many(added)
+        self._mark_catalog_synced()
+
+    def _load_legacy_metadata(self):
+        """加载旧版备份元数据（backup_metadata.json，仅在同步备份目录索引时导入描述）"""
+        metadata_path = os.path.join(self.backup_dir, self.METADATA_NAME)
         if os.path.exists(metadata_path):
             try:
                 with open(metadata_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    return json_codec.load(f)
             except:
                 pass
         return {}
 
+    def _refresh_delta_sizes(self):
+        """增量链备份被改写（删除后继、整理）后，更新其在备份目录索引中的占用空间"""
+        sizes = {}
+        for b in self.catalog.list():
+            if b['filename'].endswith(DeltaChainStore.SUFFIX):
+                backup_path = os.path.join(self.backup_dir, b['filename'])
+                if os.path.exists(backup_path):
+                    sizes[b['filename']] = os.path.getsize(backup_path)
+        self.catalog.set_stored_sizes(sizes)
+
     def restore_backup(self, backup_filename):
         """恢复备份
 
@@ -145,11 +410,12 @@ class BackupManager:
             return False
 
         try:
-            # 先备份当前文件
-            self.create_backup(description="恢复前自动备份")
+            # 先打开备份（.snap/.delta 在此还原并校验），再备份当前文件（此时不清理，以免清掉正在恢复的备份）
+            with self.open_backup(backup_filename) as src:
+                self.create_backup(description="恢复前自动备份", prune=False)
 
-            # 恢复
-            shutil.copy2(backup_path, self.json_path)
+                # 恢复：边解压边写入临时文件，再原子替换
+                copy_stream(src, self.json_path)
             return True
         except Exception as e:
             print(f"恢复备份失败: {e}")
@@ -169,26 +435,96 @@ class BackupManager:
             return False
 
         try:
-            os.remove(backup_path)
-
-            # 更新元数据
-            metadata_path = os.path.join(self.backup_dir, "backup_metadata.json")
-            if os.path.exists(metadata_path):
-                try:
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    if 'backups' in metadata and backup_filename in metadata['backups']:
-                        del metadata['backups'][backup_filename]
-                        with open(metadata_path, 'w', encoding='utf-8') as f:
-                            json.dump(metadata, f, ensure_ascii=False, indent=2)
-                except:
-                    pass
-
+            self._remove_backup_files([backup_filename])
             return True
         except Exception as e:
             print(f"删除备份失败: {e}")
             return False
 
+    def _remove_backup_files(self, filenames):
+        """批量删除备份，最后在一个事务中更新备份目录索引
+
+        由存储负责删除（改写增量链中的后继）；内容寻址存储在全部删除后统一清理一次无引用的对象。
+        中途出错时已删除的备份仍会从索引中移除，异常继续抛出。
+
+        Returns:
+            实际删除的文件名列表
+        """
+        removed = []
+        collect = []
+        try:
+            for filename in filenames:
+                backup_path = os.path.join(self.backup_dir, filename)
+                if not os.path.exists(backup_path):
+                    continue
+                store = self._store_for(filename)
+                if isinstance(store, ContentAddressedStore):
+                    store.delete(backup_path, collect=False)
+                    if store not in collect:
+                        collect.append(store)
+                elif store is not None:
+                    store.delete(backup_path)
+                else:
+                    os.remove(backup_path)
+                removed.append(filename)
+        finally:
+            for store in collect:
+                store.collect_garbage(store.manifest_paths())
+            if removed:
+                self.catalog.remove(removed)
+                if any(name.endswith(DeltaChainStore.SUFFIX) for name in removed):
+                    self._refresh_delta_sizes()
+                self._mark_catalog_synced()
+        return removed
+
+    def prune_backups(self, policy=None, dry_run=False):
+        """按保留策略清理旧备份
+
+        Args:
+            policy: 保留策略，None 使用 self.retention（也为 None 时不清理）
+            dry_run: 为 True 时只返回将被清理的备份，不删除
+
+        Returns:
+            list of dict: 被清理（dry_run 时为将被清理）的备份，格式同 list_backups()
+        """
+        policy = policy or self.retention
+        if policy is None:
+            return []
+        _, remove = policy.select(self.list_backups(), self._retained_sizes)
+        if remove and not dry_run:
+            removed = set(self._remove_backup_files([b['filename'] for b in remove]))
+            remove = [b for b in remove if b['filename'] in removed]
+        return remove
+
+    def _retained_sizes(self, backups):
+        """依次保留这些备份（按时间倒序）时各自增加的占用空间，供保留策略的 max_total_size 使用
+
+        CAS 快照之间共享对象，按 ContentAddressedStore.retained_sizes() 计算清理其余快照并回收对象后的实际占用；
+        其他备份取 stored_size（没有时取 size）。
+        """
+        sizes = [b.get('stored_size') or b['size'] for b in backups]
+        snaps = [i for i, b in enumerate(backups) if b['filename'].endswith(ContentAddressedStore.SUFFIX)]
+        if snaps:
+            paths = [os.path.join(self.backup_dir, backups[i]['filename']) for i in snaps]
+            for i, size in zip(snaps, self.cas_store.retained_sizes(paths)):
+                sizes[i] = size
+        return sizes
+
+    def compact_backups(self):
+        """整理增量链备份：按当前关键帧间隔重写整条链
+
+        Returns:
+            int: 重写的备份数，失败返回 None
+        """
+        try:
+            count = self.delta_store.compact()
+            self._refresh_delta_sizes()
+            self._mark_catalog_synced()
+            return count
+        except Exception as e:
+            print(f"整理备份失败: {e}")
+            return None
+
     def compare_with_current(self, backup_filename):
         """比较备份与当前文件的差异
 
@@ -198,13 +534,9 @@ class BackupManager:
         Returns:
             dict: 差异信息
         """
-        backup_path = os.path.join(self.backup_dir, backup_filename)
-
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                current_data = json.load(f)
+            backup_data = self.load_backup_data(backup_filename)
+            current_data = self._load_current_data()
         except Exception as e:
             return {'error': str(e)}
 
@@ -220,14 +552,9 @@ class BackupManager:
         Returns:
             dict: 差异信息
         """
-        backup1_path = os.path.join(self.backup_dir, backup1_filename)
-        backup2_path = os.path.join(self.backup_dir, backup2_filename)
-
         try:
-            with open(backup1_path, 'r', encoding='utf-8') as f:
-                data1 = json.load(f)
-            with open(backup2_path, 'r', encoding='utf-8') as f:
-                data2 = json.load(f)
+            data1 = self.load_backup_data(backup1_filename)
+            data2 = self.load_backup_data(backup2_filename)
         except Exception as e:
             return {'error': str(e)}
 
@@ -247,26 +574,18 @@ class BackupManager:
         """
 
         def extract_collections(data):
-            """提取收藏夹信息"""
+            """提取收藏夹信息（经 CollectionStore 解码，data 为已加载的 CloudStorageData 时复用其解码结果）"""
             collections = {}
-            for entry in data:
-                key = entry[0]
-                meta = entry[1]
-                if key.startswith("user-collections."):
-                    if meta.get("is_deleted") is True or "value" not in meta:
-                        continue
-                    try:
-                        val_obj = json.loads(meta['value'])
-                        col_id = val_obj.get("id", key)
-                        collections[col_id] = {
-                            'name': val_obj.get("name", "未命名"),
-                            'added': set(val_obj.get("added", [])),
-                            'removed': set(val_obj.get("removed", [])),
-                            'is_dynamic': "filterSpec" in val_obj,
-                            'raw_value': val_obj,
-                        }
-                    except:
-                        continue
+            for rec in CollectionStore.of(data).records():
+                val_obj = rec.value
+                col_id = val_obj.get("id", rec.key)
+                collections[col_id] = {
+                    'name': val_obj.get("name", "未命名"),
+                    'added': rec.sorted_added(),
+                    'removed': sorted_id_array(val_obj.get("removed", [])),
+                    'is_dynamic': rec.is_dynamic,
+                    'raw_value': val_obj,
+                }
             return collections
 
         old_cols = extract_collections(old_data)
@@ -321,8 +640,9 @@ class BackupManager:
 
             # 检查是否有变化
             name_changed = old_col['name'] != new_col['name']
-            added_games = new_col['added'] - old_col['added']
-            removed_games = old_col['added'] - new_col['added']
+            # added 为升序去重的整数数组，有序归并求差集
+            added_games = merge_difference(new_col['added'], old_col['added'])
+            removed_games = merge_difference(old_col['added'], new_col['added'])
 
             if name_changed or added_games or removed_games:
                 result['modified_collections'].append({
@@ -48,6 +48,48 @@
   │   │
   │   ├── local_storage.py    ← 备份管理器。
   │   │                  · BackupManager   — 创建/恢复/删除/对比备份
+  │   │                  · RetentionPolicy — 备份保留策略（最近 N 个 / GFS 轮换 / 总占用上限）
+  │   │
+  │   ├── backup_store.py     ← 备份存储后端。
+  │   │                  · ContentAddressedStore — 内容寻址去重存储：快照为条目哈希清单（.snap），
+  │   │                                            条目内容压缩后存入 backups/backup_objects.db
+  │   │                  · DeltaChainStore       — 增量链存储：每个备份（.delta）记录相对上一个备份的
+  │   │                                            条目差异，每隔 N 个写一个完整关键帧
+  │   │                  · CompressedFileStore   — 压缩的完整副本（.json.zst / .json.gz / .json.xz）
+  │   │
+  │   ├── backup_catalog.py   ← 备份目录索引（SQLite，backups/backup_catalog.db）。
+  │   │                  · BackupCatalog   — 每个备份一行：时间、大小、描述、SHA-256、收藏夹摘要，
+  │   │                                      list_backups() 只读这张表
+  │   │
+  │   ├── backup_codec.py     ← 备份压缩格式（标准库 gzip/lzma，可选 zstandard），流式压缩/解压。
+  │   │
+  │   ├── cloud_storage.py    ← 云存储 JSON（cloud-storage-namespace-1.json）数据模型。
+  │   │                  · CloudStorageData — 条目列表（list 子类），维护最大版本号和 key 索引，
+  │   │                                       保存时未改动的条目直接复用原文
+  │   │                  · CollectionStore  — 收藏夹解码视图，value 只解码一次，保存时只编码修改过的
+  │   │
+  │   ├── json_codec.py       ← JSON 编解码（可选 orjson/ujson 后端，未安装时用标准库 json）。
+  │   │
+  │   ├── igdb_cache.py       ← IGDB 本地缓存存储（SQLite，标准库 sqlite3）。
+  │   │                  · IGDBCacheStore  — 维度/条目/倒排表/game_to_steam 分表索引，
+  │   │                                      首次打开时自动迁移旧版 igdb_cache.json
+  │   │                                      进程内共享实例，读取结果按文件 mtime/大小缓存
+  │   │                                      全量下载断点（dump_* 表）也存放在这里
+  │   │
+  │   ├── throttle.py  ← 并发请求限速工具。
+  │   │                  · TokenBucket     — 线程安全的令牌桶（IGDB 每秒请求数上限）
+  │   │                  · HostLimiter     — 按主机限制同时进行中的请求数
+  │   │
+  │   ├── html_scan.py ← 流式 HTML 扫描。
+  │   │                  · HtmlStreamScanner — 分块提取 AppID/页面名称，读到页脚标记即停止
+  │   │
+  │   ├── source_cache.py ← 来源结果缓存（SQLite，source_cache.db）。
+  │   │                  · SourceResultCache — 各来源最终 AppID 列表，按来源类型设置有效期
+  │   │
+  │   ├── http_client.py ← 共享 HTTP 客户端（标准库 http.client）。
+  │   │                  · HttpClient      — 按主机复用 keep-alive 连接，自动 gzip/deflate 解压，
+  │   │                                      错误仍抛 urllib.error.HTTPError/URLError
+  │   │                  · HttpResponseCache — 磁盘页面缓存 http_cache.db（ETag/Last-Modified 条件请求）
   │   │
   │   └── spiders.py   ← 爬虫模块（预留扩展位）。
   │                      · IGDBSpider      — 目前为占位符，未来可从 core.py
@@ -63,17 +105,23 @@
           → ui.SteamToolbox(account, callback)
              └── self.core = core.SteamToolboxCore(account)
                               └── self.backup_manager = local_storage.BackupManager(...)
+                              └── self.http = http_client.HttpClient(...)（所有网络请求）
 
 【第三方依赖】
   · 无。vdf 库（解析 Steam 的 localconfig.vdf 配置文件以读取用户昵称）已作为
     本地模块内置在 vdf/ 文件夹中（MIT 许可证，来源 github.com/ValvePython/vdf
     v3.4），无需 pip install，开箱即用。
+  · 可选：orjson 或 ujson。安装后 JSON 读写自动改用更快的后端（json_codec.py），
+    未安装时使用标准库 json；可在 config.json 的 json_backend 中指定。
+  · 可选：zstandard。安装后增量链/压缩副本备份默认用 zstd 压缩（backup_codec.py），未安装时用 gzip；
+    可在 config.json 的 backup_codec / backup_compress_level 中指定格式和级别。
 
 【修改指南 - 给 AI 的】
   · 改界面/交互 → 编辑 ui.py
   · 改数据抓取/业务逻辑 → 编辑 core.py
   · 改账号扫描/检测 → 编辑 account_manager.py
   · 改备份功能 → 编辑 local_storage.py
+  · 改 IGDB 缓存存储 → 编辑 igdb_cache.py
   · 添加新爬虫 → 编辑 spiders.py 或新建模块
   · 改导言区规则 → 编辑本文件 main.py
 
@@ -143,6 +191,169 @@ Steam Library Manager 是一款为"游戏收藏家"设计的 Steam 收藏夹批
 ================================================================================
 【更新日志】
 ================================================================================
+2026-10-17  v2.8.6 — 问题修复：
+                    - 流式 HTML 扫描：触及块末尾的 AppID 匹配（数字可能被截断）留到下一块再判断；
+                      标题等 first_patterns 尚未匹配时保留最后 64KB，跨块的匹配不再漏掉
+                    - Steam250（含批量获取）：商店链接的 AppID 须取完整的数字串，来源结果缓存键包含提取规则，
+                      此前可能被截断的缓存结果不再命中
+                    - IGDB 全量下载的耗时提示改为按请求数和速率上限（每秒 4 个）估算（estimate_igdb_full_download）
+                    - IGDB 增量刷新：游戏改关联到其他 Steam AppID 时，原 AppID 的倒排记录按剩下的游戏重建；
+                      清理空条目只检查本次受影响的条目
+                    - IGDB 自动补全失败游戏增加冷却（1 小时）和次数上限（5 次），一直失败的游戏不再让每次分类查询都请求网络
+                    - HTTP 响应缓存不再保存 JSON 中 success 为假的 200 响应（Steam 接口出错时的返回），
+                      HttpClient.get 支持 validate 参数自定义判定；已缓存的此类响应视为未缓存
+                    - 鉴赏家推荐分页失败（异常或 success 为假）时按指数退避重试 CURATOR_PAGE_MAX_RETRIES 次；
+                      仍失败的分页计入 sweep_report 的 failed_pages，界面提示结果不完整且不写入结果缓存，
+                      第一页失败的语言不再被静默跳过
+                    - 来源结果缓存只保存完整结果：鉴赏家/发行商分页失败、Steam250 不足 250 个、IGDB 公司批次失败时不缓存；
+                      steam_list 缓存键加入 smart_sweep，命中时恢复扫描统计；IGDB 缓存重建、增量刷新或清除后失效 IGDB 公司缓存；
+                      推荐来源和鉴赏家窗口新增「忽略缓存，重新获取」选项
+                    - 增量序列化改为比较条目 meta 的浅快照：只修改 is_deleted、timestamp、conflictResolutionMethod
+                      等字段的条目也会重新编码，不再被旧原文覆盖；保留原文首个条目之前和最后一个条目之后的空白
+                    - 保留策略的 max_total_mb 对 CAS 快照按实际占用计算：从新到旧累计每个快照的清单大小和
+                      更新的快照都未引用的对象大小（即清理并回收对象后对象库和清单的大小），不再累加只含新增对象的 stored_size
+                    - 备份目录索引同步：对象库和索引数据库的 -wal/-shm 文件会改变备份文件夹的 mtime，
+                      mtime 变化后改为只按文件名比对，仅对新出现的备份读取大小，不再每次启动都逐个 stat；
+                      更正 backup_catalog 中关于 WAL 不影响目录 mtime 的错误注释
+                    - HttpClient.stream()：读取出错中断的响应不再写入缓存（此前截断的前缀会在有效期内被当作完整页面返回，
+                      过期后还会经 304 续用）；只在读完或调用方主动停止时缓存，前缀条目不用于条件请求，
+                      调用方需要更多内容时先产出前缀再从网络获取剩余部分
+                    - IGDB 增量刷新只拉取有 Steam 关联的游戏（games 查询按 external_games.external_game_source = 1 过滤），
+                      不再翻页下载 IGDB 中所有更新过的游戏；距上次全量下载超过 30 天（IGDB_FULL_REBUILD_DAYS）时，
+                      缓存过期后改为全量重建，清除增量刷新发现不了的已删除 Steam 关联
+2026-10-17  v2.8.5 — 备份目录索引：
+                    - 新增 backup_catalog.py（BackupCatalog）：备份信息（创建时间、同秒序号、描述、原文件大小、
+                      占用空间、SHA-256、收藏夹数/游戏数及各收藏夹摘要）存入 backups/backup_catalog.db
+                    - list_backups() 改为一次按时间索引的查询，不再逐个文件 listdir + 正则 + stat，也不再读取
+                      backup_metadata.json；create_backup / delete_backup / 按策略清理在同一事务中维护索引
+                    - 备份文件夹在程序外被改动（mtime 变化）时自动同步差异；旧版备份及 backup_metadata.json 中的
+                      描述在首次同步时导入，旧备份的收藏夹摘要在 get_collection_summary() 首次查询时补记
+                    - 备份列表新增「收藏夹」列
+2026-10-17  v2.8.4 — 备份保留策略：
+                    - local_storage.py 新增 RetentionPolicy：保留最近 N 个（keep_last）、祖父-父-子轮换
+                      （hourly/daily/weekly/monthly，每个时间段保留最新的一个）、总占用上限（max_total_mb），规则取并集
+                    - 由 config.json 的 backup_retention 配置，每次 create_backup 后自动清理（恢复前的自动备份除外）；
+                      未配置时不清理
+                    - BackupManager.prune_backups(dry_run=True) 只列出将被清理的备份；批量删除后只更新一次
+                      backup_metadata.json，内容寻址存储的无引用对象也只清理一次
+                    - 备份管理界面新增「按策略清理」，先预览再确认
+                    - 同一秒内的备份序号取已有最大序号 + 1，列表按时间和序号排序
+2026-10-17  v2.8.3 — 压缩备份：
+                    - 新增 backup_codec.py：备份压缩格式可选 zstd（需安装 zstandard）、gzip、xz，
+                      由 config.json 的 backup_codec（auto/zstd/gzip/xz/none）和 backup_compress_level 配置
+                    - backup_store.py 新增 CompressedFileStore（backup_backend 设为 full）：整个文件流式压缩为
+                      .json.zst / .json.gz / .json.xz；增量链备份的记录文件同样按所选格式压缩
+                    - 恢复、对比备份时边读边解压（BackupManager.open_backup），恢复经临时文件原子替换
+                    - list_backups() 同时返回原文件大小（size）和压缩后占用（stored_size），备份列表新增「占用」列
+                    - 修复增量链索引 delta_chain.json 被当作旧版备份列出的问题
+2026-10-17  v2.8.2 — 增量链备份：
+                    - backup_store.py 新增 DeltaChainStore：备份（.delta）只记录相对上一个备份的条目差异
+                      （JSON Patch 形式的 add/replace/remove），每隔 N 个备份（默认 10）写一个完整关键帧，
+                      恢复任一备份最多回放 N-1 个差异
+                    - config.json 的 backup_backend 选择新备份的存储（cas/delta，默认 cas），
+                      backup_keyframe_interval 设置关键帧间隔；已有备份按后缀读取，切换后端不影响旧备份
+                    - 删除链中的备份时把下一个备份改写为相对其前驱的差异，其余备份保持可恢复
+                    - 备份管理界面新增「整理增量备份」，按当前关键帧间隔重写整条链
+2026-10-17  v2.8.1 — 内容寻址去重备份：
+                    - 新增 backup_store.py（ContentAddressedStore）：create_backup 不再整份复制文件，
+                      而是记录各条目的内容哈希清单（.snap），不同的条目内容只存一份（zlib 压缩，SQLite 对象库）
+                    - 恢复时按清单拼接原文并以 SHA-256 校验，与备份时逐字节一致；删除备份后清理无引用的对象
+                    - 旧版 .json 完整副本仍可列出、对比、恢复和删除；同一秒内的多个备份自动加序号
+2026-10-17  v2.8 — 可切换的 JSON 后端：
+                    - 新增 json_codec.py：优先使用 orjson，其次 ujson，均未安装时用标准库 json
+                      （config.json 的 json_backend 可指定 auto/orjson/ujson/json）
+                    - core.py、local_storage.py（配置、云存储文件、备份、元数据）及 IGDB/来源/HTTP 缓存的
+                      读写统一经 json_codec；解析失败仍抛 json.JSONDecodeError
+                    - 云存储文件顶层仍由标准库逐条目解析（以便增量保存复用原文），收藏夹 value 走所选后端
+2026-10-17  v2.7.9 — 增量保存：
+                    - load_json() 改用 CloudStorageData.from_text() 解析，记录每个条目在原文中的位置
+                    - save_json() 改用 CloudStorageData.dumps()：未改动的条目（version、value 未变）
+                      直接拼接原文（相邻条目整段切片），只编码新增/修改的条目；仍为临时文件 + 原子替换
+2026-10-17  v2.7.8 — 收藏夹 AppID 紧凑存储：
+                    - 解码后的 added/removed 改为 array('I')（每个 AppID 4 字节），只在编码写回时转为列表
+                    - 增量更新改为在升序数组上二分查找；备份对比改为有序归并求差集，不再临时构造整数集合
+                    - 导出结构化 JSON 时转换为普通列表
+2026-10-17  v2.7.7 — 收藏夹解码视图（CollectionStore）：
+                    - cloud_storage.py 新增 CollectionRecord（__slots__）/ CollectionStore：
+                      每个收藏夹的 value 字符串最多解码一次，刷新列表、增量/替换更新、备份对比共享解码结果
+                    - 更新收藏夹时只标记 dirty，save_json() 写入前统一重新编码修改过的收藏夹
+                    - 新建收藏夹统一经 _append_collection() 追加并登记，无需再次解码
+2026-10-17  v2.7.6 — 全局版本号分配 O(1)：
+                    - 新增 cloud_storage.py：CloudStorageData（list 子类）维护最大版本号和 key → 条目索引
+                    - load_json() 返回 CloudStorageData；next_version() 直接分配版本号，不再逐条扫描
+                      （批量导入/更新数百个收藏夹时由 O(N·M) 降为 O(N)）
+2026-10-17  v2.7.5 — 发行商/开发商/系列页面分页并发获取：
+                    - 主页面扫描时顺带记录分页链接中的最大页码（HtmlStreamScanner 新增 max_patterns）
+                    - 第 2 页起改为并发获取，不再逐页等待 0.3 秒；后续页面中出现更大页码时继续加入
+                    - 页面没有分页链接时保留原有逐页尝试、无新游戏即停止的方式
+2026-10-17  v2.7.4 — Steam250 提取优化 + 批量获取：
+                    - fetch_steam250_ids 改为按出现顺序、集合去重的流式提取，凑满 250 个即停止下载
+                      （原先在列表上逐个 in 判断去重，复杂度为平方级）
+                    - 新增 fetch_steam250_ids_bulk()：一次调用并发获取多个 Steam250 页面；
+                      推荐来源中勾选的全部 Steam250 榜单/年份统一通过它获取
+2026-10-17  v2.7.3 — 页面流式解析：
+                    - 新增 html_scan.py（HtmlStreamScanner）和 HttpClient.stream()：边下载边提取 AppID 与页面名称，
+                      读到页脚（id="footer"）后立即停止下载，不再把整页读入内存后多次全文正则
+                    - fetch_generic_list、fetch_steam250_ids、鉴赏家/发行商页面信息均改为流式扫描
+                    - extract_ids_from_html 直接在原字符串区间内匹配，不再复制列表区域
+2026-10-17  v2.7.2 — 来源结果缓存：
+                    - 新增 source_cache.py（SourceResultCache），缓存鉴赏家/发行商/开发商等列表、
+                      Steam250 页面、IGDB 公司的最终 AppID 列表
+                    - 缓存键包含来源标识与是否登录；有效期按来源类型区分（Steam250 1 天、鉴赏家 6 小时、
+                      IGDB 公司 7 天等），可在 config.json 的 source_cache_ttls 中覆盖
+                    - 有效期内再次获取同一来源完全不联网，批量更新多个收藏夹时尤为明显
+2026-10-17  v2.7.1 — Steam 页面磁盘缓存：
+                    - 新增 HttpResponseCache：Steam250、鉴赏家页面/推荐分页、发行商等列表页的响应
+                      压缩后存入 ~/.steam_toolbox/http_cache.db
+                    - 缓存 1 小时内直接使用本地内容；过期后带 If-None-Match/If-Modified-Since 重新验证，
+                      未变化（304）时沿用本地内容。有效期可在 config.json 的 http_cache_ttl 中修改
+                    - 缓存按 URL + Cookie + 语言区分，Cookie 只以哈希形式参与计算；超过 7 天的条目启动时清理
+2026-10-17  v2.7 — 推荐来源并发获取：
+                    - core 新增 fetch_recommendation_sources()：勾选的多个来源同时获取（最多 8 个），
+                      每完成一个立即回调，状态栏实时显示 [完成数/总数]
+                    - 同一主机的请求数仍由 HttpClient 限制，IGDB 请求仍受令牌桶限速
+                    - IGDB 分类来源共用本地缓存，放在同一线程依次获取，强制重新下载只执行一次
+                    - 去掉来源之间的 time.sleep(0.3)；IGDB 访问令牌的申请加锁，避免并发重复申请
+2026-10-17  v2.6.4 — 鉴赏家智能多语言扫描：
+                    - 主语言完整扫描，其余语言先只取第一页；total_count 不超过已收集数量、
+                      第一页无新游戏、且历史上从未补充过新游戏的语言跳过剩余分页
+                    - 每个鉴赏家各语言的贡献记录在 curator_lang_history.json 中
+                    - fetch_steam_list 新增 smart_sweep / sweep_report 参数，获取完成后显示各语言新增数量
+2026-10-17  v2.6.3 — 鉴赏家多语言并发扫描：
+                    - 5 种语言的推荐列表同时扫描，拿到 total_count 后剩余分页并发抓取
+                    - 去掉分页/语言之间的固定等待，大型鉴赏家的获取速度提升数倍
+                    - 新增 throttle.HostLimiter，HttpClient 按主机限制并发请求数（Steam 商店 6 个）
+2026-10-17  v2.6.2 — 网络请求改用长连接池：
+                    - 新增 http_client.py（HttpClient），替换 core.py 中所有 urllib.request.urlopen 调用
+                    - 同一主机的请求复用 TCP/TLS 连接，鉴赏家多页扫描、IGDB 批量查询不再每次重新握手
+                    - 请求自动携带 Accept-Encoding: gzip, deflate 并解压响应，减少传输量
+2026-10-17  v2.6.1 — IGDB 下载失败批次自动重试与补全：
+                    - games 批次请求失败后进入重试队列，按指数退避（带随机抖动）最多重试 4 轮
+                    - 仍失败的游戏 ID 记入缓存 _meta.failed_game_ids，下载结果提示部分失败
+                    - 下次获取时只补全这些游戏，不再因个别批次失败而重新下载全部数据
+2026-10-17  v2.6 — IGDB 缓存过期后增量刷新：
+                    - 缓存超过 7 天后不再重新下载全部数据，只请求 updated_at 晚于上次下载时间的
+                      external_games / games 记录，并原地修补各维度的倒排表
+                    - 同一 Steam 游戏关联多个 IGDB 游戏时按并集修补，不会误删分类
+                    - 「🔄 重新下载 IGDB 数据」仍执行全量下载（可清除 IGDB 侧已删除的记录）
+2026-10-17  v2.5.1 — IGDB 全量下载支持断点续传：
+                    - 每下载一页 external_games / 每完成一批 games 都把进度写入缓存数据库
+                    - 取消、网络错误或关闭程序后，再次下载会从断点继续，不再从头开始
+                    - 断点 24 小时内有效，下载完成或清除缓存时自动清理
+2026-10-17  v2.5 — IGDB 全量下载改为并发限速：
+                    - 新增 throttle.py（TokenBucket），所有 IGDB 请求共享令牌桶，总速率不超过 4 次/秒
+                    - external_games 按 id 区间切分后并发扫描，games 分批并发查询（最多 8 个并发）
+                    - 去掉固定的 time.sleep(0.28) 间隔，首次下载从 5-8 分钟缩短到约 1 分钟
+                    - 进度显示与取消行为保持不变
+2026-10-17  v2.4.1 — IGDB 缓存读取结果常驻内存：
+                    - IGDBCacheStore.shared() 进程内共享同一实例，多个标签页线程不再各自读取
+                    - 读取结果缓存在内存中，仅当数据库文件 mtime/大小变化或本进程写入后重新加载
+                    - 打开「从推荐来源获取」时 6 个维度的游戏数统计与后续分类查询均为内存命中
+2026-10-17  v2.4 — IGDB 缓存改用 SQLite 索引存储：
+                    - 新增 igdb_cache.py（IGDBCacheStore），缓存文件改为 igdb_cache.db
+                    - 单个条目查询、游戏数统计、公司游戏匹配只走索引，不再解析整份全量数据
+                    - 写入单个条目只改动该条目，不再重写整个缓存文件
+                    - 首次打开时自动迁移旧版 igdb_cache.json（迁移后重命名为 .migrated）
 2026-02-10  v2.3.2 — 公司搜索显示 Steam 游戏数：
                     - 搜索公司后批量查询 involved_companies，结合本地缓存统计
                       每个公司关联的 Steam 游戏数，搜索结果按游戏数降序排列
@@ -0,0 +1,89 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+import json_codec
+
+
+class SourceResultCache:
+    """来源结果缓存（SQLite，线程安全）
+
+    记录每个来源（鉴赏家、发行商、Steam250 页面、IGDB 公司等）最终得到的 AppID 列表，
+    有效期内再次获取同一来源时直接返回，不发任何网络请求。
+    缓存键由来源类型和影响结果的参数（标识符、是否登录等）计算得出，见 make_key()。
+    只应写入完整的结果（有分页或批次失败的结果由调用方跳过）；extra 保存随结果一起返回的附加信息（如扫描统计）。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            key         TEXT PRIMARY KEY,
+            source_type TEXT NOT NULL,
+            label       TEXT,
+            name        TEXT,
+            ids         TEXT NOT NULL,
+            stored_at   REAL NOT NULL,
+            extra       TEXT
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_results_type ON results (source_type);
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        # 旧版本数据库没有 extra 列
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if "extra" not in columns:
+            self._conn.execute("ALTER TABLE results ADD COLUMN extra TEXT")
+
+    @staticmethod
+    def make_key(source_type, *parts):
+        """由来源类型和影响结果的参数计算缓存键（参数按 str() 参与计算）"""
+        raw = "\n".join([source_type] + [str(p) for p in parts])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key, ttl):
+        """读取未超过 ttl 秒的缓存
+
+        Returns:
+            (ids, name, stored_at, extra)，不存在或已过期时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ids, name, stored_at, extra FROM results WHERE key = ?", (key,)).fetchone()
+        if not row or time.time() - row[2] >= ttl:
+            return None
+        return json_codec.loads(row[0]), row[1], row[2], json_codec.loads(row[3]) if row[3] else None
+
+    def put(self, key, source_type, ids, name=None, label=None, extra=None):
+        """
+        Args:
+            label: 便于排查的可读标识（如 URL、公司 ID），不参与键计算
+            extra: 随结果保存的附加信息（可 JSON 序列化），None 表示没有
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, source_type, label, name, ids, stored_at, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, source_type, label, name, json_codec.dumps(list(ids)), time.time(),
+                 json_codec.dumps(extra) if extra is not None else None))
+
+    def invalidate(self, source_type=None):
+        """删除某类来源（默认全部）的缓存"""
+        with self._lock, self._conn:
+            if source_type is None:
+                self._conn.execute("DELETE FROM results")
+            else:
+                self._conn.execute("DELETE FROM results WHERE source_type = ?", (source_type,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """令牌桶限速器（线程安全）
+
+    每秒补充 rate 个令牌，最多积攒 capacity 个。每次请求前调用 acquire() 取一个令牌，
+    令牌不足时阻塞等待，从而把多个线程的总请求速率控制在 rate 次/秒以内。
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate: 每秒补充的令牌数（即允许的请求速率）
+            capacity: 桶容量（允许的瞬时突发量），默认等于 rate
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, tokens=1, cancel_flag=None):
+        """取出令牌，不足时阻塞等待
+
+        Args:
+            tokens: 需要的令牌数
+            cancel_flag: list[bool]，cancel_flag[0]=True 时放弃等待
+
+        Returns:
+            bool: 是否取到令牌（被取消时返回 False）
+        """
+        while True:
+            if cancel_flag and cancel_flag[0]:
+                return False
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(min(wait, 0.25))
+
+    def penalize(self, seconds):
+        """收到速率限制响应（如 HTTP 429）时清空令牌并暂停补充 seconds 秒"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class HostLimiter:
+    """按主机限制同时进行中的请求数（线程安全）
+
+    每个主机一个信号量，超出上限的请求阻塞等待，避免并发抓取时对同一站点发起过多连接。
+    """
+
+    def __init__(self, default_limit, limits=None):
+        """
+        Args:
+            default_limit: 每个主机默认的并发上限
+            limits: {host: limit}，为个别主机单独指定上限
+        """
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.limits.get(host, self.default_limit))
+                self._semaphores[host] = sem
+            return sem
+
+    @contextmanager
+    def slot(self, host):
+        """占用 host 的一个并发名额，退出时释放"""
+        sem = self._semaphore(host)
+        sem.acquire()
+        try:
+            yield
+        finally:
+            sem.release()
@@ -690,8 +690,10 @@ class SteamToolbox:
 
                 cur_win.after(0, show_progress)
 
+                sweep_report = {}
                 ids, name, error, has_login = self.core.fetch_steam_list(page_type, identifier, update_progress,
-                                                                     login_cookies)
+                                                                     login_cookies, sweep_report=sweep_report,
+                                                                     use_cache=not refresh_var.get())
 
                 def update_ui():
                     is_fetching[0] = False
@@ -708,15 +710,35 @@ class SteamToolbox:
                         fetched_ids.extend(ids)
                         fetched_name.set(name if name else f"Steam 列表")
                         login_str = "🔐 已登录" if has_login else "⚠️ 未登录"
-                        status_var.set(f"✅ 成功获取 {len(ids)} 个游戏！({login_str})")
-                        status_label.config(fg="green")
+                        failed_pages = self.core.count_failed_pages(sweep_report)
+                        if failed_pages:
+                            status_var.set(f"⚠️ 获取 {len(ids)} 个游戏，但有 {failed_pages} 页获取失败，结果可能不完整，"
+                                           f"请稍后重新获取！({login_str})")
+                            status_label.config(fg="orange")
+                        else:
+                            status_var.set(f"✅ 成功获取 {len(ids)} 个游戏！({login_str})")
+                            status_label.config(fg="green")
                         if has_login:
                             login_hint.pack_forget()
+                        if sweep_report:
+                            # 显示各语言补充的游戏数（⏭️ 为智能扫描跳过的语言，⚠️ 为有分页失败的语言），便于核对跳过是否合理
+                            yield_parts = []
+                            for info in sweep_report.values():
+                                part = f"{info['name']} ⏭️" if info['skipped'] else f"{info['name']} +{info['new_ids']}"
+                                if info.get('failed_pages'):
+                                    part += f" ⚠️{info['failed_pages']} 页失败"
+                                yield_parts.append(part)
+                            detail_var.set("🌐 " + " · ".join(yield_parts))
+                            detail_label.pack(padx=20, anchor="w")
 
                 cur_win.after(0, update_ui)
 
             threading.Thread(target=fetch_thread, daemon=True).start()
 
+        refresh_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(cur_win, text="🔄 忽略本地缓存，重新获取", variable=refresh_var,
+                       font=("微软雅黑", 9)).pack(padx=20, anchor="w")
+
         fetch_btn = tk.Label(cur_win, text="📥 开始获取", font=("微软雅黑", 10, "bold"),
                              bg="#4a90d9", fg="white", padx=20, pady=8, cursor="hand2", relief="raised", bd=1)
         fetch_btn.pack(pady=10)
@@ -1534,7 +1556,7 @@ class SteamToolbox:
 
             if not messagebox.askyesno("重新下载 IGDB 数据",
                                        "将从 IGDB 重新下载所有 Steam 游戏及分类数据到本地。\n\n"
-                                       "约需 5-8 分钟，期间请勿关闭窗口。\n\n"
+                                       f"约需 {self.core.estimate_igdb_full_download()}，期间请勿关闭窗口。\n\n"
                                        "确认开始？"):
                 return
 
@@ -1615,21 +1637,24 @@ class SteamToolbox:
                         label = self.core.IGDB_DIMENSIONS.get(dk, {}).get("label", dk)
                         dim_parts.append(f"{label}{dv['count']}")
                     dim_str = "、".join(dim_parts) if dim_parts else f"{summary.get('total_items', 0)} 个分类"
-                    igdb_cache_var.set(
-                        f"💾 已下载：{summary['total_steam_games']} 个 Steam 游戏 | {dim_str}（{age_str}更新）")
+                    cache_text = f"💾 已下载：{summary['total_steam_games']} 个 Steam 游戏 | {dim_str}（{age_str}更新）"
+                    if summary.get('failed_games'):
+                        cache_text += f"\n⚠️ {summary['failed_games']} 个游戏的分类下载失败，之后获取时自动补全（每小时最多尝试一次）"
+                    igdb_cache_var.set(cache_text)
                 else:
                     igdb_cache_var.set(
                         f"💾 已缓存：{summary.get('total_items', 0)} 个分类，共 {summary['total_games']} 个游戏（{age_str}更新）")
                 igdb_cache_label.config(fg="#2e7d32")
             else:
-                igdb_cache_var.set("💾 尚未下载（首次使用时自动下载，约 5-8 分钟）")
+                igdb_cache_var.set(f"💾 尚未下载（首次使用时自动下载，约 {self.core.estimate_igdb_full_download()}）")
                 igdb_cache_label.config(fg="#888")
 
         refresh_igdb_cache_status()
 
         # 提示信息
         tk.Label(igdb_frame,
-                 text="💡 首次使用时会自动从 IGDB 下载所有 Steam 游戏的分类数据（约 5-8 分钟），之后筛选均为本地秒查",
+                 text=f"💡 首次使用时会自动从 IGDB 下载所有 Steam 游戏的分类数据（约 {self.core.estimate_igdb_full_download()}），"
+                      "之后筛选均为本地秒查",
                  font=("微软雅黑", 8), fg="#666", wraplength=400, justify="left").pack(anchor="w", pady=(3, 0))
 
         # 自动加载所有 IGDB 标签页数据（无需手动点击按钮）
@@ -1696,97 +1721,40 @@ class SteamToolbox:
 
                 rec_win.after(0, show_progress)
 
-                for i, (key, src_type, url_or_id, name) in enumerate(selected):
-                    def update_status(msg, detail=""):
-                        def _up():
-                            status_var.set(msg)
-                            if detail:
-                                detail_var.set(detail)
-
-                        rec_win.after(0, _up)
-
-                    update_status(f"正在获取 [{i + 1}/{total}]: {name}...")
+                def update_status(msg, detail=""):
+                    def _up():
+                        status_var.set(msg)
+                        if detail:
+                            detail_var.set(detail)
 
-                    if src_type == "steam250":
-                        # Steam250 抓取
-                        ids, error = self.core.fetch_steam250_ids(url_or_id)
-                        if error:
-                            update_status(f"❌ {name}: {error}")
-                        else:
-                            fetched_data[key] = {'ids': ids, 'name': name}
-                            update_status(f"✅ {name}: 获取 {len(ids)} 个游戏")
-
-                    elif src_type == "curator":
-                        # 鉴赏家抓取（使用现有的多语言扫描功能）
-                        page_type, identifier = self.core.extract_steam_list_info(url_or_id)
-                        if page_type and identifier:
-                            def progress_cb(fetched, total_count, phase, detail):
-                                update_status(f"正在获取 [{i + 1}/{total}]: {name} ({phase})", detail)
-
-                            # 获取已保存的 Cookie
-                            login_cookies = None
-                            saved_cookie = self.core.get_saved_cookie()
-                            if saved_cookie:
-                                login_cookies = f"steamLoginSecure={saved_cookie}"
-
-                            ids, display_name, error, has_login = self.core.fetch_steam_list(
-                                page_type, identifier, progress_cb, login_cookies
-                            )
-
-                            if error:
-                                update_status(f"❌ {name}: {error}")
-                            else:
-                                fetched_data[key] = {'ids': ids, 'name': name}
-                                login_str = "🔐" if has_login else "⚠️"
-                                update_status(f"✅ {name}: 获取 {len(ids)} 个游戏 {login_str}")
-                        else:
-                            update_status(f"❌ {name}: 无法解析 URL")
+                    rec_win.after(0, _up)
 
-                    elif src_type == "igdb_category":
-                        # IGDB 多维度分类抓取
-                        dimension, item_id = url_or_id  # url_or_id 是 (dimension, item_id) 元组
-                        # 移除维度前缀 emoji 用于显示
-                        display_name = name
-                        for dim_info in self.core.IGDB_DIMENSIONS.values():
-                            display_name = display_name.replace(dim_info["label"] + " ", "")
+                # 各来源并发获取，完成一个就在状态栏显示一个
+                finished = [0]
+                finished_lock = threading.Lock()
 
-                        def igdb_progress_cb(fetched, total_count, phase, detail):
-                            update_status(f"正在获取 [{i + 1}/{total}]: {name} ({phase})", detail)
+                def on_source_progress(key, name, phase, detail):
+                    update_status(f"正在获取（已完成 {finished[0]}/{total}）: {name} ({phase})", detail)
 
-                        ids, error = self.core.fetch_igdb_games_by_dimension(
-                            dimension, item_id, display_name, igdb_progress_cb,
-                            force_refresh=igdb_force_refresh[0])
+                def on_source_result(key, name, ids, error, note):
+                    with finished_lock:
+                        finished[0] += 1
+                        done = finished[0]
+                    if error:
+                        update_status(f"❌ [{done}/{total}] {name}: {error}")
+                    else:
+                        update_status(f"✅ [{done}/{total}] {name}: 获取 {len(ids)} 个游戏{note}")
 
-                        if error:
-                            update_status(f"❌ {name}: {error}")
-                        else:
-                            fetched_data[key] = {'ids': ids, 'name': name}
-                            # 检查是否来自缓存
-                            cached_ids, cached_at = self.core.get_igdb_dimension_cache(dimension, item_id)
-                            if not igdb_force_refresh[0] and cached_ids is not None and self.core.is_igdb_cache_valid(
-                                    cached_at):
-                                update_status(f"✅ {name}: {len(ids)} 个游戏（本地缓存）")
-                            else:
-                                update_status(f"✅ {name}: 获取 {len(ids)} 个游戏（已缓存）")
-
-                    elif src_type == "igdb_company":
-                        # IGDB 公司（开发商/发行商）
-                        company_id = url_or_id
-                        company_name = name.replace("🏢 ", "")
-
-                        def company_progress_cb(fetched, total_count, phase, detail):
-                            update_status(f"正在获取 [{i + 1}/{total}]: {name} ({phase})", detail)
-
-                        ids, error = self.core.fetch_igdb_games_by_company(
-                            company_id, company_name, company_progress_cb)
-
-                        if error:
-                            update_status(f"❌ {name}: {error}")
-                        else:
-                            fetched_data[key] = {'ids': ids, 'name': name}
-                            update_status(f"✅ {name}: 获取 {len(ids)} 个游戏")
+                # 获取已保存的 Cookie（鉴赏家来源使用）
+                login_cookies = None
+                saved_cookie = self.core.get_saved_cookie()
+                if saved_cookie:
+                    login_cookies = f"steamLoginSecure={saved_cookie}"
 
-                    time.sleep(0.3)
+                update_status(f"正在同时获取 {total} 个来源...")
+                fetched_data.update(self.core.fetch_recommendation_sources(
+                    selected, on_source_result, on_source_progress, login_cookies, igdb_force_refresh[0],
+                    use_cache=not source_refresh_var.get()))
 
                 def final_update():
                     is_fetching[0] = False
@@ -1839,6 +1807,10 @@ class SteamToolbox:
         merge_frame.pack(pady=(5, 0))
         tk.Checkbutton(merge_frame, text="🔗 合并所有勾选来源（取并集后作为一个来源导入/导出/更新）",
                         variable=merge_var, font=("微软雅黑", 9)).pack()
+        # 来源结果缓存有效期内默认直接使用上次的结果，勾选后全部重新获取（IGDB 分类数据由「重新下载 IGDB 数据」刷新）
+        source_refresh_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(merge_frame, text="🔄 忽略来源缓存，重新获取鉴赏家 / Steam250 / IGDB 公司列表",
+                        variable=source_refresh_var, font=("微软雅黑", 9)).pack()
 
         # ===== 操作按钮 =====
         btn_frame = tk.Frame(rec_win)
@@ -2147,16 +2119,20 @@ class SteamToolbox:
         list_frame.pack(fill="both", expand=True, padx=15, pady=5)
 
         # 表头
-        columns = ("filename", "time", "size", "description")
+        columns = ("filename", "time", "size", "stored", "collections", "description")
         tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=10)
         tree.heading("filename", text="文件名")
         tree.heading("time", text="创建时间")
         tree.heading("size", text="大小")
+        tree.heading("stored", text="占用")
+        tree.heading("collections", text="收藏夹")
         tree.heading("description", text="描述")
 
         tree.column("filename", width=250)
         tree.column("time", width=140)
         tree.column("size", width=80)
+        tree.column("stored", width=80)
+        tree.column("collections", width=60)
         tree.column("description", width=180)
 
         scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
@@ -2169,15 +2145,19 @@ class SteamToolbox:
             for item in tree.get_children():
                 tree.delete(item)
 
+            def format_size(size):
+                if size > 1024:
+                    return f"{size / 1024:.1f} KB"
+                return f"{size:,} B"
+
             backups = self.core.backup_manager.list_backups()
             for b in backups:
-                size_str = f"{b['size']:,} B"
-                if b['size'] > 1024:
-                    size_str = f"{b['size'] / 1024:.1f} KB"
                 tree.insert("", "end", values=(
                     b['filename'],
                     b['created_at'].strftime("%Y-%m-%d %H:%M:%S"),
-                    size_str,
+                    format_size(b['size']),
+                    format_size(b['stored_size']),
+                    b['collections'] if b['collections'] is not None else "",
                     b['description']
                 ))
 
@@ -2232,6 +2212,38 @@ class SteamToolbox:
         tk.Button(btn_frame, text="🔄 刷新列表", command=refresh_backup_list, width=12, font=("微软雅黑", 9)).pack(
             side="right", padx=5)
 
+        def do_compact():
+            count = self.core.backup_manager.compact_backups()
+            if count is None:
+                messagebox.showerror("错误", "❌ 整理失败。")
+            else:
+                messagebox.showinfo("成功", f"✅ 已整理 {count} 个增量备份。")
+                refresh_backup_list()
+
+        tk.Button(btn_frame, text="🧹 整理增量备份", command=do_compact, width=12, font=("微软雅黑", 9)).pack(
+            side="right", padx=5)
+
+        def do_prune():
+            manager = self.core.backup_manager
+            if manager.retention is None:
+                messagebox.showinfo("提示", "未配置保留策略（config.json 的 backup_retention）。")
+                return
+            # 先预演，列出将被清理的备份供确认
+            candidates = manager.prune_backups(dry_run=True)
+            if not candidates:
+                messagebox.showinfo("提示", "按当前保留策略，没有需要清理的备份。")
+                return
+            names = "\n".join(b['filename'] for b in candidates[:15])
+            if len(candidates) > 15:
+                names += f"\n... 等共 {len(candidates)} 个"
+            if messagebox.askyesno("确认清理", f"将按保留策略删除以下 {len(candidates)} 个备份：\n\n{names}"):
+                removed = manager.prune_backups()
+                messagebox.showinfo("成功", f"✅ 已清理 {len(removed)} 个备份。")
+                refresh_backup_list()
+
+        tk.Button(btn_frame, text="🗑️ 按策略清理", command=do_prune, width=12, font=("微软雅黑", 9)).pack(
+            side="right", padx=5)
+
     def _show_diff_window(self, backup_filename):
         """显示备份与当前文件的差异详情"""
         diff_result = self.core.backup_manager.compare_with_current(backup_filename)